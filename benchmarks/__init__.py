@@ -0,0 +1,4 @@
+"""
+Micro and macro benchmarks for the game's hot paths (see cases.py), run with:
+    python -m benchmarks
+"""
@@ -0,0 +1,76 @@
+"""
+Runs the benchmark suite and prints the results as JSON.
+
+Usage (from the project root):
+    python -m benchmarks --output results.json
+    python -m benchmarks --quick --filter combat
+    python -m benchmarks --baseline benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+
+No baseline is committed: timings only compare on the machine (and Python) that produced them,
+so each machine saves its own with --save-baseline. benchmarks/baseline.json is git-ignored for
+that. --baseline warns when the environment recorded in a baseline differs from the current one.
+"""
+import argparse
+import json
+import sys
+from typing import List, Optional
+from .cases import BENCHMARKS
+from .harness import (DEFAULT_MIN_TIME, DEFAULT_REPEATS, DEFAULT_THRESHOLD, compare_results,
+                      describe_environment_mismatch, format_comparison, run_benchmarks)
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point. Returns 1 if any benchmark regressed against the baseline."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark AFK Quest's hot paths.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="Skip slow benchmarks (such as parsing a 1M-row CSV)")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help=f"Timed repeats per benchmark (default: {DEFAULT_REPEATS})")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help=f"Minimum seconds per repeat (default: {DEFAULT_MIN_TIME})")
+    parser.add_argument("--output", metavar="FILE", help="Write the JSON results to FILE instead of stdout")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against results saved in FILE")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Slowdown over the baseline flagged as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Also save the results as the new baseline in FILE")
+    args = parser.parse_args(argv)
+
+    benchmarks = [benchmark for benchmark in BENCHMARKS
+                  if args.filter in benchmark.name and not (args.quick and benchmark.slow)]
+    if args.list:
+        for benchmark in benchmarks:
+            print(f"{benchmark.name}{' (slow)' if benchmark.slow else ''}")
+        return 0
+    if not benchmarks:
+        print("Error: No benchmarks match.", file=sys.stderr)
+        return 1
+
+    results = run_benchmarks(benchmarks, min_time=args.min_time, repeats=args.repeats, progress=sys.stderr)
+    text = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    for difference in describe_environment_mismatch(results["environment"], baseline.get("environment", {})):
+        print(f"Warning: Environment differs from the baseline ({difference}).", file=sys.stderr)
+    comparison = compare_results(results, baseline, args.threshold)
+    print(format_comparison(comparison), file=sys.stderr)
+    regressions = [row["name"] for row in comparison if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: "
+              f"{', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
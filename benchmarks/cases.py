@@ -0,0 +1,98 @@
+"""
+The benchmarks: character stat updates, enemy selection, loot rolls, CSV parsing, saving
+and loading, and whole headless fights.
+"""
+import io
+import os
+from typing import List
+from src import file_manager
+from src.character import Character
+from src.combat import simulate_combat, start_combat
+from src.combat_events import NullRenderer
+from src.data_loader import ENEMY_CSV_HEADERS, DataLoader
+from src.enemy import Enemy
+from src.enemy_manager import EnemyManager
+from src.item import Item, LootTable
+from src.rng import RandomSource
+from .harness import Benchmark
+
+SEED = 1234 # Every benchmark that rolls dice uses a fixed seed, so runs do the same work
+
+def make_enemy_csv(rows: int) -> str:
+    """Returns enemy CSV text with the given number of (valid) rows."""
+    lines = [",".join(ENEMY_CSV_HEADERS)]
+    lines.extend(f"Enemy {i},{5 + i % 50},{1 + i % 10},{i % 5},{i % 5 + 10}" for i in range(rows))
+    return "\n".join(lines) + "\n"
+
+def bench_gain_experience(amount: int):
+    def setup():
+        def operation():
+            Character(name="Bench").gain_experience(amount) # Fresh level 1 character each time
+        return operation
+    return setup
+
+def bench_take_damage_and_heal():
+    character = Character(name="Bench", level=10)
+    def operation():
+        character.take_damage(7)
+        character.heal(7)
+    return operation
+
+def bench_get_random_enemy():
+    templates = [{"name": f"Enemy {i}", "hp": 5 + i % 50, "attack_stat": 1 + i % 10,
+                  "loot_gold_min": 0, "loot_gold_max": 10} for i in range(1000)]
+    enemy_manager = EnemyManager(templates)
+    rng = RandomSource(SEED)
+    return lambda: enemy_manager.get_random_enemy(rng=rng)
+
+def bench_loot_roll(items: int):
+    def setup():
+        table = LootTable([(Item(f"Item {i}", "item", i), 0.9 / items) for i in range(items)])
+        rng = RandomSource(SEED)
+        return lambda: table.roll(rng)
+    return setup
+
+def bench_parse_csv(rows: int):
+    def setup():
+        data_loader = DataLoader(data_folder_path="data")
+        csv_text = make_enemy_csv(rows)
+        return lambda: data_loader._parse_csv_data(io.StringIO(csv_text), "benchmark") # pylint: disable=protected-access
+    return setup
+
+def bench_save_load(temp_dir: str):
+    filepath = os.path.join(temp_dir, "character_data.json")
+    character = Character(name="Bench", level=25, gold=1234)
+    def operation():
+        file_manager.save_character(character, filepath)
+        file_manager.load_character(filepath)
+    return operation
+
+def bench_simulate_combat():
+    rng = RandomSource(SEED)
+    def operation():
+        simulate_combat(Character(name="Bench", level=5, base_attack_stat=4),
+                        Enemy("Bandit", 15, 2, 5, 10), rng=rng)
+    return operation
+
+def bench_start_combat():
+    rng = RandomSource(SEED)
+    renderer = NullRenderer()
+    def operation():
+        start_combat(Character(name="Bench", level=5, base_attack_stat=4), Enemy("Bandit", 15, 2, 5, 10),
+                     paced=False, renderer=renderer, rng=rng)
+    return operation
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("character.gain_experience.small", bench_gain_experience(5)),
+    Benchmark("character.gain_experience.huge", bench_gain_experience(10_000_000)),
+    Benchmark("character.take_damage_heal", bench_take_damage_and_heal),
+    Benchmark("enemy_manager.get_random_enemy", bench_get_random_enemy),
+    Benchmark("item.loot_roll.10", bench_loot_roll(10)),
+    Benchmark("item.loot_roll.10k", bench_loot_roll(10_000)),
+    Benchmark("data_loader.parse_csv.10", bench_parse_csv(10)),
+    Benchmark("data_loader.parse_csv.10k", bench_parse_csv(10_000)),
+    Benchmark("data_loader.parse_csv.1m", bench_parse_csv(1_000_000), slow=True, repeats=3),
+    Benchmark("file_manager.save_load", bench_save_load, temp_dir=True),
+    Benchmark("combat.simulate_combat", bench_simulate_combat),
+    Benchmark("combat.start_combat.headless", bench_start_combat),
+]
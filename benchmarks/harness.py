@@ -0,0 +1,148 @@
+"""
+Timing, environment metadata and baseline comparison for the benchmark suite.
+"""
+import contextlib
+import datetime
+import os
+import platform
+import statistics
+import subprocess  # nosec B404 - Only used to read the git commit
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_MIN_TIME = 0.2 # Seconds each repeat should take at least (more loops are run if needed)
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.2 # Allowed slowdown over the baseline (20%)
+
+class Benchmark:
+    """
+    One benchmark: setup() builds whatever the benchmark needs (outside the timing) and returns
+    the function to time, which performs one operation per call.
+    """
+    def __init__(self, name: str, setup: Callable[..., Callable[[], Any]], slow: bool = False,
+                 repeats: Optional[int] = None, temp_dir: bool = False):
+        """
+        Args:
+            name (str): Unique name, used as the key in results and baselines.
+            setup (Callable[..., Callable[[], Any]]): Returns the operation to time.
+            slow (bool): Takes seconds per operation; skipped with --quick.
+            repeats (Optional[int]): Overrides the number of repeats (e.g. fewer for slow benchmarks).
+            temp_dir (bool): setup is passed the path of a temporary directory for its files,
+                             which the harness deletes once the benchmark has been measured.
+        """
+        self.name = name
+        self.setup = setup
+        self.slow = slow
+        self.repeats = repeats
+        self.temp_dir = temp_dir
+
+def measure(operation: Callable[[], Any], min_time: float = DEFAULT_MIN_TIME,
+            repeats: int = DEFAULT_REPEATS) -> Dict[str, Any]:
+    """
+    Times an operation like timeit: the loop count is doubled until one repeat takes at least
+    min_time, then the loop is timed repeats times.
+
+    Returns:
+        Dict[str, Any]: "loops", "repeats", and the "min", "median" and "max" seconds per operation.
+    """
+    loops = 1
+    while True:
+        elapsed = _time_loops(operation, loops)
+        if elapsed >= min_time or loops >= 1 << 30:
+            break
+        loops *= 2
+    timings = [elapsed / loops] + [_time_loops(operation, loops) / loops for _ in range(repeats - 1)]
+    return {"loops": loops, "repeats": repeats, "min": min(timings),
+            "median": statistics.median(timings), "max": max(timings)}
+
+def _time_loops(operation: Callable[[], Any], loops: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(loops):
+        operation()
+    return time.perf_counter() - start_time
+
+def get_environment() -> Dict[str, Any]:
+    """Describes where the benchmarks ran, so results from different machines are not mixed up."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,  # nosec B603 B607
+                                check=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "machine": platform.machine(), "processor": platform.processor(),
+            "cpu_count": os.cpu_count(), "commit": commit,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")}
+
+def run_benchmarks(benchmarks: List[Benchmark], min_time: float = DEFAULT_MIN_TIME,
+                   repeats: int = DEFAULT_REPEATS, progress=None) -> Dict[str, Any]:
+    """
+    Runs benchmarks with game output discarded.
+
+    Args:
+        benchmarks (List[Benchmark]): The benchmarks to run, in order.
+        min_time (float): See measure.
+        repeats (int): See measure (unless a benchmark overrides it).
+        progress (Optional[TextIO]): If given, each result is reported on it as it finishes.
+
+    Returns:
+        Dict[str, Any]: {"environment": ..., "results": {name: measure() result}}.
+    """
+    results = {}
+    for benchmark in benchmarks:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w", encoding="utf-8"))))
+            if benchmark.temp_dir:
+                operation = benchmark.setup(stack.enter_context(tempfile.TemporaryDirectory(prefix="afk-quest-bench-")))
+            else:
+                operation = benchmark.setup()
+            results[benchmark.name] = measure(operation, min_time, benchmark.repeats or repeats)
+        if progress is not None:
+            print(f"{benchmark.name}: {format_seconds(results[benchmark.name]['median'])}", file=progress)
+    return {"environment": get_environment(), "results": results}
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compares best (min) times with a baseline run; the fastest repeat is the least
+    affected by other load on the machine.
+
+    Returns:
+        List[Dict[str, Any]]: Per benchmark in results: "name", "seconds", "baseline" (None if the
+                              baseline has no such benchmark), "ratio" and "regressed"
+                              (slower than baseline * (1 + threshold)).
+    """
+    baseline_results = baseline.get("results", {})
+    comparison = []
+    for name, result in results["results"].items():
+        base = baseline_results.get(name)
+        base_seconds = base["min"] if base else None
+        ratio = result["min"] / base_seconds if base_seconds else None
+        comparison.append({"name": name, "seconds": result["min"], "baseline": base_seconds, "ratio": ratio,
+                           "regressed": ratio is not None and ratio > 1 + threshold})
+    return comparison
+
+def format_seconds(seconds: float) -> str:
+    """Formats a duration with a readable unit (ns, us, ms or s)."""
+    for unit, scale in (("ns", 1e-9), ("us", 1e-6), ("ms", 1e-3)):
+        if seconds < scale * 1000:
+            return f"{seconds / scale:.1f} {unit}"
+    return f"{seconds:.2f} s"
+
+def format_comparison(comparison: List[Dict[str, Any]]) -> str:
+    """Formats compare_results output as a table, flagging regressions."""
+    lines = []
+    for row in comparison:
+        if row["baseline"] is None:
+            lines.append(f"{row['name']:<40} {format_seconds(row['seconds']):>10}   (no baseline)")
+            continue
+        flag = "  REGRESSION" if row["regressed"] else ""
+        lines.append(f"{row['name']:<40} {format_seconds(row['seconds']):>10}   "
+                     f"baseline {format_seconds(row['baseline']):>10}   x{row['ratio']:.2f}{flag}")
+    return "\n".join(lines)
+
+def describe_environment_mismatch(environment: Dict[str, Any], baseline_environment: Dict[str, Any]) -> List[str]:
+    """Returns the environment fields that differ from the baseline's (timings may not be comparable)."""
+    fields = ["python", "implementation", "machine", "processor", "cpu_count"]
+    return [f"{field}: {baseline_environment.get(field)} -> {environment.get(field)}"
+            for field in fields if environment.get(field) != baseline_environment.get(field)]
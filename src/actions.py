@@ -0,0 +1,154 @@
+"""
+The action menu shared by the local game (game.py) and the server (server.py): which actions
+there are, how the menu looks and what each action does.
+
+Actions are generators, so one implementation can be driven synchronously (the terminal game,
+with print and input_func) or from a coroutine (one server session per connection). They yield
+a request whenever they need the front end and are sent back its answer:
+    Show(text)   -> None, after showing text as a line
+    Ask(prompt)  -> the player's answer
+    Fight(player, enemy) -> the combat outcome, after running the fight the front end's way
+Messages the character model logs (gold found, level ups) do not go through these requests;
+they follow the log route of the session (see log.route).
+"""
+from typing import Any, Callable, Generator, List, NamedTuple, Optional, Union
+from . import log
+from .character import Character
+from .enemy import Enemy
+from .enemy_manager import EnemyManager
+from .rng import RandomSource
+
+ACTION_FIGHT = "5" # Look for a Fight
+ACTION_REST = "3" # Heal, used as resting by auto-play
+ACTION_QUIT = "Q"
+# (key, label, only available while alive), in menu order
+ACTIONS = [
+    ("1", "Add Experience (Debug)", True),
+    ("2", "Take Damage (Debug)", True),
+    ("3", "Heal (Debug)", True),
+    ("4", "Add Gold (Debug)", True),
+    (ACTION_FIGHT, "Look for a Fight", True),
+    ("6", "Cash In Items Worse Than Equipped", True),
+    ("S", "View Character Summary", False),
+    ("L", "View Recent Log", False),
+    (ACTION_QUIT, "Save and Quit to Main Menu", False),
+]
+RECENT_LOG_LINES = 20 # Shown by the View Recent Log action
+
+class Show(NamedTuple):
+    """Request to show a line of text."""
+    text: str
+
+class Ask(NamedTuple):
+    """Request for the player's answer to a prompt."""
+    prompt: str
+
+class Fight(NamedTuple):
+    """Request to run a fight between player and enemy and report its outcome."""
+    player: Character
+    enemy: Enemy
+
+Request = Union[Show, Ask, Fight]
+Steps = Generator[Request, Any, Any] # What an action yields, is sent back and returns
+
+def get_action_choices(character_alive: bool) -> List[str]:
+    """Returns the keys of the actions available to a living (or dead) character."""
+    return [key for key, _, needs_alive in ACTIONS if character_alive or not needs_alive]
+
+def format_action_menu(character_alive: bool, quit_label: Optional[str] = None) -> str:
+    """Returns the action menu text, with the quit action labelled quit_label if given."""
+    lines = ["\n--- Actions ---"]
+    for key, label, needs_alive in ACTIONS:
+        if character_alive or not needs_alive:
+            lines.append(f"{key}. {quit_label if key == ACTION_QUIT and quit_label else label}")
+    lines.append("---------------")
+    return "\n".join(lines)
+
+def choose_action(character_alive: bool, quit_label: Optional[str] = None) -> Steps:
+    """Shows the action menu and asks until a valid action is chosen. Returns its key."""
+    yield Show(format_action_menu(character_alive, quit_label))
+    choices = get_action_choices(character_alive)
+    while True:
+        choice = (yield Ask("Enter your action: ")).strip().upper()
+        if choice in choices:
+            return choice
+        yield Show("Invalid action. Please try again.")
+
+def get_int_input(prompt: str) -> Steps:
+    """Asks until the player enters an integer and returns it."""
+    while True:
+        try:
+            return int((yield Ask(prompt)))
+        except ValueError:
+            yield Show("Invalid input. Please enter a number.")
+
+def look_for_fight(character: Character, enemy_manager: EnemyManager, rng: Optional[RandomSource] = None) -> Steps:
+    """Spawns a random enemy and fights it. Returns the outcome, or "" if there was no enemy."""
+    if not enemy_manager.enemy_templates:
+        yield Show("No enemies available to fight at the moment. Check enemy definitions.")
+        return ""
+    enemy = enemy_manager.get_random_enemy(rng=rng)
+    if enemy is None:
+        yield Show("Could not find an enemy to fight. Perhaps they are all hiding?")
+        return ""
+    outcome = yield Fight(character, enemy)
+    yield Show("\n--- Combat Over ---")
+    if outcome == "player_won":
+        yield Show("You were victorious!")
+    elif outcome == "player_lost":
+        yield Show("You have been defeated.") # Character is already marked as dead by take_damage
+    return outcome
+
+def perform_action(choice: str, character: Character, get_enemy_manager: Callable[[], EnemyManager],
+                   rng: Optional[RandomSource] = None) -> Steps:
+    """
+    Carries out one action other than quitting.
+
+    Args:
+        choice (str): An action key from choose_action.
+        character (Character): The player's character.
+        get_enemy_manager (Callable[[], EnemyManager]): Returns the source of enemies. Only
+            called for a fight, so the enemy data can be loaded on first use.
+        rng (Optional[RandomSource]): Source of enemy and combat rolls. Defaults to the random module.
+    """
+    if choice == "1": # Add EXP
+        character.gain_experience((yield from get_int_input("Enter EXP to add: ")))
+    elif choice == "2": # Take Damage
+        yield Show(str(character.take_damage((yield from get_int_input("Enter damage to take: ")))))
+    elif choice == "3": # Heal
+        yield Show(character.heal((yield from get_int_input("Enter amount to heal: "))))
+    elif choice == "4": # Add Gold
+        character.add_gold((yield from get_int_input("Enter gold to add: ")))
+    elif choice == ACTION_FIGHT:
+        yield from look_for_fight(character, get_enemy_manager(), rng)
+    elif choice == "6": # Cash in
+        if character.cash_in_worse_than_equipped() == 0:
+            yield Show("Nothing to cash in: every item kept is at least as good as what is equipped.")
+    elif choice == "L": # Recent log, e.g. to see what led to a death
+        yield Show("\n--- Recent Log ---")
+        yield Show("\n".join(log.get_recent_lines(RECENT_LOG_LINES, timestamps=False)) or "No log messages recorded.")
+    return choice # "S" needs nothing: the summary is shown after every action
+
+def play_actions(character: Character, get_enemy_manager: Callable[[], EnemyManager],
+                 rng: Optional[RandomSource] = None, quit_label: Optional[str] = None,
+                 death_hint: str = "You can view your character summary or return to the main menu.") -> Steps:
+    """
+    Runs the action menu until the player chooses to quit. Saving is left to the front end.
+
+    Args:
+        character (Character): The player's character.
+        get_enemy_manager (Callable[[], EnemyManager]): See perform_action.
+        rng (Optional[RandomSource]): Source of enemy and combat rolls. Defaults to the random module.
+        quit_label (Optional[str]): Menu label of the quit action, if not the local game's.
+        death_hint (str): Shown under the death message.
+    """
+    yield Show(character.get_summary())
+    while True:
+        if character.is_dead:
+            yield Show(f"\nAlas, {character.name} has perished.")
+            yield Show(death_hint)
+        choice = yield from choose_action(not character.is_dead, quit_label)
+        if choice == ACTION_QUIT:
+            return choice
+        yield from perform_action(choice, character, get_enemy_manager, rng)
+        yield Show(character.get_summary())
@@ -0,0 +1,192 @@
+import abc
+import contextlib
+import logging
+import os
+import sys
+import time
+from typing import Optional, TextIO
+from . import clock, combat, log
+from .actions import ACTION_FIGHT, ACTION_REST # Auto-play uses the same action codes as the game menu
+from .character import Character
+from .enemy_manager import EnemyManager
+from .rng import RandomSource
+
+REST_HEAL_AMOUNT = 1 # HP recovered per rest
+REST_SECONDS = 1 # Game time one rest takes
+DEFAULT_STATUS_INTERVAL_SECONDS = 2.0
+
+class Policy(abc.ABC):
+    """
+    Decides what an auto-playing character does next.
+    Subclasses implement choose_action; difficulty_band (None for any) picks which
+    EnemyManager difficulty band fights are drawn from.
+    """
+    difficulty_band: Optional[int] = None
+
+    @abc.abstractmethod
+    def choose_action(self, character: Character) -> str:
+        """Returns ACTION_FIGHT or ACTION_REST for the character's current state."""
+
+    def describe(self) -> str:
+        """Returns a short description for status lines and reports."""
+        return type(self).__name__
+
+class AlwaysFight(Policy):
+    """Fights back to back, never resting."""
+    def __init__(self, difficulty_band: Optional[int] = None):
+        self.difficulty_band = difficulty_band
+
+    def choose_action(self, character: Character) -> str:
+        return ACTION_FIGHT
+
+    def describe(self) -> str:
+        return "fight" if self.difficulty_band is None else f"fight@band{self.difficulty_band}"
+
+class RestBelow(Policy):
+    """Rests once HP falls below a fraction of max HP, then keeps resting until fully healed."""
+    def __init__(self, threshold: float, difficulty_band: Optional[int] = None):
+        """
+        Args:
+            threshold (float): Fraction of max HP (0-1) below which the character starts resting.
+            difficulty_band (Optional[int]): Difficulty band to fight in, or None for any.
+        """
+        self.threshold = threshold
+        self.difficulty_band = difficulty_band
+        self._resting = False
+
+    def choose_action(self, character: Character) -> str:
+        if character.current_hp >= character.max_hp:
+            self._resting = False
+        elif character.current_hp < character.max_hp * self.threshold:
+            self._resting = True
+        return ACTION_REST if self._resting else ACTION_FIGHT
+
+    def describe(self) -> str:
+        band = "" if self.difficulty_band is None else f"@band{self.difficulty_band}"
+        return f"rest:{round(self.threshold * 100)}{band}"
+
+def parse_policy(text: str) -> Policy:
+    """
+    Builds a policy from its command line form: "fight", or "rest:<percent>", optionally
+    followed by "@<band>" to fight only in that difficulty band (e.g. "rest:50@5").
+    """
+    name, _, band = text.partition("@")
+    difficulty_band = int(band) if band else None
+    if name == "fight":
+        return AlwaysFight(difficulty_band)
+    if name.startswith("rest:"):
+        return RestBelow(int(name[len("rest:"):]) / 100, difficulty_band)
+    raise ValueError(f"Unknown policy '{text}'. Use 'fight' or 'rest:<percent>', optionally with '@<band>'.")
+
+
+class AutoPlayer:
+    """
+    Plays a character without input: repeatedly asks a policy for the next action and
+    carries it out, resolving fights headlessly with combat.simulate_combat.
+    """
+    def __init__(self, character: Character, enemy_manager: EnemyManager, policy: Policy,
+                 pace: float = 0.0, status_interval: float = DEFAULT_STATUS_INTERVAL_SECONDS,
+                 output: Optional[TextIO] = None, rng: Optional[RandomSource] = None,
+                 encounter_rng: Optional[RandomSource] = None):
+        """
+        Args:
+            character (Character): The character to play.
+            enemy_manager (EnemyManager): Source of enemies.
+            policy (Policy): Chooses each action.
+            pace (float): 0 runs at full speed; 1 waits as long as interactive combat and resting
+                          would take (2 would be twice as slow, 0.1 ten times faster).
+            status_interval (float): Wall-clock seconds between status lines. 0 disables them.
+            output (Optional[TextIO]): Where status lines go. Defaults to stdout.
+            rng (Optional[RandomSource]): Source of enemy, damage and loot rolls. Defaults to a new,
+                                          randomly seeded RandomSource.
+            encounter_rng (Optional[RandomSource]): Source of the enemy picked for each fight, if it
+                should not come from rng. With a stream of its own, fight n meets the same enemy
+                however the fights before it went (see policy_search). Defaults to rng.
+        """
+        self.character = character
+        self.enemy_manager = enemy_manager
+        self.policy = policy
+        self.pace = pace
+        self.status_interval = status_interval
+        self.output = output if output is not None else sys.stdout
+        self.rng = rng if rng is not None else RandomSource()
+        self.encounter_rng = encounter_rng if encounter_rng is not None else self.rng
+        self.stats = {"actions": 0, "fights": 0, "wins": 0, "losses": 0, "rests": 0,
+                      "experience": 0, "gold": 0, "game_seconds": 0.0}
+
+    def step(self) -> str:
+        """Carries out one policy action and returns its action code."""
+        action = self.policy.choose_action(self.character)
+        stats = self.stats
+        stats["actions"] += 1
+        if action == ACTION_REST:
+            self.character.heal(REST_HEAL_AMOUNT)
+            stats["rests"] += 1
+            seconds = REST_SECONDS
+        else:
+            enemy = self.enemy_manager.get_random_enemy(self.policy.difficulty_band, self.encounter_rng)
+            if enemy is None:
+                raise RuntimeError("No enemies available for auto-play.")
+            result = combat.simulate_combat(self.character, enemy, rng=self.rng)
+            stats["fights"] += 1
+            if result["outcome"] == "player_won":
+                stats["wins"] += 1
+                stats["experience"] += result["experience"]
+                stats["gold"] += result["gold"]
+                if result["item"] is not None: # Sell what the new item made obsolete, so nothing piles up
+                    stats["gold"] += self.character.cash_in_worse_than_equipped()
+            elif result["outcome"] == "player_lost":
+                stats["losses"] += 1
+            seconds = combat.get_paced_duration(result["rounds"], result["outcome"])
+        stats["game_seconds"] += seconds
+        if self.pace > 0:
+            clock.get_clock().sleep(seconds * self.pace)
+        return action
+
+    def format_status(self, wall_seconds: float) -> str:
+        """Returns a one-line summary of progress so far."""
+        stats = self.stats
+        fights_per_second = stats["fights"] / wall_seconds if wall_seconds > 0 else 0.0
+        return (f"[{self.policy.describe()}] {self.character.name} L{self.character.level} "
+                f"HP {self.character.current_hp}/{self.character.max_hp} | "
+                f"fights {stats['fights']} (W {stats['wins']}/L {stats['losses']}) rests {stats['rests']} | "
+                f"+{stats['experience']} XP +{stats['gold']} gold | "
+                f"{stats['game_seconds'] / 3600:.1f} game h | {fights_per_second:,.0f} fights/s")
+
+    def run(self, max_fights: Optional[int] = None, max_actions: Optional[int] = None,
+            max_game_seconds: Optional[float] = None) -> dict:
+        """
+        Plays until the character dies or a limit is reached (or forever if no limits are set).
+        max_game_seconds limits the game time played (see combat.get_paced_duration), however fast it runs.
+        Per-fight messages are suppressed; a status line is printed every status_interval seconds
+        and once at the end.
+
+        Returns:
+            dict: The accumulated stats, plus "wall_seconds".
+        """
+        start_time = last_status = time.perf_counter()
+        try:
+            # Per-fight messages (gold, level ups) are below WARNING, so they are not even formatted
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull), \
+                 log.level(max(logging.WARNING, log.get_level())):
+                while not self.character.is_dead:
+                    if max_fights is not None and self.stats["fights"] >= max_fights:
+                        break
+                    if max_actions is not None and self.stats["actions"] >= max_actions:
+                        break
+                    if max_game_seconds is not None and self.stats["game_seconds"] >= max_game_seconds:
+                        break
+                    self.step()
+                    if self.status_interval > 0:
+                        now = time.perf_counter()
+                        if now - last_status >= self.status_interval:
+                            last_status = now
+                            print(self.format_status(now - start_time), file=self.output)
+        finally:
+            wall_seconds = time.perf_counter() - start_time
+            self.stats["wall_seconds"] = wall_seconds
+            if self.status_interval > 0:
+                print(self.format_status(wall_seconds), file=self.output)
+        if self.character.is_dead:
+            print(f"{self.character.name} has perished while AFK.", file=self.output)
+        return self.stats
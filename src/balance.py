@@ -0,0 +1,239 @@
+"""
+Balance sweep: fights every enemy template against a grid of character levels and attack
+stats, spread over a process pool, and reports win rate and reward statistics.
+
+Usage (from the project root):
+    python -m src.balance --levels 1-10 --attacks 1,2,3 --fights 500
+"""
+import argparse
+import ast
+import csv
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+from . import combat
+from .character import Character
+from .data_loader import DataLoader
+from .enemy import Enemy
+from .item import LootTable, get_loot_table_rows
+from .rng import RandomSource
+from .shared_catalog import SharedEnemyCatalog, publish_enemy_catalog
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "balance")
+RESULT_COLUMNS = ["level", "attack", "enemy", "fights", "win_rate", "mean_rounds_to_kill",
+                  "mean_hp_lost", "xp_per_fight", "gold_per_fight", "item_value_per_fight"]
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Set in each worker by _init_worker
+_worker_templates: Optional[SharedEnemyCatalog] = None
+_worker_loot_tables: Optional[Dict[str, LootTable]] = None
+
+def parse_int_list(text: str) -> List[int]:
+    """Parses "1,2,5" or "1-10" (or a mix, e.g. "1-3,10") into a sorted list of ints."""
+    values = set()
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = part.split("-", 1)
+            values.update(range(int(start), int(end) + 1))
+        elif part:
+            values.add(int(part))
+    return sorted(values)
+
+def _init_worker(catalog_name: str, loot_tables: Optional[Dict[str, LootTable]] = None):
+    """Process pool initializer: attaches to the shared enemy table published by the parent."""
+    global _worker_templates, _worker_loot_tables # pylint: disable=global-statement
+    _worker_templates = SharedEnemyCatalog.attach(catalog_name)
+    _worker_loot_tables = loot_tables
+
+def sweep_cell(level: int, attack: int, fights: int, seed: int,
+               enemy_templates: Optional[Sequence[Dict[str, Any]]] = None,
+               loot_tables: Optional[Dict[str, LootTable]] = None) -> List[Dict[str, Any]]:
+    """
+    Fights a fresh character of the given level and attack against every template.
+
+    Args:
+        level (int): Character level (sets max HP).
+        attack (int): Character base attack stat.
+        fights (int): Fights per template.
+        seed (int): Base random seed; each cell is seeded independently so results don't
+                    depend on how work is split across processes.
+        enemy_templates (Optional[Sequence]): Templates to use. Defaults to the worker's shared table.
+        loot_tables (Optional[Dict[str, LootTable]]): Enemy name -> the items it can drop. Defaults
+            to the worker's. Drops are only counted (each fight starts with a fresh character),
+            but they use the same rolls as in the game.
+
+    Returns:
+        List[Dict[str, Any]]: One result row per template (see RESULT_COLUMNS).
+    """
+    templates = enemy_templates if enemy_templates is not None else _worker_templates
+    if loot_tables is None and enemy_templates is None:
+        loot_tables = _worker_loot_tables
+    loot_tables = loot_tables or {}
+    rng = RandomSource(seed).spawn(f"{level}:{attack}")
+    rows = []
+    for template in templates:
+        wins = rounds_to_kill = hp_lost = experience = gold = item_value = 0
+        loot_table = loot_tables.get(template["name"])
+        for _ in range(fights):
+            player = Character(name="Sweep", level=level, base_attack_stat=attack)
+            foe = Enemy(name=template["name"], max_hp=template["hp"], attack_stat=template["attack_stat"],
+                        loot_gold_min=template["loot_gold_min"], loot_gold_max=template["loot_gold_max"],
+                        loot_table=loot_table)
+            result = combat.simulate_combat(player, foe, apply_rewards=False, rng=rng)
+            hp_lost += result["damage_taken"]
+            if result["outcome"] == "player_won":
+                wins += 1
+                rounds_to_kill += result["rounds"]
+                experience += result["experience"]
+                gold += result["gold"]
+                if result["item"] is not None:
+                    item_value += result["item"].value
+        rows.append({
+            "level": level,
+            "attack": attack,
+            "enemy": template["name"],
+            "fights": fights,
+            "win_rate": round(wins / fights, 4),
+            "mean_rounds_to_kill": round(rounds_to_kill / wins, 2) if wins else None,
+            "mean_hp_lost": round(hp_lost / fights, 2),
+            "xp_per_fight": round(experience / fights, 2),
+            "gold_per_fight": round(gold / fights, 2),
+            "item_value_per_fight": round(item_value / fights, 2),
+        })
+    return rows
+
+def get_rules_sources(root: str = __file__) -> List[str]:
+    """
+    Returns the source files of root and of every game module it imports, directly or through
+    other game modules: everything a sweep can run. Found from the import statements, so a
+    module added to the rules later is covered without being listed here.
+    """
+    pending = [os.path.abspath(root)]
+    sources = set()
+    while pending:
+        path = pending.pop()
+        if path in sources:
+            continue
+        sources.add(path)
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.level == 1: # from .x import y / from . import x
+                names = [node.module] if node.module else [alias.name for alias in node.names]
+                for name in names:
+                    module_path = os.path.join(_PACKAGE_DIR, name.split(".")[0] + ".py")
+                    if os.path.exists(module_path):
+                        pending.append(module_path)
+    return sorted(sources)
+
+def get_cache_key(enemy_templates: Sequence[Dict[str, Any]], levels: List[int], attacks: List[int],
+                  fights: int, seed: int, loot_tables: Optional[Dict[str, LootTable]] = None) -> str:
+    """
+    Hashes everything a sweep result depends on: the enemy, item and loot table data, the sweep
+    parameters and the source of every game module the sweep runs (see get_rules_sources).
+    """
+    loot_tables = loot_tables or {}
+    items = {item.name: item.to_dict() for table in loot_tables.values() for item in table.items}
+    digest = hashlib.sha256()
+    digest.update(json.dumps([dict(template) for template in enemy_templates], sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps({"items": items, "loot_tables": get_loot_table_rows(loot_tables)},
+                             sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps({"levels": levels, "attacks": attacks, "fights": fights, "seed": seed}).encode("utf-8"))
+    for path in get_rules_sources():
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def run_sweep(enemy_templates: Sequence[Dict[str, Any]], levels: List[int], attacks: List[int],
+              fights: int = 200, seed: int = 0, workers: Optional[int] = None,
+              cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+              loot_tables: Optional[Dict[str, LootTable]] = None) -> List[Dict[str, Any]]:
+    """
+    Runs (or loads from cache) a balance sweep over levels x attacks x enemy templates.
+
+    Args:
+        enemy_templates (Sequence[Dict[str, Any]]): Enemy templates, e.g. from DataLoader.
+        levels (List[int]): Character levels to test.
+        attacks (List[int]): Character base attack stats to test.
+        fights (int): Fights per (level, attack, template) cell.
+        seed (int): Base random seed.
+        workers (Optional[int]): Process pool size. Defaults to the CPU count.
+        cache_dir (Optional[str]): Where results are cached. None disables caching.
+        loot_tables (Optional[Dict[str, LootTable]]): Enemy name -> the items it can drop
+            (see DataLoader.load_loot_tables). None sweeps without item drops.
+
+    Returns:
+        List[Dict[str, Any]]: Result rows ordered by level, attack, then template.
+    """
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, get_cache_key(enemy_templates, levels, attacks, fights, seed, loot_tables) + ".json")
+        if os.path.exists(cache_path):
+            with open(cache_path, "r", encoding="utf-8") as f:
+                print(f"Loaded cached sweep results from {cache_path}.")
+                return json.load(f)
+
+    cells = [(level, attack) for level in levels for attack in attacks]
+    rows: List[Dict[str, Any]] = []
+    with publish_enemy_catalog(enemy_templates) as catalog:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(catalog.name, loot_tables)) as pool:
+            futures = [pool.submit(sweep_cell, level, attack, fights, seed) for level, attack in cells]
+            for future in futures:
+                rows.extend(future.result())
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f)
+    return rows
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """Formats result rows as a fixed-width text table."""
+    table = [RESULT_COLUMNS] + [["-" if row[column] is None else str(row[column]) for column in RESULT_COLUMNS]
+                                for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(RESULT_COLUMNS))]
+    return "\n".join("  ".join(value.ljust(width) for value, width in zip(line, widths)) for line in table)
+
+def write_csv(rows: List[Dict[str, Any]], filepath: str):
+    """Writes result rows to a CSV file."""
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Sweep character levels/attack stats against every enemy template.")
+    parser.add_argument("--levels", type=parse_int_list, default=parse_int_list("1-10"),
+                        help="Character levels, e.g. 1-10 or 1,5,10 (default: 1-10)")
+    parser.add_argument("--attacks", type=parse_int_list, default=parse_int_list("1-3"),
+                        help="Base attack stats, e.g. 1-3 (default: 1-3)")
+    parser.add_argument("--fights", type=int, default=200, help="Fights per cell (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Base random seed (default: 0)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", default="balance_results.csv", help="CSV file to write (default: balance_results.csv)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Result cache folder (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-run the sweep")
+    args = parser.parse_args(argv)
+
+    data_loader = DataLoader(data_folder_path="data")
+    enemy_templates = data_loader.load_enemy_definitions()
+    if not enemy_templates:
+        print("Critical Error: Could not load enemy definitions. Nothing to sweep.")
+        return 1
+    loot_tables = data_loader.load_loot_tables(data_loader.load_item_definitions())
+
+    rows = run_sweep(enemy_templates, args.levels, args.attacks, fights=args.fights, seed=args.seed,
+                     workers=args.workers, cache_dir=None if args.no_cache else args.cache_dir,
+                     loot_tables=loot_tables)
+    print(format_table(rows))
+    write_csv(rows, args.output)
+    print(f"Wrote {len(rows)} rows to {args.output}.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
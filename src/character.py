@@ -1,4 +1,48 @@
 import math
+from typing import Optional, Union
+from . import log
+from .inventory import Inventory
+from .item import ITEM_SLOTS, Item, get_item_rating
+
+logger = log.get_logger("character")
+
+class EquipmentSlots(dict):
+    """
+    The character's equipment: slot ("weapon", "armour", "item") -> Item, None, or a plain
+    string from saves made before items existed. Counts its changes in version, so derived
+    stats cached from it know when to recompute (see Character.get_attack_power).
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version: int = 0
+
+    def __setitem__(self, slot, equipped):
+        super().__setitem__(slot, equipped)
+        self.version += 1
+
+    def __delitem__(self, slot):
+        super().__delitem__(slot)
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, slot, default=None):
+        self.version += 1
+        return super().setdefault(slot, default)
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self.version += 1
 
 class Character:
     """
@@ -7,16 +51,22 @@ class Character:
     """
     def __init__(self, name: str, level: int = 1, current_experience: int = 0,
                  gold: int = 0, equipment: dict = None, current_hp: int = -1,
-                 base_attack_stat: int = 1): # Added base_attack_stat
+                 base_attack_stat: int = 1, inventory: Optional[Inventory] = None): # Added base_attack_stat
+        # Derived combat stats are cached and recomputed only when something they depend on
+        # changes: level, base attack and buffs bump _stats_version, equipment its own version.
+        self._stats_version: int = 0
+        self._derived_stats: tuple = (-1, -1, 0, 0) # (stats version, equipment version, attack, reduction)
         self.name: str = name
         self.level: int = level
         self.current_experience: int = current_experience
         self.gold: int = gold
-        self.equipment: dict = equipment if equipment is not None else {
+        self.equipment: EquipmentSlots = equipment if equipment is not None else {
             "weapon": None, "armour": None, "item": None
         }
+        self.inventory: Inventory = inventory if inventory is not None else Inventory() # Loot kept, not cashed in
         self.is_dead: bool = False
         self.base_attack_stat: int = base_attack_stat # Player's unarmed attack
+        self.attack_bonus: int = 0 # From temporary buffs (see status_effects.py), not saved
 
         # Calculated stats
         self.experience_to_next_level: int = 0
@@ -33,6 +83,42 @@ class Character:
             self.is_dead = True
 
 
+    @property
+    def level(self) -> int:
+        return self._level
+
+    @level.setter
+    def level(self, value: int):
+        self._level = value
+        self._stats_version += 1
+
+    @property
+    def base_attack_stat(self) -> int:
+        return self._base_attack_stat
+
+    @base_attack_stat.setter
+    def base_attack_stat(self, value: int):
+        self._base_attack_stat = value
+        self._stats_version += 1
+
+    @property
+    def attack_bonus(self) -> int:
+        return self._attack_bonus
+
+    @attack_bonus.setter
+    def attack_bonus(self, value: int):
+        self._attack_bonus = value
+        self._stats_version += 1
+
+    @property
+    def equipment(self) -> EquipmentSlots:
+        return self._equipment
+
+    @equipment.setter
+    def equipment(self, value: dict):
+        self._equipment = value if isinstance(value, EquipmentSlots) else EquipmentSlots(value)
+        self._stats_version += 1
+
     def _update_stats_for_level(self):
         """
         Private method to recalculate max_hp and experience_to_next_level
@@ -61,33 +147,47 @@ class Character:
             hp_increase = self.max_hp - old_max_hp
             self.current_hp = min(self.max_hp, self.current_hp + hp_increase) # Add HP increase, don't just set to full
             leveled_up_this_gain = True
-            print(f"Ding! {self.name} reached Level {self.level}!")
+            logger.info("Ding! %s reached Level %d!", self.name, self.level)
 
         if leveled_up_this_gain: # If leveled up, ensure not dead if was alive
             if self.current_hp > 0:
                  self.is_dead = False
 
+    def _compute_derived_stats(self) -> tuple:
+        """
+        Computes (attack power, damage reduction) from scratch: base_attack_stat plus buffs plus the
+        attack bonuses of everything equipped, and the damage reductions of everything equipped.
+        Legacy string equipment gives no bonuses.
+        """
+        attack_power = self.base_attack_stat + self.attack_bonus
+        damage_reduction = 0
+        for equipped in self._equipment.values():
+            if isinstance(equipped, Item):
+                attack_power += equipped.attack_bonus
+                damage_reduction += equipped.damage_reduction
+        return attack_power, damage_reduction
+
+    def _get_derived_stats(self) -> tuple:
+        """Returns the cached derived stats, recomputing them if anything they depend on has changed."""
+        stats = self._derived_stats
+        if stats[0] != self._stats_version or stats[1] != self._equipment.version:
+            stats = (self._stats_version, self._equipment.version) + self._compute_derived_stats()
+            self._derived_stats = stats
+        return stats
+
     def get_attack_power(self) -> int:
         """
-        Calculates the character's current attack power.
-        For Phase 2, this is just the base_attack_stat as weapons are not implemented.
-        Future: Add weapon damage.
+        Returns the character's current attack power (max damage): base_attack_stat, plus buffs,
+        plus weapon (and other equipment) attack bonuses. Cached between changes.
         """
-        # Example for future:
-        # weapon_damage = self.equipment.get("weapon").damage if self.equipment.get("weapon") else 0
-        # return self.base_attack_stat + weapon_damage
-        return self.base_attack_stat
+        return self._get_derived_stats()[2]
 
     def get_damage_reduction(self) -> int:
         """
-        Calculates the character's current damage reduction from armour.
-        For Phase 2, this is 0 as armour is not implemented.
-        Future: Add armour value.
+        Returns the damage subtracted from each hit: the damage reduction of the equipped armour
+        (and other equipment). Cached between changes.
         """
-        # Example for future:
-        # armour_value = self.equipment.get("armour").reduction if self.equipment.get("armour") else 0
-        # return armour_value
-        return 0
+        return self._get_derived_stats()[3]
 
     def take_damage(self, amount: int):
         """
@@ -145,9 +245,67 @@ class Character:
         """Increases gold count."""
         if amount > 0:
             self.gold += amount
-            print(f"{self.name} found {amount} gold. Total: {self.gold} gold.")
+            logger.info("%s found %d gold. Total: %d gold.", self.name, amount, self.gold)
         elif amount < 0:
-            print("Cannot add a negative amount of gold through this method.")
+            logger.warning("Cannot add a negative amount of gold through this method.")
+
+    def is_upgrade(self, item: Item) -> bool:
+        """Checks whether item ranks above what is equipped in its slot (see get_item_rating), or the slot is empty."""
+        equipped = self.equipment.get(item.slot)
+        return equipped is None or get_item_rating(item) > get_item_rating(equipped)
+
+    def equip(self, item: Item) -> Optional[Union[Item, str]]:
+        """
+        Equips item in its slot, taking it from the inventory if it is there. A replaced item goes
+        into the inventory; a legacy string item is just dropped.
+
+        Returns:
+            Optional[Union[Item, str]]: What was in the slot before, if anything.
+        """
+        self.inventory.remove(item)
+        replaced = self.equipment.get(item.slot)
+        self.equipment[item.slot] = item
+        logger.info("%s equips %s.", self.name, item.name)
+        if isinstance(replaced, Item):
+            self.inventory.add(replaced)
+        return replaced
+
+    def receive_item(self, item: Item):
+        """Takes an item dropped as loot: equips it if it is an upgrade, otherwise keeps it in the inventory."""
+        if self.is_upgrade(item):
+            self.equip(item)
+        else:
+            self.inventory.add(item)
+            logger.info("%s puts %s in the inventory.", self.name, item.name)
+
+    def get_best_owned(self, slot: str) -> Optional[Union[Item, str]]:
+        """Returns the best item for slot among the equipped one and the inventory (see get_item_rating)."""
+        equipped = self.equipment.get(slot)
+        best_held = self.inventory.get_best(slot)
+        if best_held is not None and (equipped is None or get_item_rating(best_held) > get_item_rating(equipped)):
+            return best_held
+        return equipped
+
+    def cash_in_worse_than_equipped(self) -> int:
+        """
+        Cashes in every inventory item rated below the item equipped in its slot. Items as good as
+        the equipped one are kept, as is everything for an empty slot.
+
+        Returns:
+            int: The gold gained.
+        """
+        gold = count = 0
+        for slot in ITEM_SLOTS:
+            equipped = self.equipment.get(slot)
+            if equipped is None:
+                continue
+            for item, item_count in self.inventory.remove_rated_below(slot, get_item_rating(equipped)):
+                gold += max(0, item.value) * item_count
+                count += item_count
+        self.gold += gold
+        if count:
+            logger.info("%s cashes in %d items for %d gold. Total: %d gold.", self.name, count, gold, self.gold)
+        return gold
 
 
     def get_summary(self) -> str:
@@ -163,6 +321,7 @@ class Character:
             f"EXP: {self.current_experience}/{self.experience_to_next_level}\n"
             f"Attack Power: {self.get_attack_power()} | Damage Reduction: {self.get_damage_reduction()}\n"
             f"Gold: {self.gold}\n"
+            f"Inventory: {len(self.inventory)} items (worth {self.inventory.total_value} gold)\n"
             f"Equipment:\n"
             f"  Weapon: {self.equipment.get('weapon', 'None')}\n"
             f"  Armour: {self.equipment.get('armour', 'None')}\n"
@@ -179,8 +338,10 @@ class Character:
             "current_experience": self.current_experience,
             "current_hp": self.current_hp,
             "gold": self.gold,
-            "equipment": self.equipment,
-            "base_attack_stat": self.base_attack_stat
+            "equipment": {slot: equipped.to_dict() if isinstance(equipped, Item) else equipped
+                          for slot, equipped in self.equipment.items()},
+            "base_attack_stat": self.base_attack_stat,
+            "inventory": self.inventory.to_list()
         }
 
     @classmethod
@@ -192,6 +353,8 @@ class Character:
             current_experience=data.get("current_experience", 0),
             current_hp=data.get("current_hp", -1), # Will default to max_hp if -1
             gold=data.get("gold", 0),
-            equipment=data.get("equipment", {"weapon": None, "armour": None, "item": None}),
-            base_attack_stat=data.get("base_attack_stat", 1) # Default for old saves
+            equipment={slot: Item.from_dict(equipped) if isinstance(equipped, dict) else equipped # Strings: old saves
+                       for slot, equipped in data.get("equipment", {"weapon": None, "armour": None, "item": None}).items()},
+            base_attack_stat=data.get("base_attack_stat", 1), # Default for old saves
+            inventory=Inventory.from_list(data.get("inventory", []))
         )
@@ -0,0 +1,64 @@
+"""
+Terminal client for the AFK Quest server (src.server).
+
+Usage (from the project root):
+    python -m src.client --port 8765
+"""
+import argparse
+import asyncio
+import sys
+import threading
+from typing import Optional
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+async def _print_server_output(reader: asyncio.StreamReader):
+    """Copies everything the server sends to the terminal until it disconnects."""
+    while True:
+        data = await reader.read(4096)
+        if not data:
+            return
+        sys.stdout.write(data.decode("utf-8", errors="replace"))
+        sys.stdout.flush()
+
+def _read_stdin_lines(loop: asyncio.AbstractEventLoop, lines: asyncio.Queue):
+    """Runs on a daemon thread: reads stdin lines into the queue (None at end of input)."""
+    for line in sys.stdin:
+        loop.call_soon_threadsafe(lines.put_nowait, line)
+    loop.call_soon_threadsafe(lines.put_nowait, None)
+
+async def _send_player_input(writer: asyncio.StreamWriter):
+    """Sends each line typed by the player to the server until stdin closes."""
+    lines: asyncio.Queue = asyncio.Queue()
+    # A daemon thread, so a blocked stdin read never keeps the client alive after disconnecting
+    threading.Thread(target=_read_stdin_lines, args=(asyncio.get_running_loop(), lines), daemon=True).start()
+    while True:
+        line = await lines.get()
+        if line is None:
+            writer.close()
+            return
+        writer.write(line.encode("utf-8"))
+        await writer.drain()
+
+async def play(host: str, port: int):
+    """Connects to the server and relays output and input until the session ends."""
+    reader, writer = await asyncio.open_connection(host, port)
+    input_task = asyncio.create_task(_send_player_input(writer))
+    await _print_server_output(reader)
+    input_task.cancel()
+    writer.close()
+
+def main(argv: Optional[list] = None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Play AFK Quest on a server.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Server address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Server port (default: {DEFAULT_PORT})")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(play(args.host, args.port))
+    except (ConnectionError, OSError) as e:
+        print(f"Could not connect to {args.host}:{args.port}: {e}")
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
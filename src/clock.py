@@ -0,0 +1,118 @@
+import abc
+import time
+from .lazy_import import lazy_import
+
+asyncio = lazy_import("asyncio") # Only the async_sleep variants need it
+
+class Clock(abc.ABC):
+    """
+    Source of game time: everything that waits (combat pacing, resting, AFK timers) or
+    timestamps game events goes through the current clock (see get_clock), so the same
+    code can run in real time, faster than real time or instantly.
+    """
+    @abc.abstractmethod
+    def now(self) -> float:
+        """Returns the current game time in seconds (only differences are meaningful)."""
+
+    @abc.abstractmethod
+    def sleep(self, seconds: float):
+        """Blocks until seconds of game time have passed."""
+
+    @abc.abstractmethod
+    async def async_sleep(self, seconds: float):
+        """Suspends the calling coroutine until seconds of game time have passed."""
+
+    @abc.abstractmethod
+    def describe(self) -> str:
+        """Returns the command line form of this clock (see parse_clock)."""
+
+class RealClock(Clock):
+    """Game time is wall time."""
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def async_sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds))
+
+    def describe(self) -> str:
+        return "real"
+
+class AcceleratedClock(Clock):
+    """Game time runs factor times faster than wall time (a 60 s rest takes 1 s at 60x)."""
+    def __init__(self, factor: float):
+        """
+        Args:
+            factor (float): Game seconds per wall second. Must be positive.
+        """
+        if factor <= 0:
+            raise ValueError("Clock acceleration factor must be positive.")
+        self.factor = factor
+        self._start = time.monotonic()
+
+    def now(self) -> float:
+        return (time.monotonic() - self._start) * self.factor
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds / self.factor)
+
+    async def async_sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds) / self.factor)
+
+    def describe(self) -> str:
+        return f"accelerated:{self.factor:g}"
+
+class VirtualClock(Clock):
+    """Manual game time: sleeping advances the clock instantly, and nothing else moves it."""
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float):
+        """Moves game time forward without waiting."""
+        if seconds > 0:
+            self._now += seconds
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    async def async_sleep(self, seconds: float):
+        self.advance(seconds)
+        await asyncio.sleep(0) # Still yield, so other sessions get a turn
+
+    def describe(self) -> str:
+        return "virtual"
+
+_clock: Clock = RealClock()
+
+def get_clock() -> Clock:
+    """Returns the clock the game currently uses."""
+    return _clock
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    Replaces the game clock (normally once, at startup).
+
+    Returns:
+        Clock: The previous clock, so callers can restore it.
+    """
+    global _clock # pylint: disable=global-statement
+    previous, _clock = _clock, clock
+    return previous
+
+def parse_clock(text: str) -> Clock:
+    """Builds a clock from its command line form: "real", "virtual" or "accelerated:<factor>"."""
+    name, _, factor = text.partition(":")
+    if name == "real" and not factor:
+        return RealClock()
+    if name == "virtual" and not factor:
+        return VirtualClock()
+    if name == "accelerated" and factor:
+        return AcceleratedClock(float(factor))
+    raise ValueError(f"Unknown clock '{text}'. Use 'real', 'virtual' or 'accelerated:<factor>'.")
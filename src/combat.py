@@ -1,80 +1,339 @@
+import io
 import random
-import time # For slight pauses to make combat readable
+import sys
+from typing import AsyncIterator, Callable, Iterator, Optional
+from . import clock # Pauses that make combat readable go through the game clock
+from . import log
+from . import metrics
+from . import tracing
 from .character import Character # Relative import
+from .combat_events import (AttackResolved, CombatEnded, CombatRenderer, CombatStarted, EffectTriggered,
+                            EncounterStarted, EnemyDefeated, ExperienceGained, ItemLooted, LootGained, PlayerDefeated,
+                            RoundEnded, RoundStarted, TerminalRenderer)
 from .enemy import Enemy # Relative import
+from .rng import RandomSource
+from .lazy_import import lazy_import
+from .status_effects import StatusEffectEngine
 
-def start_combat(player: Character, enemy: Enemy):
+asyncio = lazy_import("asyncio") # Only the async combat variants need it
+
+DEFAULT_MAX_ROUNDS = 10000 # Guards headless fights where neither side can deal damage
+FAST_FORWARD_KEY = "F" # Entered at a round prompt to skip to the end of the fight
+# Pauses (seconds) that pace interactive combat so it is readable
+START_PAUSE_SECONDS = 1
+TURN_PAUSE_SECONDS = 1 # After each side's attack
+END_PAUSE_SECONDS = 3
+
+FIGHTS = metrics.counter("afk_quest_fights_total", "Fights finished, by outcome.", ["outcome"])
+FIGHT_ROUNDS = metrics.histogram("afk_quest_fight_rounds", "Rounds per finished fight.",
+                                 buckets=(1, 2, 3, 5, 10, 20, 50, 100))
+_FIGHTS_BY_OUTCOME = {outcome: FIGHTS.labels(outcome) for outcome in ("player_won", "player_lost", "stalemate")}
+
+def _record_fight(outcome: str, rounds: int):
+    """Counts a finished fight (a no-op unless metrics are enabled)."""
+    if metrics.enabled():
+        _FIGHTS_BY_OUTCOME[outcome].inc()
+        FIGHT_ROUNDS.observe(rounds)
+
+def get_paced_duration(rounds: int, outcome: str) -> float:
     """
-    Manages a combat encounter between the player and an enemy.
+    Returns how long (in seconds of pauses) start_combat takes for a fight of this length,
+    not counting time spent waiting for the player to press Enter.
+    The winning blow ends the round before the enemy's turn.
+    """
+    turns = rounds * 2 - 1 if outcome == "player_won" else rounds * 2
+    return START_PAUSE_SECONDS + turns * TURN_PAUSE_SECONDS + END_PAUSE_SECONDS
+
+def roll_damage(attack_power: int, rng: Optional[RandomSource] = None) -> int:
+    """
+    Rolls an attack's damage: randomized between 0 and attack_power
+    (inclusive of 0 for a "miss" or ineffective hit).
+    Uses rng if given (see rng.RandomSource), otherwise the random module.
+    """
+    return (rng if rng is not None else random).randint(0, attack_power)  # nosec B311 - Non-cryptographic use for game mechanics
+
+def get_experience_reward(enemy: Enemy) -> int:
+    """Returns the experience awarded for defeating enemy (based on enemy toughness)."""
+    return enemy.max_hp // 2
+
+def _victory_events(player: Character, enemy: Enemy, round_num: int, apply_rewards: bool,
+                    rng: Optional[RandomSource] = None) -> Iterator:
+    """Yields the end of a fight the player won, giving the rewards if apply_rewards."""
+    yield EnemyDefeated(enemy.name)
+    gold = enemy.get_loot_gold(rng)
+    if gold > 0:
+        yield LootGained(player.name, enemy.name, gold)
+        if apply_rewards:
+            player.add_gold(gold)
+    item = enemy.roll_loot_item(rng)
+    if item is not None:
+        yield ItemLooted(player.name, enemy.name, item.name, item.value)
+        if apply_rewards:
+            player.receive_item(item)
+    experience = get_experience_reward(enemy)
+    yield ExperienceGained(player.name, experience)
+    if apply_rewards:
+        player.gain_experience(experience)
+    _record_fight("player_won", round_num)
+    yield CombatEnded("player_won", round_num, gold, experience)
+
+def combat_events(player: Character, enemy: Enemy, apply_rewards: bool = True,
+                  max_rounds: int = DEFAULT_MAX_ROUNDS, effects: Optional[StatusEffectEngine] = None,
+                  rng: Optional[RandomSource] = None) -> Iterator:
+    """
+    Resolves a combat encounter as a stream of events (see combat_events module). This is the
+    combat rules engine: it never prints, pauses or prompts, and state changes (damage, loot,
+    experience) happen as the stream is consumed. The last event is always CombatEnded.
 
     Args:
         player (Character): The player character.
         enemy (Enemy): The enemy instance.
+        apply_rewards (bool): If True, loot gold and experience are given to the player on a win,
+                              right after their events are yielded. If False, they are only reported.
+        max_rounds (int): Rounds after which the fight ends as a "stalemate".
+        effects (Optional[StatusEffectEngine]): Status effects on the combatants. The engine ticks
+                                                once at the start of every round.
+        rng (Optional[RandomSource]): Source of damage and loot rolls. Defaults to the random module.
 
-    Returns:
-        str: A string indicating the outcome ("player_won", "player_lost", "player_fled" - though flee not in P2).
+    Yields:
+        CombatStarted, then per round RoundStarted, EffectTriggered for any status effects,
+        AttackResolved (player, then enemy) and either RoundEnded or the end of the fight
+        (EnemyDefeated, LootGained, ExperienceGained or PlayerDefeated), and finally CombatEnded.
     """
-    print("\n--- COMBAT START ---")
-    print(f"{player.name} (HP: {player.current_hp}/{player.max_hp}) vs. {enemy.name} (HP: {enemy.current_hp}/{enemy.max_hp})")
-    print("--------------------")
-    time.sleep(1)
+    yield CombatStarted(player.name, player.current_hp, player.max_hp, enemy.name, enemy.current_hp, enemy.max_hp)
+    round_num = 0
+    while round_num < max_rounds:
+        round_num += 1
+        yield RoundStarted(round_num)
 
-    round_num = 1
-    while not player.is_dead and not enemy.is_dead:
-        print(f"\n--- Round {round_num} ---")
+        if effects is not None:
+            for effect, message in effects.tick():
+                yield EffectTriggered(round_num, effect.name, effect.target.name, message)
+            if enemy.is_dead:
+                yield from _victory_events(player, enemy, round_num, apply_rewards, rng)
+                return
+            if player.is_dead:
+                yield PlayerDefeated(player.name, enemy.name)
+                _record_fight("player_lost", round_num)
+                yield CombatEnded("player_lost", round_num, 0, 0)
+                return
 
         # Player's turn
-        player_attack_power = player.get_attack_power()
-        # Damage is randomized between 0 and attack_power (inclusive of 0 for a "miss" or ineffective hit)
-        player_damage = random.randint(0, player_attack_power)  # nosec B311 - Non-cryptographic use for game mechanics
+        player_damage = roll_damage(player.get_attack_power(), rng)
+        hp_before = enemy.current_hp
+        enemy.take_damage(player_damage)
+        yield AttackResolved(round_num, True, player.name, enemy.name, player_damage,
+                             hp_before - enemy.current_hp, enemy.current_hp, enemy.max_hp)
+        if enemy.is_dead:
+            yield from _victory_events(player, enemy, round_num, apply_rewards, rng)
+            return
+
+        # Enemy's turn
+        enemy_damage = roll_damage(enemy.get_attack_power(), rng)
+        hp_before = player.current_hp
+        damage_log = player.take_damage(enemy_damage) if enemy_damage > 0 else ""
+        yield AttackResolved(round_num, False, enemy.name, player.name, enemy_damage,
+                             hp_before - player.current_hp, player.current_hp, player.max_hp, damage_log)
+        if player.is_dead:
+            yield PlayerDefeated(player.name, enemy.name)
+            _record_fight("player_lost", round_num)
+            yield CombatEnded("player_lost", round_num, 0, 0)
+            return
+        yield RoundEnded(round_num)
+    _record_fight("stalemate", round_num)
+    yield CombatEnded("stalemate", round_num, 0, 0)
+
+async def async_combat_events(player: Character, enemy: Enemy, apply_rewards: bool = True,
+                              max_rounds: int = DEFAULT_MAX_ROUNDS,
+                              rng: Optional[RandomSource] = None) -> AsyncIterator:
+    """
+    Async iterator over combat_events. Yields control to the event loop once per round,
+    so long unpaced fights never hold up other coroutines.
+    """
+    for event in combat_events(player, enemy, apply_rewards, max_rounds, rng=rng):
+        if type(event) is RoundEnded:
+            await asyncio.sleep(0)
+        yield event
+
+def get_event_pause(event) -> float:
+    """Returns how long interactive combat pauses after showing an event (see get_paced_duration)."""
+    event_type = type(event)
+    if event_type is AttackResolved:
+        return TURN_PAUSE_SECONDS
+    if event_type is CombatStarted or event_type is EncounterStarted:
+        return START_PAUSE_SECONDS
+    if event_type is CombatEnded and event.outcome != "stalemate":
+        return END_PAUSE_SECONDS
+    return 0
+
+def simulate_combat(player: Character, enemy: Enemy, apply_rewards: bool = True,
+                    max_rounds: int = DEFAULT_MAX_ROUNDS, rng: Optional[RandomSource] = None) -> dict:
+    """
+    Resolves a combat encounter headlessly: same rules as start_combat, but with no
+    printing, pauses or prompts. Used for simulations and balance sweeps.
+
+    Args:
+        player (Character): The player character.
+        enemy (Enemy): The enemy instance.
+        apply_rewards (bool): If True, loot (gold and any item) and experience are given to the player on a win.
+                              If False, they are only reported.
+        max_rounds (int): Rounds after which the fight is declared a "stalemate".
+        rng (Optional[RandomSource]): Source of damage and loot rolls. Defaults to the random
+                                      module; a RandomSource is several times faster.
 
+    Returns:
+        dict: The outcome ("player_won", "player_lost" or "stalemate"), "rounds",
+              "damage_dealt", "damage_taken" (HP the player actually lost), "gold", "item"
+              (the Item dropped, or None) and "experience".
+    """
+    # Same rules as combat_events without building events: this is the hot path of the
+    # simulators and auto-play, and is kept in step with combat_events by the tests.
+    # Attack powers cannot change during a headless fight (no status effects), so they are read once.
+    randint = (rng if rng is not None else random).randint
+    player_attack, enemy_attack = player.get_attack_power(), enemy.get_attack_power()
+    rounds = damage_dealt = damage_taken = 0
+    while rounds < max_rounds:
+        rounds += 1
+
+        player_damage = randint(0, player_attack)  # nosec B311 - Non-cryptographic use for game mechanics
         if player_damage > 0:
-            print(f"{player.name} attacks {enemy.name} for {player_damage} damage!")
             enemy.take_damage(player_damage)
-        else:
-            print(f"{player.name} attacks {enemy.name} but misses or the blow is ineffective!")
+            damage_dealt += player_damage
+        if enemy.is_dead:
+            gold = enemy.get_loot_gold(rng)
+            item = enemy.roll_loot_item(rng)
+            experience = get_experience_reward(enemy)
+            if apply_rewards:
+                if gold > 0:
+                    player.add_gold(gold)
+                if item is not None:
+                    player.receive_item(item)
+                player.gain_experience(experience)
+            _record_fight("player_won", rounds)
+            return {"outcome": "player_won", "rounds": rounds, "damage_dealt": damage_dealt,
+                    "damage_taken": damage_taken, "gold": gold, "item": item, "experience": experience}
 
-        print(f"{enemy.name} HP: {enemy.current_hp}/{enemy.max_hp}")
-        time.sleep(1)
+        enemy_damage = randint(0, enemy_attack)  # nosec B311 - Non-cryptographic use for game mechanics
+        if enemy_damage > 0:
+            hp_before = player.current_hp
+            player.take_damage(enemy_damage)
+            damage_taken += hp_before - player.current_hp
+        if player.is_dead:
+            _record_fight("player_lost", rounds)
+            return {"outcome": "player_lost", "rounds": rounds, "damage_dealt": damage_dealt,
+                    "damage_taken": damage_taken, "gold": 0, "item": None, "experience": 0}
+    _record_fight("stalemate", rounds)
+    return {"outcome": "stalemate", "rounds": rounds, "damage_dealt": damage_dealt,
+            "damage_taken": damage_taken, "gold": 0, "item": None, "experience": 0}
 
-        if enemy.is_dead:
-            print(f"\n{enemy.name} has been defeated!")
-            loot_gold = enemy.get_loot_gold()
-            if loot_gold > 0:
-                print(f"{player.name} loots {loot_gold} gold from {enemy.name}.")
-                player.add_gold(loot_gold) # This will print its own message
-            # XP gain could happen here or be returned for game.py to handle
-            # For now, let's say 5 XP per enemy level (or fixed XP)
-            xp_gained = enemy.max_hp // 2 # Example: XP based on enemy toughness
-            print(f"{player.name} gains {xp_gained} experience points!")
-            player.gain_experience(xp_gained)
-            time.sleep(3)
-            return "player_won"
+def _resolve_with_effects(player: Character, enemy: Enemy, effects: StatusEffectEngine, max_rounds: int,
+                          rng: Optional[RandomSource] = None) -> dict:
+    """
+    Resolves the rest of a fight like simulate_combat(apply_rewards=False), but through
+    combat_events so status effects keep ticking every round. Returns the outcome, "rounds",
+    "gold", "item" and "experience" (no damage totals).
+    """
+    events = combat_events(player, enemy, apply_rewards=False, max_rounds=max_rounds, effects=effects, rng=rng)
+    rounds = 0
+    for event in events:
+        event_type = type(event)
+        if event_type is RoundStarted:
+            rounds = event.round_num
+        elif event_type is EnemyDefeated:
+            # Roll the loot here rather than in the event stream, to keep the Item itself
+            events.close()
+            _record_fight("player_won", rounds)
+            return {"outcome": "player_won", "rounds": rounds, "gold": enemy.get_loot_gold(rng),
+                    "item": enemy.roll_loot_item(rng), "experience": get_experience_reward(enemy)}
+        elif event_type is CombatEnded:
+            return {"outcome": event.outcome, "rounds": event.rounds, "gold": 0, "item": None, "experience": 0}
 
-        # Enemy's turn
-        enemy_attack_power = enemy.attack_stat
-        enemy_damage = random.randint(0, enemy_attack_power)    # nosec B311 - Non-cryptographic use for game mechanics
+def fast_forward_combat(player: Character, enemy: Enemy, rounds_so_far: int,
+                        player_start_hp: int, enemy_start_hp: int,
+                        rng: Optional[RandomSource] = None, effects: Optional[StatusEffectEngine] = None) -> tuple:
+    """
+    Resolves the rest of a fight in one go (same rules as start_combat) and builds a condensed
+    summary, so callers can show it with a single write instead of printing every round.
+    Active status effects keep ticking each round, as they would in the paced fight.
 
-        if enemy_damage > 0:
-            print(f"{enemy.name} retaliates, attacking {player.name} for {enemy_damage} damage!")
-            damage_log = player.take_damage(enemy_damage) # take_damage now returns a log
-            print(damage_log)
-        else:
-            print(f"{enemy.name} attacks {player.name} but misses or the attack is clumsy!")
+    Args:
+        player (Character): The player character.
+        enemy (Enemy): The enemy instance, part way through the fight.
+        rounds_so_far (int): Rounds already fought.
+        player_start_hp (int): Player HP when the fight started, for the damage totals.
+        enemy_start_hp (int): Enemy HP when the fight started, for the damage totals.
+        rng (Optional[RandomSource]): Source of damage and loot rolls. Defaults to the random module.
+        effects (Optional[StatusEffectEngine]): The status effects of the fight, if any.
 
-        print(f"{player.name} HP: {player.current_hp}/{player.max_hp}")
-        time.sleep(1)
+    Returns:
+        tuple: The outcome ("player_won", "player_lost" or "stalemate") and the summary text.
+    """
+    max_rounds = max(0, DEFAULT_MAX_ROUNDS - rounds_so_far)
+    if effects is not None and effects.active_count:
+        result = _resolve_with_effects(player, enemy, effects, max_rounds, rng)
+    else: # The fast path: nothing can change the attack powers
+        result = simulate_combat(player, enemy, apply_rewards=False, rng=rng, max_rounds=max_rounds)
+    summary = io.StringIO()
+    with log.redirect_output(summary): # Collects the messages rewards print and log, in order
+        print("\n--- Fast-forward ---")
+        print(f"Combat lasted {rounds_so_far + result['rounds']} rounds.")
+        print(f"{player.name} dealt {enemy_start_hp - enemy.current_hp} damage and took "
+              f"{player_start_hp - player.current_hp} damage.")
+        print(f"{player.name} HP: {player.current_hp}/{player.max_hp} | {enemy.name} HP: {enemy.current_hp}/{enemy.max_hp}")
+        if result["outcome"] == "player_won":
+            print(f"{enemy.name} has been defeated!")
+            if result["gold"] > 0:
+                print(f"{player.name} loots {result['gold']} gold from {enemy.name}.")
+                player.add_gold(result["gold"])
+            if result["item"] is not None:
+                print(f"{player.name} finds {result['item'].name} on {enemy.name}.")
+                player.receive_item(result["item"])
+            print(f"{player.name} gains {result['experience']} experience points!")
+            player.gain_experience(result["experience"])
+        elif result["outcome"] == "player_lost":
+            print(f"Alas, {player.name} has been defeated by {enemy.name}...")
+        else:
+            print("Neither side can win. The fight ends in a stalemate.")
+    return result["outcome"], summary.getvalue()
 
-        if player.is_dead:
-            print(f"\nAlas, {player.name} has been defeated by {enemy.name}...")
-            time.sleep(3)
-            return "player_lost"
+@tracing.traced(category="combat")
+def start_combat(player: Character, enemy: Enemy, paced: bool = True,
+                 renderer: Optional[CombatRenderer] = None, effects: Optional[StatusEffectEngine] = None,
+                 rng: Optional[RandomSource] = None, input_func: Optional[Callable[[str], str]] = None):
+    """
+    Manages a combat encounter between the player and an enemy.
 
-        round_num += 1
-        input("Press Enter to continue to the next round...")
-        print("--------------------")
+    Args:
+        player (Character): The player character.
+        enemy (Enemy): The enemy instance.
+        paced (bool): If False, combat runs without pauses or waiting for Enter between rounds
+                      (used by the scripted driver). If True, entering FAST_FORWARD_KEY at a round
+                      prompt resolves the rest of the fight at once (see fast_forward_combat).
+        renderer (Optional[CombatRenderer]): Shows the combat events. Defaults to the terminal output.
+        effects (Optional[StatusEffectEngine]): Status effects on the combatants (see combat_events).
+        rng (Optional[RandomSource]): Source of damage and loot rolls. Defaults to the random module.
+        input_func (Optional[Callable[[str], str]]): Answers the round prompts. Defaults to input().
 
-    # Should not be reached if logic is correct, but as a fallback:
-    if player.is_dead: return "player_lost"
-    if enemy.is_dead: return "player_won" # Should have been caught earlier
-    return "stalemate" # Unlikely with this combat model
+    Returns:
+        str: A string indicating the outcome ("player_won", "player_lost", "player_fled" - though flee not in P2).
+    """
+    renderer = renderer if renderer is not None else TerminalRenderer()
+    player_start_hp, enemy_start_hp = player.current_hp, enemy.current_hp
+    events = combat_events(player, enemy, effects=effects, rng=rng)
+    try:
+        for event in events:
+            if isinstance(event, RoundEnded) and paced:
+                choice = (input_func or input)(f"Press Enter to continue to the next round ({FAST_FORWARD_KEY} to fast-forward)...")
+                if choice.strip().upper() == FAST_FORWARD_KEY:
+                    events.close()
+                    outcome, summary = fast_forward_combat(player, enemy, event.round_num,
+                                                           player_start_hp, enemy_start_hp, rng, effects)
+                    sys.stdout.write(summary)
+                    sys.stdout.flush()
+                    return outcome
+            renderer.render(event)
+            if paced:
+                clock.get_clock().sleep(get_event_pause(event))
+    finally:
+        renderer.close()
+    return event.outcome
@@ -0,0 +1,216 @@
+"""
+Typed combat events (produced by combat.combat_events) and renderers that turn them into output.
+
+The rules engine only yields events; what is shown, when and how fast is up to the consumer,
+which can render every event, drop them, batch them or write them somewhere else entirely.
+"""
+import json
+import sys
+from dataclasses import asdict, dataclass
+from typing import List, Optional, TextIO
+
+SEPARATOR = "--------------------"
+
+@dataclass(slots=True)
+class CombatStarted:
+    """Emitted once, before the first round."""
+    player_name: str
+    player_hp: int
+    player_max_hp: int
+    enemy_name: str
+    enemy_hp: int
+    enemy_max_hp: int
+
+@dataclass(slots=True)
+class EncounterStarted:
+    """Emitted once, before the first turn of a multi-enemy encounter (see encounter.py)."""
+    player_name: str
+    player_hp: int
+    player_max_hp: int
+    enemy_names: List[str]
+
+@dataclass(slots=True)
+class RoundStarted:
+    """Emitted at the start of every round."""
+    round_num: int
+
+@dataclass(slots=True)
+class AttackResolved:
+    """One side's attack in a round. damage is the roll; hp_lost is what the defender actually lost."""
+    round_num: int
+    player_attacking: bool
+    attacker_name: str
+    defender_name: str
+    damage: int
+    hp_lost: int
+    defender_hp: int
+    defender_max_hp: int
+    damage_log: str = "" # Character.take_damage's description when the player is hit
+
+@dataclass(slots=True)
+class EffectTriggered:
+    """A status effect fired or wore off at the start of a round (see status_effects.py)."""
+    round_num: int
+    effect_name: str
+    target_name: str
+    message: str
+
+@dataclass(slots=True)
+class EnemyDefeated:
+    """The enemy's HP reached 0."""
+    enemy_name: str
+
+@dataclass(slots=True)
+class LootGained:
+    """Gold dropped by the defeated enemy (only emitted when there is some)."""
+    player_name: str
+    enemy_name: str
+    gold: int
+
+@dataclass(slots=True)
+class ItemLooted:
+    """An item dropped by the defeated enemy (see Enemy.roll_loot_item)."""
+    player_name: str
+    enemy_name: str
+    item_name: str
+    value: int # Gold the item is worth
+
+@dataclass(slots=True)
+class ExperienceGained:
+    """Experience awarded for the win."""
+    player_name: str
+    experience: int
+
+@dataclass(slots=True)
+class PlayerDefeated:
+    """The player's HP reached 0."""
+    player_name: str
+    enemy_name: str
+
+@dataclass(slots=True)
+class RoundEnded:
+    """Both sides are still standing after the round; interactive consumers prompt here."""
+    round_num: int
+
+@dataclass(slots=True)
+class CombatEnded:
+    """Always the last event."""
+    outcome: str # "player_won", "player_lost" or "stalemate"
+    rounds: int
+    gold: int
+    experience: int
+
+def format_terminal_lines(event) -> List[str]:
+    """Returns the lines the interactive game prints for an event (see combat.start_combat)."""
+    event_type = type(event)
+    if event_type is AttackResolved:
+        if event.player_attacking:
+            if event.damage > 0:
+                lines = [f"{event.attacker_name} attacks {event.defender_name} for {event.damage} damage!"]
+            else:
+                lines = [f"{event.attacker_name} attacks {event.defender_name} but misses or the blow is ineffective!"]
+        elif event.damage > 0:
+            lines = [f"{event.attacker_name} retaliates, attacking {event.defender_name} for {event.damage} damage!",
+                     event.damage_log]
+        else:
+            lines = [f"{event.attacker_name} attacks {event.defender_name} but misses or the attack is clumsy!"]
+        lines.append(f"{event.defender_name} HP: {event.defender_hp}/{event.defender_max_hp}")
+        return lines
+    if event_type is RoundStarted:
+        return [f"\n--- Round {event.round_num} ---"]
+    if event_type is RoundEnded:
+        return [SEPARATOR]
+    if event_type is EffectTriggered:
+        return [event.message]
+    if event_type is CombatStarted:
+        return ["\n--- COMBAT START ---",
+                f"{event.player_name} (HP: {event.player_hp}/{event.player_max_hp}) vs. "
+                f"{event.enemy_name} (HP: {event.enemy_hp}/{event.enemy_max_hp})",
+                SEPARATOR]
+    if event_type is EncounterStarted:
+        return ["\n--- ENCOUNTER START ---",
+                f"{event.player_name} (HP: {event.player_hp}/{event.player_max_hp}) vs. "
+                f"{len(event.enemy_names)} enemies: {', '.join(event.enemy_names)}",
+                SEPARATOR]
+    if event_type is EnemyDefeated:
+        return [f"\n{event.enemy_name} has been defeated!"]
+    if event_type is LootGained:
+        return [f"{event.player_name} loots {event.gold} gold from {event.enemy_name}."]
+    if event_type is ItemLooted:
+        return [f"{event.player_name} finds {event.item_name} on {event.enemy_name}."]
+    if event_type is ExperienceGained:
+        return [f"{event.player_name} gains {event.experience} experience points!"]
+    if event_type is PlayerDefeated:
+        return [f"\nAlas, {event.player_name} has been defeated by {event.enemy_name}..."]
+    return []
+
+class CombatRenderer:
+    """Turns combat events into output. Subclasses override render."""
+    def render(self, event):
+        """Handles one event."""
+
+    def close(self):
+        """Flushes anything still buffered."""
+
+class NullRenderer(CombatRenderer):
+    """Discards every event (headless simulations)."""
+
+class TerminalRenderer(CombatRenderer):
+    """Prints events exactly as the interactive game shows them."""
+    def __init__(self, output: Optional[TextIO] = None):
+        """
+        Args:
+            output (Optional[TextIO]): Where lines go. Defaults to sys.stdout at the time of each event.
+        """
+        self.output = output
+
+    def render(self, event):
+        for line in format_terminal_lines(event):
+            print(line, file=self.output if self.output is not None else sys.stdout)
+
+class LogLineRenderer(CombatRenderer):
+    """Writes one compact line per fight, e.g. "Hero vs Rat: player_won in 3 rounds, dealt 5, took 1, +2 gold, +2 XP"."""
+    def __init__(self, output: Optional[TextIO] = None):
+        self.output = output
+        self._names = ("", "")
+        self._dealt = 0
+        self._taken = 0
+
+    def render(self, event):
+        event_type = type(event)
+        if event_type is AttackResolved:
+            if event.player_attacking:
+                self._dealt += event.hp_lost
+            else:
+                self._taken += event.hp_lost
+        elif event_type is CombatStarted:
+            self._names = (event.player_name, event.enemy_name)
+            self._dealt = self._taken = 0
+        elif event_type is EncounterStarted:
+            self._names = (event.player_name, f"{len(event.enemy_names)} enemies")
+            self._dealt = self._taken = 0
+        elif event_type is CombatEnded:
+            print(f"{self._names[0]} vs {self._names[1]}: {event.outcome} in {event.rounds} rounds, "
+                  f"dealt {self._dealt}, took {self._taken}, +{event.gold} gold, +{event.experience} XP",
+                  file=self.output if self.output is not None else sys.stdout)
+
+class JsonLinesRenderer(CombatRenderer):
+    """Writes each event as a JSON object on its own line, with its type under "event"."""
+    def __init__(self, output: Optional[TextIO] = None):
+        self.output = output
+
+    def render(self, event):
+        output = self.output if self.output is not None else sys.stdout
+        output.write(json.dumps({"event": type(event).__name__, **asdict(event)}) + "\n")
+
+    def close(self):
+        (self.output if self.output is not None else sys.stdout).flush()
+
+def get_renderer(name: str, output: Optional[TextIO] = None) -> CombatRenderer:
+    """Returns a renderer by name: "terminal", "log", "jsonl" or "null"."""
+    renderers = {"terminal": TerminalRenderer, "log": LogLineRenderer, "jsonl": JsonLinesRenderer}
+    if name == "null":
+        return NullRenderer()
+    if name not in renderers:
+        raise ValueError(f"Unknown combat renderer '{name}'. Use 'terminal', 'log', 'jsonl' or 'null'.")
+    return renderers[name](output)
@@ -1,9 +1,81 @@
 import csv
 import os
-import requests # For fetching from URL
 import io # For StringIO to treat string as file
 import configparser # For reading .ini config files
-from typing import List, Dict, Any, Optional
+import time
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from . import log
+from . import metrics
+from . import tracing
+from .item import ITEM_SLOTS, Item, LootTable, build_loot_tables
+from .lazy_import import lazy_import
+
+requests = lazy_import("requests") # For fetching from URL; only loaded if a Google Sheet is used
+
+ENEMY_CSV_HEADERS = ['name', 'hp', 'attack_stat', 'loot_gold_min', 'loot_gold_max']
+ITEM_CSV_HEADERS = ['name', 'slot', 'value', 'attack_bonus', 'damage_reduction']
+LOOT_TABLE_CSV_HEADERS = ['enemy', 'item', 'drop_chance']
+
+logger = log.get_logger("data_loader")
+
+ENEMY_LOADS = metrics.counter("afk_quest_enemy_definition_loads_total",
+                              "Enemy definition loads, by the source that succeeded (or none).", ["source"])
+ENEMY_LOAD_SECONDS = metrics.histogram("afk_quest_enemy_definition_load_seconds",
+                                       "Time to load enemy definitions, including fallbacks.")
+ENEMY_TEMPLATES_LOADED = metrics.gauge("afk_quest_enemy_definitions_loaded",
+                                       "Enemy definitions returned by the last load.")
+
+def enemy_template_from_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Converts one CSV row (column name -> raw string) into an enemy template.
+    Raises ValueError for non-numeric stats and KeyError for missing columns.
+    """
+    return {
+        "name": str(row["name"]).strip(),
+        "hp": int(row["hp"]),
+        "attack_stat": int(row["attack_stat"]),
+        "loot_gold_min": int(row["loot_gold_min"]),
+        "loot_gold_max": int(row["loot_gold_max"]),
+    }
+
+def has_valid_enemy_stats(template: Dict[str, Any]) -> bool:
+    """Checks an enemy template's numeric values are in range (positive hp, sane loot bounds)."""
+    return not (template["hp"] <= 0 or template["attack_stat"] < 0 or
+                template["loot_gold_min"] < 0 or template["loot_gold_max"] < 0 or
+                template["loot_gold_min"] > template["loot_gold_max"])
+
+def item_template_from_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Converts one item CSV row into an item template (see item.Item.from_dict).
+    Raises ValueError for non-numeric stats and KeyError for missing columns.
+    """
+    return {
+        "name": str(row["name"]).strip(),
+        "slot": str(row["slot"]).strip().lower(),
+        "value": int(row["value"]),
+        "attack_bonus": int(row["attack_bonus"]),
+        "damage_reduction": int(row["damage_reduction"]),
+    }
+
+def has_valid_item_stats(template: Dict[str, Any]) -> bool:
+    """Checks an item template's slot is known and its numeric values are not negative."""
+    return (template["slot"] in ITEM_SLOTS and template["value"] >= 0 and
+            template["attack_bonus"] >= 0 and template["damage_reduction"] >= 0)
+
+def loot_entry_from_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Converts one loot table CSV row into an entry for item.build_loot_tables.
+    Raises ValueError for a non-numeric drop chance and KeyError for missing columns.
+    """
+    return {
+        "name": str(row["enemy"]).strip(), # The enemy's name
+        "item": str(row["item"]).strip(),
+        "drop_chance": float(row["drop_chance"]),
+    }
+
+def has_valid_drop_chance(entry: Dict[str, Any]) -> bool:
+    """Checks a loot table entry names an item and has a drop chance in (0, 1]."""
+    return bool(entry["item"]) and 0.0 < entry["drop_chance"] <= 1.0
 
 class DataLoader:
     """
@@ -21,37 +93,86 @@ class DataLoader:
         self.base_data_path = os.path.abspath(data_folder_path)
         self.config_filepath = os.path.abspath(config_filepath)
         self.config = self._load_config()
+        # Cache validator (ETag/Last-Modified) from the last successful Google Sheet fetch
+        self.remote_enemy_validator: Optional[str] = None
 
         if not os.path.isdir(self.base_data_path):
-            print(f"Warning: Local data folder not found at {self.base_data_path}. "
-                  f"Ensure it exists if fallback to local files is needed.")
+            logger.warning("Local data folder not found at %s. "
+                           "Ensure it exists if fallback to local files is needed.", self.base_data_path)
 
+    @tracing.traced(category="data")
     def _load_config(self) -> configparser.ConfigParser:
         """Loads the configuration from the .ini file."""
         config = configparser.ConfigParser()
         if not os.path.exists(self.config_filepath):
-            print(f"Warning: Configuration file not found at {self.config_filepath}. "
-                  "DataLoader will rely on default behaviors or fail to find sources.")
+            logger.warning("Configuration file not found at %s. "
+                           "DataLoader will rely on default behaviors or fail to find sources.", self.config_filepath)
             return config # Return empty config
 
         try:
             config.read(self.config_filepath)
         except configparser.Error as e:
-            print(f"Error reading configuration file {self.config_filepath}: {e}")
+            logger.error("Error reading configuration file %s: %s", self.config_filepath, e)
             # Return an empty config or handle as a critical error
         return config
 
-    def _parse_csv_data(self, csv_content_stream: io.TextIOBase, source_description: str) -> List[Dict[str, Any]]:
+    def _get_enemy_source_settings(self) -> Tuple[Optional[str], Optional[str]]:
+        """Returns the (google_sheet_url, local_csv_fallback) pair configured for enemies."""
+        if not self.config.has_section("DataSources.Enemies"):
+            return None, None
+        return (self.config.get("DataSources.Enemies", "google_sheet_url", fallback=None),
+                self.config.get("DataSources.Enemies", "local_csv_fallback", fallback=None))
+
+    @staticmethod
+    def _get_response_validator(headers) -> Optional[str]:
+        """Extracts a cache validator (ETag, else Last-Modified) from HTTP response headers."""
+        return headers.get('ETag') or headers.get('Last-Modified')
+
+    def get_local_enemy_csv_path(self) -> Optional[str]:
+        """Returns the absolute path of the configured local enemy CSV, or None if not configured."""
+        _, local_csv_fallback = self._get_enemy_source_settings()
+        if not local_csv_fallback:
+            return None
+        return os.path.join(self.base_data_path, local_csv_fallback)
+
+    def fetch_remote_enemy_validator(self) -> Optional[str]:
+        """
+        Asks the configured Google Sheet for its current cache validator using a HEAD request,
+        without downloading the sheet.
+
+        Returns:
+            Optional[str]: The ETag or Last-Modified value, or None if no URL is configured,
+                           the request fails, or the server does not provide a validator.
+        """
+        google_sheet_url, _ = self._get_enemy_source_settings()
+        if not google_sheet_url:
+            return None
+        try:
+            response = requests.head(google_sheet_url, timeout=10, allow_redirects=True)
+            response.raise_for_status()
+            return self._get_response_validator(response.headers)
+        except requests.exceptions.RequestException as e:
+            logger.warning("Could not check Google Sheet for changes (%s): %s", google_sheet_url, e)
+            return None
+
+    @tracing.traced(category="data")
+    def _parse_csv_data(self, csv_content_stream: io.TextIOBase, source_description: str,
+                        required_headers: List[str] = ENEMY_CSV_HEADERS,
+                        template_from_row: Callable[[Dict[str, str]], Dict[str, Any]] = enemy_template_from_row,
+                        is_valid: Callable[[Dict[str, Any]], bool] = has_valid_enemy_stats) -> List[Dict[str, Any]]:
         """
         Parses CSV data from a given text stream (like a file or StringIO).
 
         Args:
             csv_content_stream (io.TextIOBase): A text stream containing CSV data.
             source_description (str): A description of the data source (e.g., file path or URL) for logging.
+            required_headers (List[str]): Columns the data must have. Defaults to the enemy columns.
+            template_from_row (Callable): Converts a row to a template (raising ValueError or KeyError).
+            is_valid (Callable): Checks a template's values; rows that fail are skipped.
 
         Returns:
             List[Dict[str, Any]]: A list of dictionaries, where each dictionary
-                                  represents an enemy template.
+                                  represents a template (an enemy template by default).
         """
         enemy_templates: List[Dict[str, Any]] = []
         try:
@@ -61,42 +182,39 @@ class DataLoader:
             # reader = csv.DictReader(csv_content_stream, dialect=dialect)
             reader = csv.DictReader(csv_content_stream)
 
-            required_headers = ['name', 'hp', 'attack_stat', 'loot_gold_min', 'loot_gold_max']
             if not reader.fieldnames or not all(key in reader.fieldnames for key in required_headers):
-                print(f"Error: CSV data from {source_description} is missing required headers: "
-                      f"{', '.join(required_headers)}. Found headers: {reader.fieldnames}")
+                logger.error("CSV data from %s is missing required headers: %s. Found headers: %s",
+                             source_description, ', '.join(required_headers), reader.fieldnames,
+                             extra={"source": source_description})
                 return enemy_templates
 
             for i, row in enumerate(reader):
                 try:
-                    template = {
-                        "name": str(row["name"]).strip(),
-                        "hp": int(row["hp"]),
-                        "attack_stat": int(row["attack_stat"]),
-                        "loot_gold_min": int(row["loot_gold_min"]),
-                        "loot_gold_max": int(row["loot_gold_max"]),
-                    }
+                    template = template_from_row(row)
                     # Basic validation
                     if not template["name"]:
-                        print(f"Warning: Skipping row {i+1} with empty name in {source_description}: {row}")
+                        logger.warning("Skipping row %d with empty name in %s: %s", i + 1, source_description, row,
+                                       extra={"source": source_description, "row_number": i + 1})
                         continue
-                    if template["hp"] <= 0 or template["attack_stat"] < 0 or \
-                       template["loot_gold_min"] < 0 or template["loot_gold_max"] < 0 or \
-                       template["loot_gold_min"] > template["loot_gold_max"]:
-                        print(f"Warning: Skipping row {i+1} with invalid numeric values in {source_description}: {row}")
+                    if not is_valid(template):
+                        logger.warning("Skipping row %d with invalid numeric values in %s: %s", i + 1,
+                                       source_description, row, extra={"source": source_description, "row_number": i + 1})
                         continue
                     enemy_templates.append(template)
                 except ValueError as ve:
-                    print(f"Warning: Skipping row {i+1} with invalid data type in {source_description}: {row}. Error: {ve}")
+                    logger.warning("Skipping row %d with invalid data type in %s: %s. Error: %s", i + 1,
+                                   source_description, row, ve, extra={"source": source_description, "row_number": i + 1})
                 except KeyError as ke:
-                    print(f"Warning: Skipping row {i+1} with missing key in {source_description}: {row}. Error: {ke}")
+                    logger.warning("Skipping row %d with missing key in %s: %s. Error: %s", i + 1,
+                                   source_description, row, ke, extra={"source": source_description, "row_number": i + 1})
         except csv.Error as ce:
-            print(f"CSV Error while processing data from {source_description}: {ce}")
+            logger.error("CSV Error while processing data from %s: %s", source_description, ce)
         except Exception as e:
-            print(f"An unexpected error occurred while parsing CSV from {source_description}: {e}")
+            logger.error("An unexpected error occurred while parsing CSV from %s: %s", source_description, e)
         return enemy_templates
 
 
+    @tracing.traced(category="data")
     def load_enemy_definitions(self) -> List[Dict[str, Any]]:
         """
         Loads enemy definitions, trying the Google Sheet URL from config first,
@@ -104,59 +222,128 @@ class DataLoader:
         """
         enemy_templates: List[Dict[str, Any]] = []
         source_used = "None"
+        metric_source = "none"
+        start_time = time.perf_counter()
 
-        google_sheet_url: Optional[str] = None
-        local_csv_fallback: Optional[str] = None
-
-        if self.config.has_section("DataSources.Enemies"):
-            google_sheet_url = self.config.get("DataSources.Enemies", "google_sheet_url", fallback=None)
-            local_csv_fallback = self.config.get("DataSources.Enemies", "local_csv_fallback", fallback=None)
+        google_sheet_url, local_csv_fallback = self._get_enemy_source_settings()
 
         # Try Google Sheet first
         if google_sheet_url:
-            print(f"Attempting to load enemy definitions from Google Sheet: {google_sheet_url}")
+            logger.info("Attempting to load enemy definitions from Google Sheet: %s", google_sheet_url)
             try:
-                response = requests.get(google_sheet_url, timeout=10) # 10 second timeout
+                with tracing.span("fetch_google_sheet", "data", url=google_sheet_url):
+                    response = requests.get(google_sheet_url, timeout=10) # 10 second timeout
                 response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
                 
                 # Ensure content type is CSV-like, though Google export URLs should be fine
                 content_type = response.headers.get('content-type', '').lower()
                 if 'csv' not in content_type and 'text/plain' not in content_type: # text/plain can sometimes be used for CSV
-                    print(f"Warning: Content type from Google Sheet URL is not CSV ({content_type}). Attempting to parse anyway.")
+                    logger.warning("Content type from Google Sheet URL is not CSV (%s). Attempting to parse anyway.",
+                                   content_type)
 
                 # Use StringIO to treat the string response content like a file
                 csv_content_stream = io.StringIO(response.text, newline='')
                 enemy_templates = self._parse_csv_data(csv_content_stream, google_sheet_url)
                 if enemy_templates:
                     source_used = f"Google Sheet ({google_sheet_url})"
+                    metric_source = "google_sheet"
+                    self.remote_enemy_validator = self._get_response_validator(response.headers)
             except requests.exceptions.RequestException as e:
-                print(f"Error fetching enemy definitions from Google Sheet ({google_sheet_url}): {e}")
+                logger.error("Error fetching enemy definitions from Google Sheet (%s): %s", google_sheet_url, e)
             except Exception as e: # Catch other potential errors during processing
-                print(f"An unexpected error occurred while processing Google Sheet data: {e}")
+                logger.error("An unexpected error occurred while processing Google Sheet data: %s", e)
         else:
-            print("No Google Sheet URL configured for enemy definitions.")
+            logger.info("No Google Sheet URL configured for enemy definitions.")
 
         # If Google Sheet failed or wasn't specified, try local fallback
         if not enemy_templates and local_csv_fallback:
-            print(f"Primary source failed or not specified. Attempting fallback to local CSV: {local_csv_fallback}")
+            logger.info("Primary source failed or not specified. Attempting fallback to local CSV: %s", local_csv_fallback)
             filepath = os.path.join(self.base_data_path, local_csv_fallback)
             if not os.path.exists(filepath):
-                print(f"Error: Local fallback enemy definitions file not found at {filepath}")
+                logger.error("Local fallback enemy definitions file not found at %s", filepath)
             else:
                 try:
                     with open(filepath, mode='r', encoding='utf-8', newline='') as file:
                         enemy_templates = self._parse_csv_data(file, filepath)
                     if enemy_templates:
                         source_used = f"Local CSV ({filepath})"
+                        metric_source = "local_csv"
                 except Exception as e:
-                    print(f"An unexpected error occurred while loading local fallback {filepath}: {e}")
+                    logger.error("An unexpected error occurred while loading local fallback %s: %s", filepath, e)
         elif not enemy_templates and not local_csv_fallback:
-            print("No local CSV fallback configured for enemy definitions.")
+            logger.info("No local CSV fallback configured for enemy definitions.")
 
 
         if not enemy_templates:
-            print("Critical Warning: No enemy definitions loaded from any source.")
+            logger.critical("No enemy definitions loaded from any source.")
         else:
-            print(f"Successfully loaded {len(enemy_templates)} enemy definitions from: {source_used}.")
+            logger.info("Successfully loaded %d enemy definitions from: %s.", len(enemy_templates), source_used,
+                        extra={"source": metric_source, "count": len(enemy_templates)})
+        ENEMY_LOADS.labels(metric_source).inc()
+        ENEMY_LOAD_SECONDS.observe(time.perf_counter() - start_time)
+        ENEMY_TEMPLATES_LOADED.set(len(enemy_templates))
         return enemy_templates
 
+    def _load_local_csv(self, filename: str, description: str, **parse_options) -> List[Dict[str, Any]]:
+        """Parses a CSV file in the data folder (see _parse_csv_data). Returns [] if it is missing or unreadable."""
+        filepath = os.path.join(self.base_data_path, filename)
+        if not os.path.exists(filepath):
+            logger.error("Local %s file not found at %s", description, filepath)
+            return []
+        try:
+            with open(filepath, mode='r', encoding='utf-8', newline='') as file:
+                return self._parse_csv_data(file, filepath, **parse_options)
+        except Exception as e:
+            logger.error("An unexpected error occurred while loading local %s %s: %s", description, filepath, e)
+            return []
+
+    @tracing.traced(category="data")
+    def load_item_definitions(self) -> List[Dict[str, Any]]:
+        """
+        Loads item definitions from the [DataSources.Items] sources in config, like
+        load_enemy_definitions: the Google Sheet URL first, then the local CSV fallback.
+
+        Returns:
+            List[Dict[str, Any]]: Item templates (see item.Item.from_dict), [] if none are configured.
+        """
+        if not self.config.has_section("DataSources.Items"):
+            return []
+        google_sheet_url = self.config.get("DataSources.Items", "google_sheet_url", fallback=None)
+        local_csv_fallback = self.config.get("DataSources.Items", "local_csv_fallback", fallback=None)
+        parse_options = {"required_headers": ITEM_CSV_HEADERS, "template_from_row": item_template_from_row,
+                         "is_valid": has_valid_item_stats}
+        item_templates: List[Dict[str, Any]] = []
+        if google_sheet_url:
+            try:
+                with tracing.span("fetch_google_sheet", "data", url=google_sheet_url):
+                    response = requests.get(google_sheet_url, timeout=10)
+                response.raise_for_status()
+                item_templates = self._parse_csv_data(io.StringIO(response.text, newline=''), google_sheet_url,
+                                                      **parse_options)
+            except requests.exceptions.RequestException as e:
+                logger.error("Error fetching item definitions from Google Sheet (%s): %s", google_sheet_url, e)
+        if not item_templates and local_csv_fallback:
+            item_templates = self._load_local_csv(local_csv_fallback, "item definitions", **parse_options)
+        logger.info("Loaded %d item definitions.", len(item_templates), extra={"count": len(item_templates)})
+        return item_templates
+
+    @tracing.traced(category="data")
+    def load_loot_tables(self, item_templates: List[Dict[str, Any]]) -> Dict[str, LootTable]:
+        """
+        Loads the per-enemy loot tables (the loot_tables_csv file in [DataSources.Items]) and
+        compiles them for fast rolls (see item.LootTable).
+
+        Args:
+            item_templates (List[Dict[str, Any]]): The item catalog (see load_item_definitions).
+
+        Returns:
+            Dict[str, LootTable]: Enemy name -> loot table, {} if none are configured.
+        """
+        loot_tables_csv = self.config.get("DataSources.Items", "loot_tables_csv", fallback=None)
+        if not loot_tables_csv or not item_templates:
+            return {}
+        rows = self._load_local_csv(loot_tables_csv, "loot tables", required_headers=LOOT_TABLE_CSV_HEADERS,
+                                    template_from_row=loot_entry_from_row, is_valid=has_valid_drop_chance)
+        loot_tables = build_loot_tables(rows, [Item.from_dict(template) for template in item_templates])
+        logger.info("Loaded loot tables for %d enemies.", len(loot_tables), extra={"count": len(loot_tables)})
+        return loot_tables
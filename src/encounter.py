@@ -0,0 +1,175 @@
+"""
+Multi-enemy encounters: the player against a pack of enemies, with turn order driven by speed.
+
+Every combatant acts once every TURN_LENGTH // speed time units, starting at a random point
+within its first interval (its initiative). A binary heap of (next turn time, order, combatant)
+picks who acts next in O(log n); combatants that die stay in the heap and are skipped when they
+come up, so no turn ever searches or rebuilds it.
+"""
+import heapq
+import random
+from collections import deque
+from typing import Callable, Iterator, List, Optional
+from . import clock
+from .character import Character # Relative import
+from .combat import DEFAULT_MAX_ROUNDS, get_event_pause, get_experience_reward, roll_damage
+from .combat_events import (AttackResolved, CombatEnded, CombatRenderer, EncounterStarted, EnemyDefeated,
+                            ExperienceGained, ItemLooted, LootGained, PlayerDefeated, RoundEnded, RoundStarted,
+                            TerminalRenderer)
+from .enemy import DEFAULT_SPEED, Enemy # Relative import
+from .rng import RandomSource
+
+TURN_LENGTH = 1000 # Time units per round; a speed 10 combatant acts once every 100 units
+PLAYER = -1 # Heap entry for the player (enemies use their position in the pack)
+
+def get_turn_interval(speed: int) -> int:
+    """Returns the time units between a combatant's turns (at least 1)."""
+    return max(1, TURN_LENGTH // max(1, speed))
+
+def encounter_events(player: Character, enemies: List[Enemy], apply_rewards: bool = True,
+                     max_rounds: int = DEFAULT_MAX_ROUNDS, rng: Optional[RandomSource] = None) -> Iterator:
+    """
+    Resolves a fight between the player and a pack of enemies as a stream of events
+    (the same event types as combat.combat_events, starting with EncounterStarted).
+
+    The player attacks the first enemy of the pack that is still standing; every enemy attacks
+    the player. Rewards are given for each enemy as it falls. A round is TURN_LENGTH time units:
+    RoundStarted/RoundEnded mark its boundaries, and round_num on each AttackResolved is the
+    round the turn fell in.
+
+    Args:
+        player (Character): The player character.
+        enemies (List[Enemy]): The pack.
+        apply_rewards (bool): If True, loot gold and experience are given to the player for each kill.
+        max_rounds (int): Rounds after which the encounter ends as a "stalemate".
+        rng (Optional[RandomSource]): Source of initiative, damage and loot rolls. Defaults to the random module.
+
+    Yields:
+        EncounterStarted, then turns and kills as they happen, and finally CombatEnded
+        (with the total gold and experience).
+    """
+    yield EncounterStarted(player.name, player.current_hp, player.max_hp, [enemy.name for enemy in enemies])
+    # Order numbers break ties between turns at the same time: the player, then the pack in order
+    randrange = (rng if rng is not None else random).randrange
+    player_interval = get_turn_interval(getattr(player, "speed", DEFAULT_SPEED))
+    schedule = [(randrange(player_interval), 0, PLAYER)]  # nosec B311 - Non-cryptographic use for game mechanics
+    for position, enemy in enumerate(enemies):
+        if not enemy.is_dead:
+            first_turn = randrange(get_turn_interval(enemy.speed))  # nosec B311 - Non-cryptographic use for game mechanics
+            schedule.append((first_turn, position + 1, position))
+    heapq.heapify(schedule)
+    targets = deque(enemy for enemy in enemies if not enemy.is_dead)
+    enemies_left = len(targets)
+    gold_total = experience_total = 0
+    round_num = 0
+
+    while enemies_left > 0:
+        turn_time, order, combatant = schedule[0]
+        turn_round = turn_time // TURN_LENGTH + 1
+        if turn_round > max_rounds:
+            break
+        if combatant != PLAYER and enemies[combatant].is_dead:
+            heapq.heappop(schedule) # Lazy removal: the dead are dropped when their turn comes up
+            continue
+        if turn_round != round_num:
+            if round_num:
+                yield RoundEnded(round_num)
+            round_num = turn_round
+            yield RoundStarted(round_num)
+
+        if combatant == PLAYER:
+            while targets[0].is_dead: # Also lazy: fallen targets are dropped when next aimed at
+                targets.popleft()
+            target = targets[0]
+            damage = roll_damage(player.get_attack_power(), rng)
+            hp_before = target.current_hp
+            target.take_damage(damage)
+            yield AttackResolved(round_num, True, player.name, target.name, damage,
+                                 hp_before - target.current_hp, target.current_hp, target.max_hp)
+            if target.is_dead:
+                enemies_left -= 1
+                yield EnemyDefeated(target.name)
+                gold = target.get_loot_gold(rng)
+                if gold > 0:
+                    gold_total += gold
+                    yield LootGained(player.name, target.name, gold)
+                    if apply_rewards:
+                        player.add_gold(gold)
+                item = target.roll_loot_item(rng)
+                if item is not None:
+                    yield ItemLooted(player.name, target.name, item.name, item.value)
+                    if apply_rewards:
+                        player.receive_item(item)
+                experience = get_experience_reward(target)
+                experience_total += experience
+                yield ExperienceGained(player.name, experience)
+                if apply_rewards:
+                    player.gain_experience(experience)
+            heapq.heapreplace(schedule, (turn_time + player_interval, order, combatant))
+        else:
+            enemy = enemies[combatant]
+            damage = roll_damage(enemy.get_attack_power(), rng)
+            hp_before = player.current_hp
+            damage_log = player.take_damage(damage) if damage > 0 else ""
+            yield AttackResolved(round_num, False, enemy.name, player.name, damage,
+                                 hp_before - player.current_hp, player.current_hp, player.max_hp, damage_log)
+            if player.is_dead:
+                yield PlayerDefeated(player.name, enemy.name)
+                yield CombatEnded("player_lost", round_num, gold_total, experience_total)
+                return
+            heapq.heapreplace(schedule, (turn_time + get_turn_interval(enemy.speed), order, combatant))
+
+    outcome = "player_won" if enemies_left == 0 else "stalemate"
+    yield CombatEnded(outcome, round_num, gold_total, experience_total)
+
+def simulate_encounter(player: Character, enemies: List[Enemy], apply_rewards: bool = True,
+                       max_rounds: int = DEFAULT_MAX_ROUNDS, rng: Optional[RandomSource] = None) -> dict:
+    """
+    Resolves a multi-enemy encounter headlessly.
+
+    Returns:
+        dict: The outcome ("player_won", "player_lost" or "stalemate"), "rounds", "turns",
+              "enemies_defeated", "damage_dealt", "damage_taken", "gold" and "experience".
+    """
+    result = {"turns": 0, "enemies_defeated": 0, "damage_dealt": 0, "damage_taken": 0}
+    for event in encounter_events(player, enemies, apply_rewards, max_rounds, rng):
+        event_type = type(event)
+        if event_type is AttackResolved:
+            result["turns"] += 1
+            if event.player_attacking:
+                result["damage_dealt"] += event.damage
+            else:
+                result["damage_taken"] += event.hp_lost
+        elif event_type is EnemyDefeated:
+            result["enemies_defeated"] += 1
+    result.update(outcome=event.outcome, rounds=event.rounds, gold=event.gold, experience=event.experience)
+    return result
+
+def start_encounter(player: Character, enemies: List[Enemy], paced: bool = True,
+                    renderer: Optional[CombatRenderer] = None, rng: Optional[RandomSource] = None,
+                    input_func: Optional[Callable[[str], str]] = None) -> str:
+    """
+    Runs a multi-enemy encounter interactively, like combat.start_combat.
+
+    Args:
+        player (Character): The player character.
+        enemies (List[Enemy]): The pack.
+        paced (bool): If False, the encounter runs without pauses or waiting for Enter between rounds.
+        renderer (Optional[CombatRenderer]): Shows the events. Defaults to the terminal output.
+        rng (Optional[RandomSource]): Source of initiative, damage and loot rolls. Defaults to the random module.
+        input_func (Optional[Callable[[str], str]]): Answers the round prompts. Defaults to input().
+
+    Returns:
+        str: The outcome ("player_won", "player_lost" or "stalemate").
+    """
+    renderer = renderer if renderer is not None else TerminalRenderer()
+    try:
+        for event in encounter_events(player, enemies, rng=rng):
+            if isinstance(event, RoundEnded) and paced:
+                (input_func or input)("Press Enter to continue to the next round...")
+            renderer.render(event)
+            if paced:
+                clock.get_clock().sleep(get_event_pause(event))
+    finally:
+        renderer.close()
+    return event.outcome
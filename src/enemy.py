@@ -1,10 +1,15 @@
 import random
+from typing import Optional
+from .item import Item, LootTable
+
+DEFAULT_SPEED = 10 # Turn frequency in multi-enemy encounters (see encounter.py)
 
 class Enemy:
     """
     Represents an enemy in the game.
     """
-    def __init__(self, name: str, max_hp: int, attack_stat: int, loot_gold_min: int, loot_gold_max: int):
+    def __init__(self, name: str, max_hp: int, attack_stat: int, loot_gold_min: int, loot_gold_max: int,
+                 speed: int = DEFAULT_SPEED, loot_table: Optional[LootTable] = None):
         """
         Initializes an Enemy instance.
 
@@ -14,6 +19,8 @@ class Enemy:
             attack_stat (int): The base attack power of the enemy (max damage).
             loot_gold_min (int): The minimum amount of gold this enemy can drop.
             loot_gold_max (int): The maximum amount of gold this enemy can drop.
+            speed (int): How often the enemy acts in multi-enemy encounters (higher is more often).
+            loot_table (Optional[LootTable]): The items this enemy can drop, if any (see item.py).
         """
         self.name: str = name
         self.max_hp: int = max_hp
@@ -21,8 +28,17 @@ class Enemy:
         self.attack_stat: int = attack_stat # Max damage enemy can do
         self.loot_gold_min: int = loot_gold_min
         self.loot_gold_max: int = loot_gold_max
+        self.speed: int = speed
+        self.loot_table: Optional[LootTable] = loot_table # Shared by every enemy of this kind
+        self.attack_bonus: int = 0 # From temporary buffs (see status_effects.py)
         self.is_dead: bool = False
 
+    def get_attack_power(self) -> int:
+        """
+        Returns the enemy's current attack power (max damage): attack_stat plus any buffs.
+        """
+        return self.attack_stat + self.attack_bonus
+
     def take_damage(self, amount: int):
         """
         Applies damage to the enemy.
@@ -41,16 +57,46 @@ class Enemy:
         # else:
             # print(f"{self.name} takes {amount} damage. {self.current_hp}/{self.max_hp} HP remaining.")
 
-    def get_loot_gold(self) -> int:
+    def heal(self, amount: int) -> str:
+        """
+        Restores HP (up to max_hp) to an enemy that is still standing.
+
+        Returns:
+            str: A description of the healing, or "" if nothing happened.
+        """
+        if amount <= 0 or self.is_dead:
+            return ""
+        self.current_hp = min(self.max_hp, self.current_hp + amount)
+        return f"{self.name} heals for {amount}. {self.current_hp}/{self.max_hp} HP."
+
+    def get_loot_gold(self, rng=None) -> int:
         """
         Determines the amount of gold dropped by this enemy.
 
+        Args:
+            rng (Optional[RandomSource]): Source of the roll (see rng.py). Defaults to the random module.
+
         Returns:
             int: The amount of gold.
         """
         if self.loot_gold_max < self.loot_gold_min: # Should not happen with validation
             return self.loot_gold_min
-        return random.randint(self.loot_gold_min, self.loot_gold_max)   # nosec B311 - Non-cryptographic use for game mechanics
+        return (rng if rng is not None else random).randint(self.loot_gold_min, self.loot_gold_max)   # nosec B311 - Non-cryptographic use for game mechanics
+
+    def roll_loot_item(self, rng=None) -> Optional[Item]:
+        """
+        Determines the item dropped by this enemy, if any. Enemies without a loot table drop
+        nothing and use no random numbers.
+
+        Args:
+            rng (Optional[RandomSource]): Source of the roll (see rng.py). Defaults to the random module.
+
+        Returns:
+            Optional[Item]: The dropped item, or None.
+        """
+        if self.loot_table is None:
+            return None
+        return self.loot_table.roll(rng)
 
     def get_summary(self) -> str:
         """
@@ -0,0 +1,175 @@
+import csv
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional
+from . import log
+from .data_loader import ENEMY_CSV_HEADERS, enemy_template_from_row, has_valid_enemy_stats # Relative import
+from .enemy_manager import get_difficulty_band # Relative import
+
+# Offset index written next to the CSV (enemies.csv -> enemies.csv.idx).
+# Layout (little-endian):
+#   header:     8s magic, Q csv size, Q csv mtime_ns, Q row count, Q band count
+#   band table: band count x (q band, Q first row, Q end row)
+#   offsets:    row count x Q byte offset of each valid row, grouped by band
+# Rows are grouped by difficulty band, so every band is a contiguous range of offsets.
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"AFKCIDX1"
+_HEADER = struct.Struct("<8sQQQQ")
+_BAND_ENTRY = struct.Struct("<qQQ")
+_OFFSET = struct.Struct("<Q")
+
+logger = log.get_logger("enemy_catalog")
+
+def get_index_path(csv_path: str) -> str:
+    """Returns the path of the offset index that belongs to csv_path."""
+    return csv_path + INDEX_SUFFIX
+
+def build_catalog_index(csv_path: str) -> str:
+    """
+    Scans an enemy CSV once and writes its offset index next to it.
+    Invalid rows are left out of the index, using the same rules as DataLoader.
+
+    Rows must not contain quoted newlines, as each line is treated as one row.
+
+    Args:
+        csv_path (str): The enemy CSV to index.
+
+    Returns:
+        str: The path of the written index file.
+    """
+    stat = os.stat(csv_path)
+    offsets_by_band: Dict[int, List[int]] = {}
+    skipped_rows = 0
+    with open(csv_path, mode='rb') as file:
+        header = _parse_line(file.readline())
+        missing_headers = [key for key in ENEMY_CSV_HEADERS if key not in header]
+        if missing_headers:
+            raise ValueError(f"Enemy CSV {csv_path} is missing required headers: {', '.join(missing_headers)}")
+        offset = file.tell()
+        for line in file:
+            template = _decode_template(header, line)
+            if template is None:
+                if line.strip():
+                    skipped_rows += 1
+            else:
+                offsets_by_band.setdefault(get_difficulty_band(template), []).append(offset)
+            offset += len(line)
+
+    index_path = get_index_path(csv_path)
+    row_count = sum(len(offsets) for offsets in offsets_by_band.values())
+    with open(index_path, mode='wb') as index_file:
+        index_file.write(_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, row_count, len(offsets_by_band)))
+        first_row = 0
+        for band in sorted(offsets_by_band):
+            end_row = first_row + len(offsets_by_band[band])
+            index_file.write(_BAND_ENTRY.pack(band, first_row, end_row))
+            first_row = end_row
+        for band in sorted(offsets_by_band):
+            index_file.write(b"".join(_OFFSET.pack(offset) for offset in offsets_by_band[band]))
+
+    if skipped_rows:
+        logger.warning("Skipped %d invalid rows while indexing %s.", skipped_rows, csv_path)
+    logger.info("Indexed %d enemy definitions from %s into %s.", row_count, csv_path, index_path)
+    return index_path
+
+def _parse_line(line: bytes) -> List[str]:
+    """Parses a single CSV line (raw bytes) into its fields."""
+    return next(csv.reader([line.decode('utf-8').rstrip('\r\n')]), [])
+
+def _decode_template(header: List[str], line: bytes) -> Optional[Dict[str, Any]]:
+    """Decodes one CSV line into an enemy template, or None if the row is invalid."""
+    try:
+        template = enemy_template_from_row(dict(zip(header, _parse_line(line))))
+    except (ValueError, KeyError, UnicodeDecodeError):
+        return None
+    if not template["name"] or not has_valid_enemy_stats(template):
+        return None
+    return template
+
+
+class MappedEnemyCatalog:
+    """
+    A read-only, list-like view of an indexed enemy CSV.
+
+    Both the CSV and its offset index are memory-mapped; a row is only decoded when it is
+    accessed, so opening the catalog costs the same for ten rows or ten million. The catalog
+    can be passed to EnemyManager anywhere a list of enemy templates is accepted.
+    """
+    def __init__(self, csv_path: str, rebuild_stale_index: bool = True):
+        """
+        Opens the catalog, building (or rebuilding) the index if it is missing or out of date.
+
+        Args:
+            csv_path (str): The enemy CSV file.
+            rebuild_stale_index (bool): If False, a missing or stale index raises ValueError
+                                        instead of being rebuilt.
+        """
+        self.csv_path = os.path.abspath(csv_path)
+        self.index_path = get_index_path(self.csv_path)
+        if not self._index_is_current():
+            if not rebuild_stale_index:
+                raise ValueError(f"Enemy catalog index {self.index_path} is missing or out of date.")
+            build_catalog_index(self.csv_path)
+
+        with open(self.csv_path, mode='rb') as csv_file:
+            self._csv_map = mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.index_path, mode='rb') as index_file:
+            self._index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._header = _parse_line(self._csv_map[:self._find_line_end(0)])
+        _, _, _, self._row_count, band_count = _HEADER.unpack_from(self._index_map, 0)
+        self._difficulty_index: Dict[int, range] = {}
+        for i in range(band_count):
+            band, first_row, end_row = _BAND_ENTRY.unpack_from(self._index_map, _HEADER.size + i * _BAND_ENTRY.size)
+            self._difficulty_index[band] = range(first_row, end_row)
+        offsets_start = _HEADER.size + band_count * _BAND_ENTRY.size
+        # Zero-copy view over the offsets in the mapped index file
+        self._offsets = memoryview(self._index_map)[offsets_start:offsets_start + self._row_count * _OFFSET.size].cast('Q')
+
+    def _index_is_current(self) -> bool:
+        """Checks the index exists and was built from the CSV as it is now."""
+        try:
+            with open(self.index_path, mode='rb') as index_file:
+                magic, csv_size, csv_mtime_ns, _, _ = _HEADER.unpack(index_file.read(_HEADER.size))
+        except (OSError, struct.error):
+            return False
+        stat = os.stat(self.csv_path)
+        return magic == INDEX_MAGIC and csv_size == stat.st_size and csv_mtime_ns == stat.st_mtime_ns
+
+    def _find_line_end(self, start: int) -> int:
+        """Returns the offset of the newline ending the line that starts at start."""
+        end = self._csv_map.find(b"\n", start)
+        return len(self._csv_map) if end == -1 else end
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        """Decodes and returns the enemy template at position (in band order)."""
+        if position < 0:
+            position += self._row_count
+        if not 0 <= position < self._row_count:
+            raise IndexError("enemy catalog index out of range")
+        start = self._offsets[position]
+        return _decode_template(self._header, self._csv_map[start:self._find_line_end(start)])
+
+    def __iter__(self):
+        for position in range(self._row_count):
+            yield self[position]
+
+    def get_difficulty_index(self) -> Dict[int, range]:
+        """Returns difficulty band -> range of catalog positions, read straight from the index."""
+        return dict(self._difficulty_index)
+
+    def close(self):
+        """Releases the memory maps."""
+        self._offsets.release()
+        self._index_map.close()
+        self._csv_map.close()
+
+    def __enter__(self) -> 'MappedEnemyCatalog':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,49 +1,145 @@
 import random
-from typing import List, Dict, Any, Optional
-from .enemy import Enemy # Relative import
+from typing import List, Dict, Any, Optional, Sequence
+from . import log
+from . import metrics
+from .enemy import DEFAULT_SPEED, Enemy # Relative import
+from .item import LootTable
+
+logger = log.get_logger("enemy_manager")
+
+ENEMIES_SPAWNED = metrics.counter("afk_quest_enemies_spawned_total", "Enemies created from templates.")
+ENEMY_TEMPLATES = metrics.gauge("afk_quest_enemy_templates", "Enemy templates in use for spawning.")
+
+def get_difficulty_band(template: Dict[str, Any]) -> int:
+    """
+    Groups an enemy template into a coarse difficulty band.
+    The band is the bit length of hp * attack_stat, so each band roughly doubles in threat.
+    Templates with missing or non-numeric stats fall into band 0.
+    """
+    try:
+        return max(0, int(template["hp"]) * int(template["attack_stat"])).bit_length()
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+def build_difficulty_index(enemy_templates: Sequence[Dict[str, Any]]) -> Dict[int, Sequence[int]]:
+    """
+    Builds a mapping of difficulty band -> positions in enemy_templates.
+    Template sources that already know their bands (e.g. an indexed catalog) provide
+    get_difficulty_index() so the templates don't have to be decoded to build it.
+    """
+    if hasattr(enemy_templates, "get_difficulty_index"):
+        return enemy_templates.get_difficulty_index()
+    index: Dict[int, List[int]] = {}
+    for position, template in enumerate(enemy_templates):
+        index.setdefault(get_difficulty_band(template), []).append(position)
+    return index
 
 class EnemyManager:
     """
     Manages enemy templates and provides enemy instances for encounters.
     """
-    def __init__(self, enemy_templates: List[Dict[str, Any]]):
+    def __init__(self, enemy_templates: Sequence[Dict[str, Any]], loot_tables: Optional[Dict[str, LootTable]] = None):
         """
         Initializes the EnemyManager with a list of enemy templates.
 
         Args:
-            enemy_templates (List[Dict[str, Any]]): A list of dictionaries,
+            enemy_templates (Sequence[Dict[str, Any]]): A list (or list-like catalog) of dictionaries,
                 where each dictionary defines an enemy type. Expected keys are:
                 "name", "hp", "attack_stat", "loot_gold_min", "loot_gold_max".
+            loot_tables (Optional[Dict[str, LootTable]]): Enemy name -> the items it can drop
+                (see DataLoader.load_loot_tables). Enemies without one drop no items.
         """
-        self.enemy_templates: List[Dict[str, Any]] = enemy_templates
+        self.loot_tables: Dict[str, LootTable] = loot_tables if loot_tables is not None else {}
+        # Templates and their derived difficulty index are kept together in one tuple so
+        # replace_templates() can swap both with a single assignment.
+        self._state = (enemy_templates, build_difficulty_index(enemy_templates))
+        ENEMY_TEMPLATES.set(len(enemy_templates))
         if not self.enemy_templates:
-            print("Warning: EnemyManager initialized with no enemy templates.")
+            logger.warning("EnemyManager initialized with no enemy templates.")
+
+    @property
+    def enemy_templates(self) -> Sequence[Dict[str, Any]]:
+        """The enemy templates currently used for spawning."""
+        return self._state[0]
 
-    def get_random_enemy(self) -> Optional[Enemy]:
+    def replace_templates(self, enemy_templates: Sequence[Dict[str, Any]]):
+        """
+        Swaps in a new set of enemy templates, e.g. after the data files have been edited.
+
+        The new difficulty index is built before the swap, and templates and index are
+        replaced together with a single reference assignment, so it is safe to call from a
+        background thread. Enemies already spawned (and any fight in progress) keep their
+        own stats; only enemies created after the swap use the new templates.
+
+        Args:
+            enemy_templates (Sequence[Dict[str, Any]]): The replacement templates.
+        """
+        self._state = (enemy_templates, build_difficulty_index(enemy_templates))
+        ENEMY_TEMPLATES.set(len(enemy_templates))
+
+    def get_difficulty_bands(self) -> List[int]:
+        """Returns the difficulty bands that have at least one template, easiest first."""
+        return sorted(band for band, positions in self._state[1].items() if len(positions) > 0)
+
+    def get_random_enemy(self, difficulty_band: Optional[int] = None, rng=None) -> Optional[Enemy]:
         """
         Selects a random enemy template and creates an Enemy instance.
 
+        Args:
+            difficulty_band (Optional[int]): If given, only templates in this band
+                (see get_difficulty_band) are considered.
+            rng (Optional[RandomSource]): Source of the choice (see rng.py). Defaults to the random module.
+
         Returns:
             Optional[Enemy]: An Enemy instance, or None if no templates are available
                              or an error occurs during instantiation.
         """
-        if not self.enemy_templates:
-            print("Error: No enemy templates available to create an enemy.")
+        # Read the state once so a concurrent replace_templates() cannot
+        # change it part way through this call.
+        enemy_templates, difficulty_index = self._state
+        if not enemy_templates:
+            logger.error("No enemy templates available to create an enemy.")
             return None
 
+        template = None
+        choice = (rng if rng is not None else random).choice
         try:
-            template = random.choice(self.enemy_templates)  # nosec B311 - Non-cryptographic use for game mechanics
+            if difficulty_band is None:
+                template = choice(enemy_templates)  # nosec B311 - Non-cryptographic use for game mechanics
+            else:
+                positions = difficulty_index.get(difficulty_band)
+                if not positions:
+                    logger.error("No enemy templates available in difficulty band %s.", difficulty_band)
+                    return None
+                template = enemy_templates[choice(positions)]  # nosec B311 - Non-cryptographic use for game mechanics
+            ENEMIES_SPAWNED.inc()
             return Enemy(
                 name=template["name"],
                 max_hp=template["hp"],
                 attack_stat=template["attack_stat"],
                 loot_gold_min=template["loot_gold_min"],
-                loot_gold_max=template["loot_gold_max"]
+                loot_gold_max=template["loot_gold_max"],
+                speed=template.get("speed", DEFAULT_SPEED),
+                loot_table=self.loot_tables.get(template["name"])
             )
         except KeyError as e:
-            print(f"Error: Enemy template is missing a required key: {e}. Template: {template}")
+            logger.error("Enemy template is missing a required key: %s. Template: %s", e, template)
             return None
         except Exception as e:
-            print(f"An unexpected error occurred while creating an enemy: {e}")
+            logger.error("An unexpected error occurred while creating an enemy: %s", e)
             return None
 
+    def get_random_enemies(self, count: int, difficulty_band: Optional[int] = None, rng=None) -> List[Enemy]:
+        """
+        Creates a pack of count random enemies (see get_random_enemy) for a multi-enemy encounter.
+
+        Returns:
+            List[Enemy]: The enemies created. Shorter than count (possibly empty) if some could not be created.
+        """
+        enemies = []
+        for _ in range(count):
+            enemy = self.get_random_enemy(difficulty_band, rng)
+            if enemy is None:
+                break
+            enemies.append(enemy)
+        return enemies
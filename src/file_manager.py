@@ -1,24 +1,39 @@
 import json
 import os
 from .character import Character # Use relative import
+from . import log
+from . import metrics
+from . import tracing
 
 DEFAULT_SAVE_FILENAME = "character_data.json"
 
+logger = log.get_logger("file_manager")
+
+SAVES = metrics.counter("afk_quest_character_saves_total", "Character saves, by result.", ["result"])
+SAVE_SECONDS = metrics.histogram("afk_quest_character_save_seconds", "Time to write a character save.")
+LOADS = metrics.counter("afk_quest_character_loads_total", "Character loads, by result.", ["result"])
+
+@tracing.traced(category="persistence")
 def save_character(character: Character, filepath: str = DEFAULT_SAVE_FILENAME):
     """Saves character object to a JSON file."""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(character.to_dict(), f, indent=4)
-        print(f"Character '{character.name}' saved to {filepath}.")
+        with SAVE_SECONDS.time():
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(character.to_dict(), f, indent=4)
+        SAVES.labels("ok").inc()
+        logger.info("Character '%s' saved to %s.", character.name, filepath, extra={"filepath": filepath})
     except IOError as e:
-        print(f"Error saving character: {e}")
+        SAVES.labels("error").inc()
+        logger.error("Error saving character: %s", e, extra={"filepath": filepath})
 
+@tracing.traced(category="persistence")
 def load_character(filepath: str = DEFAULT_SAVE_FILENAME) -> Character | None:
     """
     Loads character data from a JSON file.
     Returns None if the file doesn't exist or data is invalid.
     """
     if not os.path.exists(filepath):
+        LOADS.labels("missing").inc()
         return None
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -26,10 +41,14 @@ def load_character(filepath: str = DEFAULT_SAVE_FILENAME) -> Character | None:
             # Basic validation for essential keys
             required_keys = ["name", "level", "current_experience", "current_hp", "gold", "equipment"]
             if not all(key in data for key in required_keys):
-                print(f"Error: Save file {filepath} is missing required data.")
+                logger.error("Save file %s is missing required data.", filepath, extra={"filepath": filepath})
+                LOADS.labels("invalid").inc()
                 return None
-            return Character.from_dict(data)
-    except (IOError, json.JSONDecodeError, TypeError) as e: # Added TypeError for bad data
-        print(f"Error loading character from {filepath}: {e}")
+            character = Character.from_dict(data)
+            LOADS.labels("ok").inc()
+            return character
+    except (IOError, json.JSONDecodeError, TypeError, KeyError, ValueError) as e: # Bad data, e.g. an item missing its slot
+        LOADS.labels("invalid").inc()
+        logger.error("Error loading character from %s: %s", filepath, e, extra={"filepath": filepath})
         # Optionally, you might want to delete or rename the corrupted file here
         return None
\ No newline at end of file
@@ -1,21 +1,78 @@
+import argparse
+import contextlib
+import os
+import sys
+import time
 from .character import Character
+from . import actions
 from . import file_manager
 from .data_loader import DataLoader # New import
 from .enemy_manager import EnemyManager # New import
+from .enemy_catalog import MappedEnemyCatalog
 from . import combat # New import
+from . import clock
+from . import log
+from . import metrics
+from . import profiling
+from . import tracing
+from .combat_events import get_renderer
+from .hot_reload import EnemyDefinitionReloader
+from .autoplay import AutoPlayer, parse_policy
 
-# Global instances (or pass them around if preferred for larger apps)
-# Initialize DataLoader - assumes 'data' folder is in the root project directory
+# Global instances (or pass them around if preferred for larger apps), created on first use
+# rather than on import, so the game reaches its first prompt without waiting for the enemy
+# data (a Google Sheet fetch). Assumes the 'data' folder is in the root project directory
 # where the game is run from (e.g., python -m src.game from afk_quest/)
-data_loader = DataLoader(data_folder_path="data")
-enemy_definitions = data_loader.load_enemy_definitions()
-enemy_manager = EnemyManager(enemy_templates=enemy_definitions)
+data_loader: DataLoader | None = None # See get_data_loader
+enemy_manager: EnemyManager | None = None # See get_enemy_manager; drivers may set it directly
+
+def get_data_loader() -> DataLoader:
+    """Returns the game's DataLoader, reading config.ini the first time."""
+    global data_loader # pylint: disable=global-statement
+    if data_loader is None:
+        data_loader = DataLoader(data_folder_path="data")
+    return data_loader
+
+def load_enemy_templates():
+    """
+    Loads enemy templates, from the memory-mapped catalog if enabled in config.ini. The catalog
+    maps the local CSV, so without one configured the definitions are loaded as usual.
+    """
+    loader = get_data_loader()
+    if loader.config.getboolean("DataSources.Enemies", "use_indexed_catalog", fallback=False):
+        csv_path = loader.get_local_enemy_csv_path()
+        if csv_path:
+            return MappedEnemyCatalog(csv_path)
+    return loader.load_enemy_definitions()
+
+def get_enemy_manager() -> EnemyManager:
+    """
+    Returns the game's EnemyManager, loading the enemy definitions (and the items and loot
+    tables they drop from) the first time they are needed.
+    """
+    global enemy_manager # pylint: disable=global-statement
+    if enemy_manager is None:
+        enemy_definitions = load_enemy_templates()
+        if not enemy_definitions:
+            print("Critical Error: Could not load enemy definitions. Combat will not be available.")
+        loader = get_data_loader()
+        loot_tables = loader.load_loot_tables(loader.load_item_definitions())
+        enemy_manager = EnemyManager(enemy_templates=enemy_definitions, loot_tables=loot_tables)
+    return enemy_manager
+
+# Session settings, replaced by drivers such as run_script()
+input_func = input # Source of every answer to a prompt
+paced_combat = True # Pause and wait for Enter between combat rounds
+combat_output = "terminal" # Combat renderer name, see combat_events.get_renderer
+rng = None # Source of enemy and combat rolls (a rng.RandomSource); None uses the random module
+reload_enemies = True # Allow hot reloading of enemy definitions (see start_enemy_reloader)
+save_filepath = file_manager.DEFAULT_SAVE_FILENAME
 
 
 def prompt_create_new_character() -> Character:
     """Asks user for name, creates and returns a new Character."""
     while True:
-        name = input("Enter your character's name: ").strip()
+        name = input_func("Enter your character's name: ").strip()
         if name:
             return Character(name=name)
         print("Name cannot be empty. Please try again.")
@@ -29,7 +86,7 @@ def display_main_menu(character_exists: bool):
     print("3. Quit")
     print("-----------------")
     while True:
-        choice = input("Enter your choice: ")
+        choice = input_func("Enter your choice: ")
         if character_exists and choice == "1":
             return "continue"
         if choice == "2":
@@ -38,46 +95,37 @@ def display_main_menu(character_exists: bool):
             return "quit"
         print("Invalid choice. Please try again.")
 
-def display_action_menu(character_alive: bool): # Added character_alive
-    """Shows game actions."""
-    print("\n--- Actions ---")
-    if character_alive: # Only show these if alive
-        print("1. Add Experience (Debug)")
-        print("2. Take Damage (Debug)")
-        print("3. Heal (Debug)")
-        print("4. Add Gold (Debug)")
-        print("5. Look for a Fight") # New action
-    print("S. View Character Summary") # Changed to S for summary
-    print("Q. Save and Quit to Main Menu") # Changed to Q
-    print("---------------")
-    while True:
-        choice = input("Enter your action: ").upper() # Convert to uppercase
-        if character_alive:
-            if choice in ["1", "2", "3", "4", "5"]:
-                return choice
-        if choice in ["S", "Q"]:
-            return choice
-        print("Invalid action. Please try again.")
-
-def get_int_input(prompt: str) -> int:
-    """Safely gets an integer input from the user."""
-    while True:
-        try:
-            value = int(input(prompt))
-            return value
-        except ValueError:
-            print("Invalid input. Please enter a number.")
-
 def run():
     """Main game loop."""
-    current_character: Character | None = None
     print("Welcome to AFK Quest!")
-    if not enemy_definitions: # Check if enemy definitions loaded
-        print("Critical Error: Could not load enemy definitions. Combat will not be available.")
-        # Potentially exit or disable combat features
+    reloader = start_enemy_reloader()
+    try:
+        _game_loop()
+    except EOFError:
+        raise # Input ran out (end of a script or recording): the session is over, not crashed
+    except Exception:
+        print("\nAn unexpected error occurred. Recent log messages:", file=sys.stderr)
+        log.dump_recent(sys.stderr)
+        raise
+    finally:
+        if reloader:
+            reloader.stop()
 
+def start_enemy_reloader() -> EnemyDefinitionReloader | None:
+    """Starts background reloading of enemy definitions if enabled in config.ini [Settings]."""
+    interval = get_data_loader().config.getfloat("Settings", "enemy_reload_interval_seconds", fallback=0)
+    if interval <= 0 or not reload_enemies:
+        return None
+    reloader = EnemyDefinitionReloader(get_data_loader(), get_enemy_manager(), poll_interval=interval,
+                                       load_templates=load_enemy_templates)
+    reloader.start()
+    return reloader
+
+def _game_loop():
+    """Runs the main menu and action loops until the player quits."""
+    current_character: Character | None = None
     while True: # Outer loop for Main Menu
-        existing_char_data = file_manager.load_character()
+        existing_char_data = file_manager.load_character(save_filepath)
         main_menu_choice = display_main_menu(character_exists=(existing_char_data is not None))
 
         if main_menu_choice == "continue":
@@ -95,63 +143,222 @@ def run():
             break
 
         if current_character:
-            print(current_character.get_summary())
-            # Inner loop for actions
-            while True:
-                if current_character.is_dead:
-                    print(f"\nAlas, {current_character.name} has perished.")
-                    print("You can view your character summary or return to the main menu.")
-                
-                action_choice = display_action_menu(character_alive=not current_character.is_dead)
-
-                if action_choice == "1" and not current_character.is_dead: # Add EXP
-                    amount = get_int_input("Enter EXP to add: ")
-                    current_character.gain_experience(amount)
-                elif action_choice == "2" and not current_character.is_dead: # Take Damage
-                    amount = get_int_input("Enter damage to take: ")
-                    log = current_character.take_damage(amount)
-                    print(log)
-                elif action_choice == "3" and not current_character.is_dead: # Heal
-                    amount = get_int_input("Enter amount to heal: ")
-                    log = current_character.heal(amount)
-                    print(log)
-                elif action_choice == "4" and not current_character.is_dead: # Add Gold
-                    amount = get_int_input("Enter gold to add: ")
-                    current_character.add_gold(amount)
-                elif action_choice == "5" and not current_character.is_dead: # Look for a Fight
-                    if not enemy_manager or not enemy_manager.enemy_templates:
-                        print("No enemies available to fight at the moment. Check enemy definitions.")
-                    else:
-                        enemy_to_fight = enemy_manager.get_random_enemy()
-                        if enemy_to_fight:
-                            combat_result = combat.start_combat(current_character, enemy_to_fight)
-                            print(f"\n--- Combat Over ---")
-                            if combat_result == "player_won":
-                                print("You were victorious!")
-                            elif combat_result == "player_lost":
-                                print("You have been defeated.")
-                                # Character is already marked as dead by take_damage
-                            # Player summary will be printed next, or death message if applicable
-                        else:
-                            print("Could not find an enemy to fight. Perhaps they are all hiding?")
-                elif action_choice == "S": # Summary
-                    pass # Summary is printed after each action anyway if alive
-                elif action_choice == "Q": # Save and Quit to Main Menu
-                    file_manager.save_character(current_character)
-                    current_character = None
-                    break
-
-                if current_character: # Re-check in case of future modifications
-                    print(current_character.get_summary())
-                    if current_character.is_dead:
-                        # Handled at the start of the action loop
-                        continue # Go back to displaying limited menu for dead char
-                else: # Character quit to main menu
-                    break
+            drive_actions(actions.play_actions(current_character, get_enemy_manager, rng))
+            file_manager.save_character(current_character, save_filepath) # Save and Quit to Main Menu
+            current_character = None
         else:
             # This case should ideally not be reached if logic is sound
             print("Error: No character loaded. Returning to main menu.")
 
+def drive_actions(steps: actions.Steps):
+    """
+    Runs actions (see actions.py) at the terminal: text is printed, prompts are answered by
+    input_func and fights are played with combat.start_combat.
+
+    Returns:
+        The value the actions return.
+    """
+    answer = None
+    while True:
+        try:
+            request = steps.send(answer)
+        except StopIteration as stop:
+            return stop.value
+        if isinstance(request, actions.Show):
+            print(request.text)
+            answer = None
+        elif isinstance(request, actions.Ask):
+            answer = input_func(request.prompt)
+        else:
+            answer = combat.start_combat(request.player, request.enemy, paced=paced_combat,
+                                         renderer=get_renderer(combat_output), rng=rng, input_func=input_func)
+
+class ScriptedInput:
+    """
+    Answers prompts from a list of pre-recorded lines, one line per prompt, instead of the keyboard.
+    Raises EOFError once the script (including repeats) is used up, which ends the session.
+    """
+    def __init__(self, lines: list, repeat: int = 1):
+        self.lines = lines
+        self.repeat = repeat
+        self.actions: int = 0 # Prompts answered so far
+
+    def __call__(self, prompt: str = "") -> str:
+        if self.actions >= len(self.lines) * self.repeat:
+            raise EOFError("End of script.")
+        line = self.lines[self.actions % len(self.lines)]
+        self.actions += 1
+        return line
+
+def run_script(lines: list, repeat: int = 1, quiet: bool = False) -> dict:
+    """
+    Drives the real game loop from a script: every prompt is answered by the next line,
+    combat is unpaced, and the session ends when the script runs out. If the script quits
+    from the main menu before then, the game is started again.
+
+    Args:
+        lines (list): Answers to feed to the prompts, in order (without newlines).
+        repeat (int): How many times to play the script through.
+        quiet (bool): If True, game output is discarded instead of printed.
+
+    Returns:
+        dict: "actions" (prompts answered), "seconds" and "actions_per_second".
+    """
+    global input_func, paced_combat # pylint: disable=global-statement
+    scripted_input = ScriptedInput(lines, repeat)
+    previous_settings = (input_func, paced_combat)
+    input_func, paced_combat = scripted_input, False
+    start_time = time.perf_counter()
+    try:
+        with open(os.devnull, "w", encoding="utf-8") if quiet else contextlib.nullcontext() as devnull:
+            with contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext():
+                while scripted_input.actions < len(lines) * repeat:
+                    run() # Quitting from the main menu starts the next pass through the script
+    except EOFError:
+        pass # Script finished mid-session
+    finally:
+        input_func, paced_combat = previous_settings
+    seconds = time.perf_counter() - start_time
+    return {"actions": scripted_input.actions, "seconds": seconds,
+            "actions_per_second": scripted_input.actions / seconds if seconds > 0 else 0.0}
+
+def run_autoplay(policy_text: str, pace: float = 0.0, max_fights: int | None = None) -> dict:
+    """
+    Plays the saved character (or a new one) with an auto-play policy until it dies,
+    max_fights is reached or the player presses Ctrl+C, then saves it.
+    """
+    character = file_manager.load_character(save_filepath) or Character(name="AFK Hero")
+    if character.is_dead:
+        print(f"{character.name} is dead and cannot play. Start a new game first.")
+        return {}
+    print(f"Auto-playing {character.name} with policy '{policy_text}'. Press Ctrl+C to stop.")
+    auto_player = AutoPlayer(character, get_enemy_manager(), parse_policy(policy_text), pace=pace)
+    try:
+        auto_player.run(max_fights=max_fights)
+    except KeyboardInterrupt:
+        print("Auto-play stopped.")
+    file_manager.save_character(character, save_filepath)
+    return auto_player.stats
+
+def start_metrics(port: int | None, filepath: str | None, interval: float) -> tuple:
+    """
+    Enables metrics if an endpoint or dump file is requested, and starts them.
+
+    Returns:
+        tuple: The HTTP server and the file dumper (each None if not requested).
+    """
+    if port is None and not filepath:
+        return None, None
+    metrics.enable()
+    server = dumper = None
+    if port is not None:
+        try:
+            server = metrics.start_http_server(port)
+            print(f"Metrics available at http://127.0.0.1:{server.server_address[1]}/metrics")
+        except OSError as e:
+            print(f"Error: Could not serve metrics on port {port}: {e}")
+    if filepath:
+        dumper = metrics.MetricsDumper(filepath, interval)
+        dumper.start()
+    return server, dumper
+
+def play(args: argparse.Namespace):
+    """Runs the mode selected on the command line: auto-play, scripted or interactive."""
+    if args.autoplay:
+        run_autoplay(args.autoplay, pace=args.pace, max_fights=args.max_fights)
+        return
+
+    if not args.script:
+        print("Starting AFK Quest...")
+        run()
+        return
+
+    if args.script == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(args.script, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    if not lines:
+        print("Error: Script is empty.")
+        return
+    stats = run_script(lines, repeat=args.repeat, quiet=args.quiet)
+    print(f"Scripted run: {stats['actions']} actions in {stats['seconds']:.2f}s "
+          f"({stats['actions_per_second']:.0f} actions/second)", file=sys.stderr)
+
+def main(argv: list | None = None) -> int:
+    """Command line entry point: interactive by default, or scripted with --script. Returns the exit code."""
+    global save_filepath, combat_output # pylint: disable=global-statement
+    parser = argparse.ArgumentParser(description="Play AFK Quest.")
+    parser.add_argument("--script", metavar="FILE",
+                        help="Answer prompts from FILE (one answer per line, '-' for stdin) with no pauses")
+    parser.add_argument("--repeat", type=int, default=1, help="Play the script through this many times (default: 1)")
+    parser.add_argument("--quiet", action="store_true", help="Discard game output in scripted mode")
+    parser.add_argument("--autoplay", metavar="POLICY",
+                        help="Play automatically: 'fight' or 'rest:<percent>', optionally '@<band>' (e.g. rest:50)")
+    parser.add_argument("--pace", type=float, default=0.0,
+                        help="Auto-play pacing: 0 = full speed, 1 = as slow as interactive play (default: 0)")
+    parser.add_argument("--max-fights", type=int, default=None, help="Stop auto-play after this many fights")
+    parser.add_argument("--save-file", default=file_manager.DEFAULT_SAVE_FILENAME,
+                        help=f"Character save file (default: {file_manager.DEFAULT_SAVE_FILENAME})")
+    parser.add_argument("--clock", default="real",
+                        help="Game clock: 'real', 'virtual' (waits take no time) or 'accelerated:<factor>' (default: real)")
+    parser.add_argument("--combat-output", choices=["terminal", "log", "jsonl", "null"], default="terminal",
+                        help="How fights are shown: round by round, one log line, JSON lines or not at all (default: terminal)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus metrics at http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", default=None, help="Write Prometheus metrics to this file periodically")
+    parser.add_argument("--metrics-interval", type=float, default=metrics.DEFAULT_DUMP_INTERVAL_SECONDS,
+                        help=f"Seconds between metrics file writes (default: {metrics.DEFAULT_DUMP_INTERVAL_SECONDS:g})")
+    parser.add_argument("--trace", metavar="FILE", default=None,
+                        help="Write Chrome trace-event JSON to FILE on exit")
+    parser.add_argument("--trace-sample-rate", type=float, default=1.0,
+                        help="Fraction of top-level operations to trace with --trace (default: 1)")
+    parser.add_argument("--profile", metavar="DIR", default=None,
+                        help="Profile the session and write a per-subsystem report and raw profile data to DIR")
+    parser.add_argument("--profile-mode", choices=[profiling.DETERMINISTIC, profiling.SAMPLING],
+                        default=profiling.DETERMINISTIC, help="cProfile every call, or sample the stack (default: deterministic)")
+    parser.add_argument("--profile-interval", type=float, default=profiling.DEFAULT_SAMPLE_INTERVAL_SECONDS,
+                        help=f"Seconds between samples in sampling mode (default: {profiling.DEFAULT_SAMPLE_INTERVAL_SECONDS:g})")
+    parser.add_argument("--no-profile-memory", action="store_true", help="Do not trace allocations while profiling")
+    parser.add_argument("--log-level", default="info",
+                        help="Least severe messages shown: debug, info, warning, error or critical (default: info)")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text",
+                        help="Console messages as plain text or one JSON object per line (default: text)")
+    args = parser.parse_args(argv)
+    save_filepath = args.save_file
+    combat_output = args.combat_output
+    try:
+        clock.set_clock(clock.parse_clock(args.clock))
+        log.configure(log.parse_level(args.log_level), structured=args.log_format == "json")
+        if args.autoplay:
+            parse_policy(args.autoplay) # Checked up front, so a bad policy is reported like a bad clock
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.trace:
+        try:
+            tracing.configure(args.trace_sample_rate)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+
+    metrics_server, metrics_dumper = start_metrics(args.metrics_port, args.metrics_file, args.metrics_interval)
+    try:
+        if args.profile:
+            report = profiling.run_profiled(lambda: play(args), args.profile, mode=args.profile_mode,
+                                            interval=args.profile_interval, memory=not args.no_profile_memory)
+            print(f"Profile written to {args.profile} ({report['wall_seconds']:.2f}s profiled).", file=sys.stderr)
+        else:
+            play(args)
+    finally:
+        if args.trace:
+            tracing.export_chrome_trace(args.trace)
+        if metrics_server:
+            metrics_server.shutdown()
+        if metrics_dumper:
+            metrics_dumper.stop()
+    return 0
+
 if __name__ == "__main__":
-    print("Starting AFK Quest...")
-    run()
+    raise SystemExit(main())
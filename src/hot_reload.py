@@ -0,0 +1,107 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from . import log
+from .data_loader import DataLoader # Relative import
+from .enemy_manager import EnemyManager # Relative import
+
+DEFAULT_POLL_INTERVAL_SECONDS = 5.0
+
+logger = log.get_logger("hot_reload")
+
+class EnemyDefinitionReloader:
+    """
+    Watches the enemy data sources and reloads them into a running EnemyManager when they change.
+
+    Changes are detected cheaply: the local CSV's modification time and the Google Sheet's
+    cache validator (ETag/Last-Modified, fetched with a HEAD request). The data is only
+    re-parsed when one of these differs from the last check.
+    """
+    def __init__(self, data_loader: DataLoader, enemy_manager: EnemyManager,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+                 load_templates: Optional[Callable[[], Sequence[Dict[str, Any]]]] = None):
+        """
+        Initializes the reloader. The current state of the sources is recorded as the
+        baseline, so the first reload only happens after an actual edit.
+
+        Args:
+            data_loader (DataLoader): The loader used to re-read enemy definitions.
+            enemy_manager (EnemyManager): The manager whose templates are replaced on change.
+            poll_interval (float): Seconds between checks when running in the background.
+            load_templates (Optional[Callable]): Loads the replacement templates. Defaults to
+                data_loader.load_enemy_definitions; pass e.g. a catalog factory instead.
+        """
+        self.data_loader = data_loader
+        self.enemy_manager = enemy_manager
+        self.poll_interval = poll_interval
+        self.load_templates = load_templates or data_loader.load_enemy_definitions
+        self.reload_count: int = 0
+        self._last_validators: Tuple[Optional[int], Optional[str]] = self._get_current_validators()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _get_local_mtime(self) -> Optional[int]:
+        """Returns the local enemy CSV's modification time in nanoseconds, or None if unavailable."""
+        filepath = self.data_loader.get_local_enemy_csv_path()
+        if not filepath:
+            return None
+        try:
+            return os.stat(filepath).st_mtime_ns
+        except OSError:
+            return None
+
+    def _get_current_validators(self) -> Tuple[Optional[int], Optional[str]]:
+        """Returns the (local mtime, remote validator) pair describing the sources right now."""
+        remote_validator = self.data_loader.fetch_remote_enemy_validator()
+        if remote_validator is None:
+            # Fall back to whatever the last full fetch reported
+            remote_validator = self.data_loader.remote_enemy_validator
+        return self._get_local_mtime(), remote_validator
+
+    def check_for_changes(self) -> bool:
+        """
+        Checks the sources once and reloads the enemy templates if they changed since the last
+        successful reload.
+
+        Returns:
+            bool: True if new templates were swapped into the EnemyManager, False otherwise.
+        """
+        validators = self._get_current_validators()
+        if validators == self._last_validators:
+            return False
+
+        logger.info("Enemy definitions changed on disk or remotely. Reloading...")
+        enemy_templates = self.load_templates()
+        if not enemy_templates:
+            logger.warning("Reloaded enemy definitions are empty. Keeping the current templates.")
+            return False # Tried again at the next check, as the validators are left as they were
+        previous_templates = self.enemy_manager.enemy_templates
+        self.enemy_manager.replace_templates(enemy_templates)
+        if previous_templates is not enemy_templates and hasattr(previous_templates, "close"):
+            previous_templates.close() # e.g. a MappedEnemyCatalog, whose memory maps would stay open
+        self._last_validators = validators # Only now, so a failed or empty reload is retried
+        self.reload_count += 1
+        return True
+
+    def _run(self):
+        """Background loop: checks for changes every poll_interval seconds until stopped."""
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.check_for_changes()
+            except Exception as e: # Never let a bad edit kill the watcher thread
+                logger.error("An unexpected error occurred while reloading enemy definitions: %s", e)
+
+    def start(self):
+        """Starts polling on a daemon thread. Does nothing if already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="EnemyDefinitionReloader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background thread and waits for it to finish."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,120 @@
+"""
+The character's inventory: loot that was kept instead of cashed in.
+
+Every drop of an item shares one Item instance, so the inventory keeps a count per distinct item,
+and each slot's distinct items in a list sorted by rating (see item.get_item_rating). The best
+item in a slot is then the end of a list, and everything rated below a given item is a prefix
+found with one bisect, however many items an AFK character has piled up. Another drop of an item
+already held only bumps its count; a new distinct item is found with a bisect but inserted with
+list.insert, which moves the items after it (O(n) in the distinct items of its slot, in one fast
+memory move).
+"""
+import bisect
+from typing import Dict, List, Optional, Sequence, Tuple
+from .item import ITEM_SLOTS, Item, get_item_rating
+
+# Order of the values in each row of Inventory.to_list (one row per distinct item)
+SERIALIZED_FIELDS = ("name", "slot", "value", "attack_bonus", "damage_reduction", "count")
+
+def _get_sort_key(item: Item) -> tuple:
+    """Rating first, then enough of the item to make the key unique within its slot."""
+    return get_item_rating(item) + (item.name, item.attack_bonus, item.damage_reduction)
+
+class Inventory:
+    """
+    Items held by a character, indexed by slot and rating.
+    """
+    def __init__(self):
+        self._counts: Dict[Item, int] = {}
+        # Per slot: the distinct items held, worst first, and their sort keys (kept in step)
+        self._items: Dict[str, List[Item]] = {slot: [] for slot in ITEM_SLOTS}
+        self._keys: Dict[str, List[tuple]] = {slot: [] for slot in ITEM_SLOTS}
+        self.total_value: int = 0 # Gold the whole inventory would be cashed in for
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        """Number of items held, counting duplicates."""
+        return self._size
+
+    def __contains__(self, item: Item) -> bool:
+        return item in self._counts
+
+    def count(self, item: Item) -> int:
+        """Returns how many of item are held."""
+        return self._counts.get(item, 0)
+
+    def add(self, item: Item, count: int = 1):
+        """Adds count of item."""
+        if count <= 0:
+            return
+        if item.slot not in self._items:
+            raise ValueError(f"Unknown item slot '{item.slot}'.")
+        if item not in self._counts:
+            key = _get_sort_key(item)
+            position = bisect.bisect_left(self._keys[item.slot], key)
+            self._keys[item.slot].insert(position, key)
+            self._items[item.slot].insert(position, item)
+            self._counts[item] = 0
+        self._counts[item] += count
+        self._size += count
+        self.total_value += item.value * count
+
+    def remove(self, item: Item, count: int = 1) -> bool:
+        """
+        Removes count of item.
+
+        Returns:
+            bool: False (and nothing is removed) if fewer than count are held.
+        """
+        held = self._counts.get(item, 0)
+        if count <= 0 or held < count:
+            return False
+        self._size -= count
+        self.total_value -= item.value * count
+        if held > count:
+            self._counts[item] = held - count
+            return True
+        del self._counts[item]
+        position = bisect.bisect_left(self._keys[item.slot], _get_sort_key(item))
+        del self._keys[item.slot][position]
+        del self._items[item.slot][position]
+        return True
+
+    def get_best(self, slot: str) -> Optional[Item]:
+        """Returns the highest rated item held for slot, or None if there are none."""
+        items = self._items.get(slot)
+        return items[-1] if items else None
+
+    def get_items(self, slot: Optional[str] = None) -> List[Tuple[Item, int]]:
+        """Returns (item, count) pairs, best first within each slot, for one slot or all of them."""
+        slots: Sequence[str] = ITEM_SLOTS if slot is None else (slot,)
+        return [(item, self._counts[item]) for each_slot in slots for item in reversed(self._items[each_slot])]
+
+    def remove_rated_below(self, slot: str, rating: Tuple[int, int]) -> List[Tuple[Item, int]]:
+        """
+        Removes every item in slot rated strictly below rating (see item.get_item_rating).
+
+        Returns:
+            List[Tuple[Item, int]]: The (item, count) pairs removed.
+        """
+        keys = self._keys[slot]
+        cut = bisect.bisect_left(keys, rating) # Keys start with the rating, so this is the first not below it
+        removed = [(item, self._counts.pop(item)) for item in self._items[slot][:cut]]
+        del keys[:cut]
+        del self._items[slot][:cut]
+        self._size -= sum(count for _, count in removed)
+        self.total_value -= sum(item.value * count for item, count in removed)
+        return removed
+
+    def to_list(self) -> List[list]:
+        """Serializes the inventory compactly: one row of SERIALIZED_FIELDS values per distinct item."""
+        return [[item.name, item.slot, item.value, item.attack_bonus, item.damage_reduction, count]
+                for item, count in self.get_items()]
+
+    @classmethod
+    def from_list(cls, rows: Sequence[Sequence]) -> "Inventory":
+        """Creates an inventory from the output of to_list."""
+        inventory = cls()
+        for name, slot, value, attack_bonus, damage_reduction, count in rows:
+            inventory.add(Item(name, slot, value, attack_bonus, damage_reduction), count)
+        return inventory
@@ -0,0 +1,133 @@
+"""
+Items: weapons, armour and other gear dropped as loot, and the per-enemy loot tables that decide
+which item (if any) a defeated enemy drops.
+
+Loot tables are compiled once, when the definitions are loaded, into a cumulative distribution of
+their drop chances, so a loot roll is one random number and one bisect however many items a
+table holds.
+"""
+import bisect
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from . import log
+
+ITEM_SLOTS = ("weapon", "armour", "item") # Same keys as Character.equipment
+
+logger = log.get_logger("item")
+
+@dataclass(frozen=True)
+class Item:
+    """
+    An item definition. Items never change once loaded, so every drop of an item shares one instance.
+    """
+    name: str
+    slot: str # One of ITEM_SLOTS
+    value: int # Gold it is cashed in for
+    attack_bonus: int = 0 # Added to attack power while equipped (weapons)
+    damage_reduction: int = 0 # Subtracted from damage taken while equipped (armour)
+
+    def __str__(self) -> str:
+        return self.name
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the item to a dictionary for serialization."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Item":
+        """Creates an item from a dictionary (an item template or the output of to_dict)."""
+        return cls(name=data["name"], slot=data["slot"], value=data["value"],
+                   attack_bonus=data.get("attack_bonus", 0), damage_reduction=data.get("damage_reduction", 0))
+
+def get_item_rating(equipped: Union[Item, str, None]) -> Tuple[int, int]:
+    """Ranks equipment for upgrades: combat bonuses first, then value. Legacy strings and empty slots rank lowest."""
+    if not isinstance(equipped, Item):
+        return (0, 0)
+    return (equipped.attack_bonus + equipped.damage_reduction, equipped.value)
+
+class LootTable:
+    """
+    The items one kind of enemy can drop. At most one item drops per kill: item i drops with its
+    drop chance, and nothing drops with whatever probability is left over.
+    """
+    def __init__(self, entries: Iterable[Tuple[Item, float]]):
+        """
+        Compiles the table into a cumulative distribution for roll().
+
+        Args:
+            entries (Iterable[Tuple[Item, float]]): (item, drop chance) pairs. Chances of 0 or less
+                are ignored. If the chances add up to more than 1 they are scaled down to add up to
+                exactly 1, so every kill drops something.
+        """
+        self.entries: List[Tuple[Item, float]] = [] # The (item, chance) pairs kept, as given
+        self.items: List[Item] = []
+        self.cumulative_chances: List[float] = [] # cumulative_chances[i] = sum of chances 0..i
+        total = 0.0
+        for item, chance in entries:
+            if chance <= 0:
+                continue
+            total += chance
+            self.entries.append((item, chance))
+            self.items.append(item)
+            self.cumulative_chances.append(total)
+        if total > 1.0:
+            self.cumulative_chances = [chance / total for chance in self.cumulative_chances]
+            self.cumulative_chances[-1] = 1.0 # No rounding gap in which nothing would drop
+        self.drop_chance: float = min(total, 1.0) # Chance that a kill drops any item
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def roll(self, rng=None) -> Optional[Item]:
+        """
+        Rolls for a drop.
+
+        Args:
+            rng (Optional[RandomSource]): Source of the roll (see rng.py). Defaults to the random module.
+
+        Returns:
+            Optional[Item]: The dropped item, or None if nothing drops.
+        """
+        if not self.items:
+            return None
+        roll = (rng if rng is not None else random).random()  # nosec B311 - Non-cryptographic use for game mechanics
+        index = bisect.bisect_right(self.cumulative_chances, roll)
+        return self.items[index] if index < len(self.items) else None
+
+def build_loot_tables(rows: Iterable[Dict[str, Any]], items: Sequence[Item]) -> Dict[str, LootTable]:
+    """
+    Groups loot table rows by enemy and compiles a LootTable for each.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): Rows with "name" (the enemy's), "item" (an item name) and "drop_chance".
+        items (Sequence[Item]): The item catalog. Rows naming an unknown item are skipped.
+
+    Returns:
+        Dict[str, LootTable]: Enemy name -> loot table.
+    """
+    items_by_name = {item.name: item for item in items}
+    entries: Dict[str, List[Tuple[Item, float]]] = {}
+    for row in rows:
+        item = items_by_name.get(row["item"])
+        if item is None:
+            logger.warning("Loot table for %s names unknown item '%s'. Skipping it.", row["name"], row["item"])
+            continue
+        entries.setdefault(row["name"], []).append((item, row["drop_chance"]))
+    tables = {}
+    for enemy_name, enemy_entries in entries.items():
+        if sum(chance for _, chance in enemy_entries) > 1.0:
+            logger.warning("Drop chances for %s add up to more than 1. Scaling them down.", enemy_name)
+        tables[enemy_name] = LootTable(enemy_entries)
+    return tables
+
+def get_loot_table_rows(loot_tables: Dict[str, LootTable]) -> List[Dict[str, Any]]:
+    """
+    Flattens loot tables back into the rows build_loot_tables takes, so they can be stored or
+    sent to another process and rebuilt into identical tables.
+
+    Returns:
+        List[Dict[str, Any]]: Rows with "name" (the enemy's), "item" (an item name) and "drop_chance".
+    """
+    return [{"name": enemy_name, "item": item.name, "drop_chance": chance}
+            for enemy_name, table in loot_tables.items() for item, chance in table.entries]
@@ -0,0 +1,33 @@
+"""
+Lazy imports for heavy dependencies that only some code paths need (requests and its
+urllib3/charset stack, asyncio, http.server).
+
+    requests = lazy_import("requests")
+
+returns a module object straight away and only runs the real import the first time one of
+its attributes is used, so the game starts without paying for modules it may never touch.
+Attribute access (requests.get, patch('src.data_loader.requests.get')) works as usual.
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns the module called name, loaded on first attribute access (see importlib.util.LazyLoader).
+    A module that is already imported is returned as is.
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found (checked now, not on first use).
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,195 @@
+"""
+Game logging: diagnostics and player messages from the data loader, enemy manager, save files
+and the character model go through the "afk_quest" logger instead of print.
+
+Messages use %-style arguments (logger.info("Ding! %s reached Level %d!", name, level)), so a
+message below the current level is never formatted. The console handler writes the bare message
+to sys.stdout as it is at that moment, so output looks exactly as it did with print and still
+follows contextlib.redirect_stdout. A bounded ring buffer keeps the most recent records, which
+the game shows on request and dumps when it crashes.
+
+Where many players share one process (the server), each session routes its console messages
+to its own connection with route(), and keeps its own recent records. The route is held in a
+context variable, so it follows the session's asyncio task and never leaks into other sessions.
+"""
+import contextlib
+import contextvars
+import datetime
+import json
+import logging
+import sys
+from collections import deque
+from typing import Iterator, List, Optional, TextIO
+
+LOGGER_NAME = "afk_quest"
+DEFAULT_LEVEL = logging.INFO
+DEFAULT_RING_CAPACITY = 1000
+
+# LogRecord attributes that are not extra fields passed by the caller
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class ConsoleHandler(logging.Handler):
+    """
+    Writes records to sys.stdout, looked up at each record (unlike logging.StreamHandler), or to
+    the output of the current route (see route).
+    """
+    def emit(self, record: logging.LogRecord):
+        try:
+            current_route = _current_route.get()
+            if current_route is None:
+                sys.stdout.write(self.format(record) + "\n")
+            else:
+                current_route.output.write(self.format(record) + "\n")
+                current_route.ring_buffer.handle(record)
+        except Exception: # pylint: disable=broad-except
+            self.handleError(record)
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last capacity records in memory. Records are only formatted when dumped."""
+    def __init__(self, capacity: int = DEFAULT_RING_CAPACITY):
+        super().__init__()
+        self.records: deque = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+    def get_lines(self, limit: Optional[int] = None, formatter: Optional[logging.Formatter] = None) -> List[str]:
+        """Returns the most recent records (all of them by default), oldest first, formatted by formatter if given."""
+        records = list(self.records)
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        format_record = formatter.format if formatter is not None else self.format
+        return [format_record(record) for record in records]
+
+    def clear(self):
+        """Drops every record."""
+        self.records.clear()
+
+class StructuredFormatter(logging.Formatter):
+    """Formats each record as a JSON object: time, level, logger, message and any extra fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+                 "level": record.levelname, "logger": record.name, "message": record.getMessage()}
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+PLAIN_FORMATTER = logging.Formatter("%(message)s")
+RECORD_FORMATTER = logging.Formatter("%(asctime)s %(levelname)-8s %(name)s: %(message)s")
+UNTIMED_RECORD_FORMATTER = logging.Formatter("%(levelname)-8s %(name)s: %(message)s") # Same output on every run
+
+class Route:
+    """Where console messages logged under route() go, and the recent records kept for them."""
+    def __init__(self, output: TextIO, ring_buffer: Optional[RingBufferHandler] = None):
+        self.output = output
+        if ring_buffer is None:
+            ring_buffer = RingBufferHandler()
+            ring_buffer.setFormatter(RECORD_FORMATTER)
+        self.ring_buffer = ring_buffer
+
+_current_route: contextvars.ContextVar[Optional[Route]] = contextvars.ContextVar("afk_quest_log_route", default=None)
+
+_logger = logging.getLogger(LOGGER_NAME)
+_logger.setLevel(DEFAULT_LEVEL)
+_logger.propagate = False # The game's handlers decide where messages go
+console_handler = ConsoleHandler()
+console_handler.setFormatter(PLAIN_FORMATTER)
+ring_buffer = RingBufferHandler()
+ring_buffer.setFormatter(RECORD_FORMATTER)
+_logger.addHandler(console_handler)
+_logger.addHandler(ring_buffer)
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns the game logger for a module, e.g. get_logger("data_loader")."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+def parse_level(level: str) -> int:
+    """Converts a level name ("debug", "INFO", ...) to its number."""
+    number = logging.getLevelName(level.upper())
+    if not isinstance(number, int):
+        raise ValueError(f"Unknown log level '{level}'. Use debug, info, warning, error or critical.")
+    return number
+
+def configure(level: Optional[int] = None, structured: bool = False):
+    """
+    Sets the game's log level and console format.
+
+    Args:
+        level (Optional[int]): Minimum level shown and kept (e.g. logging.WARNING). Unchanged if None.
+        structured (bool): If True, the console gets one JSON object per record instead of the bare message.
+    """
+    if level is not None:
+        _logger.setLevel(level)
+    console_handler.setFormatter(StructuredFormatter() if structured else PLAIN_FORMATTER)
+
+def get_level() -> int:
+    """Returns the game's current log level."""
+    return _logger.level
+
+@contextlib.contextmanager
+def level(temporary_level: int) -> Iterator[None]:
+    """Temporarily changes the game's log level, e.g. to WARNING around headless simulations."""
+    previous = _logger.level
+    _logger.setLevel(temporary_level)
+    try:
+        yield
+    finally:
+        _logger.setLevel(previous)
+
+@contextlib.contextmanager
+def route(output: TextIO) -> Iterator[Route]:
+    """
+    Sends console messages logged in the current context (e.g. one server session's task) to
+    output instead of sys.stdout, and keeps them in a ring buffer of their own as well as the
+    game's, so get_recent_lines shows only this context's records.
+    """
+    token = _current_route.set(Route(output))
+    try:
+        yield _current_route.get()
+    finally:
+        _current_route.reset(token)
+
+@contextlib.contextmanager
+def unrouted() -> Iterator[None]:
+    """Sends console messages to sys.stdout again within a route, e.g. for server-side diagnostics."""
+    token = _current_route.set(None)
+    try:
+        yield
+    finally:
+        _current_route.reset(token)
+
+@contextlib.contextmanager
+def redirect_output(output: TextIO) -> Iterator[None]:
+    """Like contextlib.redirect_stdout, but also redirects console messages when a route is active."""
+    current_route = _current_route.get()
+    with contextlib.redirect_stdout(output):
+        if current_route is None:
+            yield
+            return
+        token = _current_route.set(Route(output, current_route.ring_buffer))
+        try:
+            yield
+        finally:
+            _current_route.reset(token)
+
+def get_recent_lines(limit: Optional[int] = None, timestamps: bool = True) -> List[str]:
+    """
+    Returns the most recent log records, formatted: the current route's if one is active, else
+    the game's. Without timestamps the lines only depend on what was logged, so a replayed
+    session shows the same ones.
+    """
+    current_route = _current_route.get()
+    buffer = current_route.ring_buffer if current_route is not None else ring_buffer
+    return buffer.get_lines(limit, None if timestamps else UNTIMED_RECORD_FORMATTER)
+
+def dump_recent(output: Optional[TextIO] = None, limit: Optional[int] = None):
+    """Writes the most recent log records (see get_recent_lines) to output (sys.stdout by default)."""
+    output = output if output is not None else sys.stdout
+    lines = get_recent_lines(limit)
+    if not lines:
+        print("No log messages recorded.", file=output)
+    for line in lines:
+        print(line, file=output)
@@ -0,0 +1,298 @@
+"""
+Low-overhead metrics: counters, gauges and histograms, exposed in the Prometheus text format
+over a local HTTP endpoint (start_http_server) or dumped to a file periodically (MetricsDumper).
+
+Metrics are off unless enable() is called (or the AFK_QUEST_METRICS environment variable is set,
+which also covers tools that import the game modules directly). While off, counting
+and timing is a single flag check. Gauges always keep their latest value, since they describe
+state (how many templates are loaded) rather than events.
+"""
+import abc
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+from .lazy_import import lazy_import
+
+http_server = lazy_import("http.server") # Only needed if the endpoint is started
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0) # Seconds
+DEFAULT_DUMP_INTERVAL_SECONDS = 10.0
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_enabled = os.environ.get("AFK_QUEST_METRICS", "") not in ("", "0")
+
+def enable():
+    """Starts recording metrics."""
+    global _enabled # pylint: disable=global-statement
+    _enabled = True
+
+def disable():
+    """Stops recording metrics (values recorded so far are kept)."""
+    global _enabled # pylint: disable=global-statement
+    _enabled = False
+
+def enabled() -> bool:
+    """Returns True if metrics are being recorded."""
+    return _enabled
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+class Metric(abc.ABC):
+    """
+    Base class for a named metric. A metric declared with label names is a family: call
+    labels(...) once (e.g. at import time) and keep the child, so the hot path skips the lookup.
+    """
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], "Metric"] = {}
+
+    def labels(self, *values: str) -> "Metric":
+        """Returns the child metric for these label values (created on first use)."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {values}.")
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self) -> "Metric":
+        return type(self)(self.name, self.documentation)
+
+    @abc.abstractmethod
+    def _samples(self, label_pairs: Tuple[Tuple[str, str], ...]) -> List[str]:
+        """Returns the sample lines of this metric, or of a child with these label pairs."""
+
+    def render(self) -> List[str]:
+        """Returns this metric's lines in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        if self.labelnames:
+            for values, child in sorted(self._children.items()):
+                lines.extend(child._samples(tuple(zip(self.labelnames, values)))) # pylint: disable=protected-access
+        else:
+            lines.extend(self._samples(()))
+        return lines
+
+class Counter(Metric):
+    """A count that only goes up (fights fought, saves written)."""
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        """Adds amount (1 by default) while metrics are enabled."""
+        if _enabled:
+            self.value += amount
+
+    def _samples(self, label_pairs):
+        return [f"{self.name}{_format_labels(label_pairs)} {_format_value(self.value)}"]
+
+class Gauge(Metric):
+    """A value that goes up and down (templates loaded)."""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0
+
+    def set(self, value: float):
+        """Sets the current value."""
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        """Adds amount to the current value."""
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        """Subtracts amount from the current value."""
+        self.value -= amount
+
+    def _samples(self, label_pairs):
+        return [f"{self.name}{_format_labels(label_pairs)} {_format_value(self.value)}"]
+
+class _Timer:
+    """Context manager returned by Histogram.time()."""
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: "Histogram"):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        if _enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if _enabled and self.start:
+            self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+class Histogram(Metric):
+    """Counts observations (durations, rounds) into cumulative buckets, with their sum and count."""
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1) # The last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float):
+        """Records one observation while metrics are enabled."""
+        if _enabled:
+            self.bucket_counts[bisect_left(self.buckets, value)] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> _Timer:
+        """Returns a context manager that observes the seconds spent inside it."""
+        return _Timer(self)
+
+    def _samples(self, label_pairs):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.bucket_counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels(label_pairs + (('le', _format_value(float(bound))),))} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(label_pairs)} {_format_value(self.sum)}")
+        lines.append(f"{self.name}_count{_format_labels(label_pairs)} {self.count}")
+        return lines
+
+class MetricsRegistry:
+    """
+    The set of metrics to expose. Declaring a metric that already exists returns the existing
+    one, so modules can declare their metrics at import time without coordinating.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as a {metric.metric_type}.")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Returns the counter with this name, creating it if needed."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Returns the gauge with this name, creating it if needed."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Returns the histogram with this name, creating it if needed."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Returns a registered metric by name, or None."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "".join(line + "\n" for metric in metrics for line in metric.render())
+
+REGISTRY = MetricsRegistry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+def start_http_server(port: int, host: str = "127.0.0.1",
+                      registry: MetricsRegistry = REGISTRY) -> "http_server.ThreadingHTTPServer":
+    """
+    Serves the metrics at http://host:port/metrics on a daemon thread (port 0 picks a free port,
+    see server.server_address). Call shutdown() on the returned server to stop it.
+    """
+    class MetricsHandler(http_server.BaseHTTPRequestHandler):
+        """Answers GET /metrics with the registry in the Prometheus text format."""
+        def do_GET(self): # pylint: disable=invalid-name
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args): # pylint: disable=redefined-builtin
+            pass # Scrapes are not game output
+
+    server = http_server.ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="MetricsHTTPServer", daemon=True).start()
+    return server
+
+class MetricsDumper:
+    """Writes the metrics to a file every interval seconds (and once more when stopped)."""
+    def __init__(self, filepath: str, interval: float = DEFAULT_DUMP_INTERVAL_SECONDS,
+                 registry: MetricsRegistry = REGISTRY):
+        self.filepath = filepath
+        self.interval = interval
+        self.registry = registry
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def dump(self):
+        """Writes the metrics now. The file is replaced in one step, so readers never see half of it."""
+        temp_filepath = f"{self.filepath}.tmp"
+        try:
+            with open(temp_filepath, "w", encoding="utf-8") as f:
+                f.write(self.registry.render())
+            os.replace(temp_filepath, self.filepath)
+        except OSError as e:
+            print(f"Error writing metrics to {self.filepath}: {e}")
+
+    def _run(self):
+        """Background loop: dumps every interval seconds until stopped."""
+        while not self._stop_event.wait(self.interval):
+            self.dump()
+
+    def start(self):
+        """Starts dumping on a daemon thread. Does nothing if already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="MetricsDumper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background thread and writes a final dump."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.dump()
@@ -0,0 +1,172 @@
+"""
+Policy search: evaluates auto-play policies with many seeded rollouts across a process pool
+and ranks them by XP per game hour.
+
+Usage (from the project root):
+    python -m src.policy_search --level 5 --hours 8 --rollouts 32 --search halving
+"""
+import argparse
+import io
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .autoplay import AutoPlayer, RestBelow
+from .character import Character
+from .data_loader import DataLoader
+from .enemy_manager import EnemyManager
+from .item import LootTable
+from .rng import RandomSource
+from .shared_catalog import attach_enemy_manager, publish_enemy_catalog
+
+# A candidate policy: (rest threshold as a fraction of max HP, difficulty band or None for any)
+Candidate = Tuple[float, Optional[int]]
+
+DEFAULT_THRESHOLDS = [step / 20 for step in range(0, 20)] # 0%, 5%, ... 95%
+
+# Set in each worker by _init_worker
+_worker_enemy_manager: Optional[EnemyManager] = None
+
+def _init_worker(catalog_name: str, loot_tables: Optional[Dict[str, LootTable]] = None):
+    """Process pool initializer: attaches to the shared enemy table published by the parent."""
+    global _worker_enemy_manager # pylint: disable=global-statement
+    _worker_enemy_manager = attach_enemy_manager(catalog_name, loot_tables)
+
+def describe_candidate(candidate: Candidate) -> str:
+    """Returns the --autoplay policy string for a candidate."""
+    return RestBelow(*candidate).describe()
+
+def run_rollouts(candidate: Candidate, seeds: Sequence[int], level: int, attack: int, hours: float,
+                 enemy_manager: Optional[EnemyManager] = None) -> List[Tuple[float, bool]]:
+    """
+    Plays one fresh character per seed with the candidate policy for the given game time.
+    The random streams depend only on the seed, so every candidate is played against the same
+    rolls (common random numbers) and differences between candidates are down to the policy.
+    Enemies are picked from a stream of their own, so fight n of a rollout meets the same
+    enemy for every candidate (in the same difficulty band) however its earlier fights went.
+
+    Returns:
+        List[Tuple[float, bool]]: Per rollout, XP earned per game hour over the whole horizon
+                                  (a character that dies earns nothing after death) and whether it died.
+    """
+    manager = enemy_manager if enemy_manager is not None else _worker_enemy_manager
+    results = []
+    for seed in seeds:
+        character = Character(name="Rollout", level=level, base_attack_stat=attack)
+        auto_player = AutoPlayer(character, manager, RestBelow(*candidate), status_interval=0,
+                                 output=io.StringIO(), rng=RandomSource(seed),
+                                 encounter_rng=RandomSource(seed).spawn("encounters"))
+        stats = auto_player.run(max_game_seconds=hours * 3600)
+        results.append((stats["experience"] / hours, character.is_dead))
+    return results
+
+def summarize(candidate: Candidate, results: List[Tuple[float, bool]]) -> Dict[str, Any]:
+    """Computes the mean XP/hour with a 95% confidence interval and the death rate."""
+    returns = [xp_per_hour for xp_per_hour, _ in results]
+    count = len(returns)
+    mean = sum(returns) / count
+    variance = sum((value - mean) ** 2 for value in returns) / (count - 1) if count > 1 else 0.0
+    half_width = 1.96 * math.sqrt(variance / count)
+    return {"policy": describe_candidate(candidate), "candidate": candidate, "rollouts": count,
+            "xp_per_hour": mean, "ci_low": mean - half_width, "ci_high": mean + half_width,
+            "death_rate": sum(1 for _, died in results if died) / count}
+
+def evaluate(pool: ProcessPoolExecutor, candidates: List[Candidate], rollouts: int, level: int,
+             attack: int, hours: float, seed: int, batch_size: int = 8) -> Dict[Candidate, List[Tuple[float, bool]]]:
+    """Runs rollouts for every candidate, split into batches across the pool."""
+    futures = []
+    for candidate in candidates:
+        for start in range(0, rollouts, batch_size):
+            seeds = [seed + i for i in range(start, min(rollouts, start + batch_size))]
+            futures.append((candidate, pool.submit(run_rollouts, candidate, seeds, level, attack, hours)))
+    results: Dict[Candidate, List[Tuple[float, bool]]] = {candidate: [] for candidate in candidates}
+    for candidate, future in futures:
+        results[candidate].extend(future.result())
+    return results
+
+def search_policies(enemy_templates: Sequence[Dict[str, Any]], candidates: List[Candidate],
+                    rollouts: int = 32, level: int = 1, attack: int = 1, hours: float = 8.0,
+                    seed: int = 0, search: str = "grid", workers: Optional[int] = None,
+                    loot_tables: Optional[Dict[str, LootTable]] = None) -> List[Dict[str, Any]]:
+    """
+    Ranks candidate policies by expected XP per game hour.
+
+    "grid" gives every candidate the full number of rollouts. "halving" (successive halving)
+    starts every candidate with a quarter of the rollouts, then repeatedly keeps the better half
+    and doubles their rollouts, so most of the budget goes to the promising policies.
+
+    Args:
+        enemy_templates (Sequence[Dict[str, Any]]): Enemy templates, published once to shared memory.
+        candidates (List[Candidate]): Policies to evaluate.
+        rollouts (int): Rollouts per candidate ("grid") or for the finalists ("halving").
+        level (int): Starting level of each rollout character.
+        attack (int): Base attack stat of each rollout character.
+        hours (float): Game hours per rollout.
+        seed (int): Base seed; rollout i of every candidate uses seed + i (common random numbers).
+        search (str): "grid" or "halving".
+        workers (Optional[int]): Process pool size. Defaults to the CPU count.
+        loot_tables (Optional[Dict[str, LootTable]]): Enemy name -> the items it can drop, as in the
+            game (see DataLoader.load_loot_tables). Without them rollouts are played item-free.
+
+    Returns:
+        List[Dict[str, Any]]: Summaries (see summarize) of the candidates evaluated in the last
+                              round, best first.
+    """
+    with publish_enemy_catalog(enemy_templates) as catalog:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(catalog.name, loot_tables)) as pool:
+            if search == "grid":
+                results = evaluate(pool, candidates, rollouts, level, attack, hours, seed)
+            elif search == "halving":
+                survivors = list(candidates)
+                round_rollouts = max(2, rollouts // 4)
+                results = evaluate(pool, survivors, round_rollouts, level, attack, hours, seed)
+                while len(survivors) > 2 and round_rollouts < rollouts:
+                    ranked = sorted(survivors, key=lambda c: summarize(c, results[c])["xp_per_hour"], reverse=True)
+                    survivors = ranked[:max(2, len(ranked) // 2)]
+                    round_rollouts = min(rollouts, round_rollouts * 2)
+                    results = evaluate(pool, survivors, round_rollouts, level, attack, hours, seed)
+            else:
+                raise ValueError(f"Unknown search '{search}'. Use 'grid' or 'halving'.")
+    summaries = [summarize(candidate, candidate_results) for candidate, candidate_results in results.items()]
+    return sorted(summaries, key=lambda summary: summary["xp_per_hour"], reverse=True)
+
+def format_ranking(summaries: List[Dict[str, Any]], top: int = 20) -> str:
+    """Formats the best policies as a text table."""
+    lines = [f"{'rank':<6}{'policy':<18}{'XP/hour':>10}{'95% CI':>22}{'deaths':>9}{'rollouts':>10}"]
+    for rank, summary in enumerate(summaries[:top], start=1):
+        interval = f"[{summary['ci_low']:.1f}, {summary['ci_high']:.1f}]"
+        lines.append(f"{rank:<6}{summary['policy']:<18}{summary['xp_per_hour']:>10.1f}{interval:>22}"
+                     f"{summary['death_rate']:>9.0%}{summary['rollouts']:>10}")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Rank auto-play policies by XP per game hour.")
+    parser.add_argument("--level", type=int, default=1, help="Starting character level (default: 1)")
+    parser.add_argument("--attack", type=int, default=1, help="Character base attack stat (default: 1)")
+    parser.add_argument("--hours", type=float, default=8.0, help="Game hours per rollout (default: 8)")
+    parser.add_argument("--rollouts", type=int, default=32, help="Rollouts per policy (default: 32)")
+    parser.add_argument("--search", choices=["grid", "halving"], default="grid", help="Search strategy (default: grid)")
+    parser.add_argument("--seed", type=int, default=0, help="Base random seed (default: 0)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=20, help="Policies to show (default: 20)")
+    args = parser.parse_args(argv)
+
+    data_loader = DataLoader(data_folder_path="data")
+    enemy_templates = data_loader.load_enemy_definitions()
+    if not enemy_templates:
+        print("Critical Error: Could not load enemy definitions. Nothing to evaluate.")
+        return 1
+    loot_tables = data_loader.load_loot_tables(data_loader.load_item_definitions())
+
+    bands: List[Optional[int]] = [None] + EnemyManager(enemy_templates).get_difficulty_bands()
+    candidates = [(threshold, band) for threshold in DEFAULT_THRESHOLDS for band in bands]
+    print(f"Evaluating {len(candidates)} policies ({args.search} search)...")
+    summaries = search_policies(enemy_templates, candidates, rollouts=args.rollouts, level=args.level,
+                                attack=args.attack, hours=args.hours, seed=args.seed,
+                                search=args.search, workers=args.workers, loot_tables=loot_tables)
+    print(format_ranking(summaries, args.top))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
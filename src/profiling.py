@@ -0,0 +1,280 @@
+"""
+Session profiling (the game's --profile mode): runs a session under cProfile or a sampling
+profiler plus tracemalloc, and attributes time and memory to the game's subsystems.
+
+Time spent outside the game's own code (the standard library, print, json) is charged to the
+game code that called it, so e.g. json.dump under file_manager counts as persistence.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DETERMINISTIC = "deterministic" # cProfile: every call, exact counts, slower
+SAMPLING = "sampling" # Stack samples at a fixed interval: low overhead, approximate
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 0.001
+DEFAULT_MEMORY_FRAMES = 16
+OTHER = "other"
+
+# Module (file name without .py) -> subsystem
+SUBSYSTEMS = {
+    "data_loader": "data loading", "enemy_catalog": "data loading", "shared_catalog": "data loading",
+    "hot_reload": "data loading",
+    "combat": "combat", "encounter": "combat", "status_effects": "combat", "rng": "combat",
+    "enemy": "combat", "enemy_manager": "combat", "item": "combat",
+    "character": "character model", "inventory": "character model",
+    "file_manager": "persistence", "session_recorder": "persistence",
+    "combat_events": "rendering",
+    "game": "game loop", "actions": "game loop", "autoplay": "game loop", "clock": "game loop",
+    "metrics": "instrumentation", "tracing": "instrumentation", "log": "instrumentation",
+}
+
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROFILER_FILE = os.path.abspath(__file__)
+
+def get_subsystem(filename: str) -> Optional[str]:
+    """Returns the subsystem a source file belongs to, or None if it is not part of the game."""
+    if os.path.dirname(os.path.abspath(filename)) != _SRC_DIR:
+        return None
+    return SUBSYSTEMS.get(os.path.splitext(os.path.basename(filename))[0], OTHER)
+
+def attribute_profile(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Splits a cProfile run's self time between subsystems. Time in functions outside the game
+    is shared between their callers in proportion to the time each caller spent in them.
+
+    Returns:
+        Dict[str, float]: Seconds per subsystem.
+    """
+    shares_cache: Dict[Tuple, Dict[str, float]] = {}
+
+    def get_shares(func: Tuple, depth: int = 0) -> Dict[str, float]:
+        cached = shares_cache.get(func)
+        if cached is not None:
+            return cached
+        subsystem = get_subsystem(func[0])
+        if subsystem is not None:
+            shares = {subsystem: 1.0}
+        else:
+            shares_cache[func] = {OTHER: 1.0} # Cycle guard while the callers are resolved
+            callers = stats.stats[func][4] if func in stats.stats else {}
+            total = sum(edge[3] for edge in callers.values())
+            if total <= 0 or depth > 100:
+                shares = {OTHER: 1.0}
+            else:
+                shares = {}
+                for caller, edge in callers.items():
+                    for caller_subsystem, share in get_shares(caller, depth + 1).items():
+                        shares[caller_subsystem] = shares.get(caller_subsystem, 0.0) + share * edge[3] / total
+        shares_cache[func] = shares
+        return shares
+
+    seconds: Dict[str, float] = {}
+    for func, (_, _, self_time, _, _) in stats.stats.items():
+        if self_time <= 0:
+            continue
+        for subsystem, share in get_shares(func).items():
+            seconds[subsystem] = seconds.get(subsystem, 0.0) + self_time * share
+    return seconds
+
+def attribute_memory(snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+    """Splits the memory held in a tracemalloc snapshot between subsystems, by the innermost game frame."""
+    memory: Dict[str, int] = {}
+    for stat in snapshot.statistics("traceback"):
+        subsystem = OTHER
+        for frame in reversed(stat.traceback): # Most recent frame first
+            frame_subsystem = get_subsystem(frame.filename)
+            if frame_subsystem is not None:
+                subsystem = frame_subsystem
+                break
+        memory[subsystem] = memory.get(subsystem, 0) + stat.size
+    return memory
+
+class StackSampler:
+    """
+    Samples one thread's stack every interval seconds from a background thread, counting
+    samples per subsystem (by the innermost game frame) and per folded call stack.
+    """
+    def __init__(self, thread_id: int, interval: float = DEFAULT_SAMPLE_INTERVAL_SECONDS):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.subsystem_samples: Dict[str, int] = {}
+        self.folded_stacks: Dict[str, int] = {} # "outer;...;inner" -> samples, for flame graphs
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self):
+        """Takes one sample of the target thread's stack."""
+        frame = sys._current_frames().get(self.thread_id) # pylint: disable=protected-access
+        if frame is None:
+            return
+        names = []
+        subsystem = None
+        while frame is not None:
+            code = frame.f_code
+            if subsystem is None:
+                subsystem = get_subsystem(code.co_filename)
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        subsystem = subsystem or OTHER
+        stack = ";".join(reversed(names))
+        self.samples += 1
+        self.subsystem_samples[subsystem] = self.subsystem_samples.get(subsystem, 0) + 1
+        self.folded_stacks[stack] = self.folded_stacks.get(stack, 0) + 1
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        """Starts sampling on a daemon thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops sampling and waits for the sampling thread to finish."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+class SessionProfiler:
+    """
+    Profiles whatever runs between start() and stop() on the calling thread, then reports time
+    and memory per subsystem (report) and writes the summary and raw data (write).
+    """
+    def __init__(self, mode: str = DETERMINISTIC, interval: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+                 memory: bool = True, memory_frames: int = DEFAULT_MEMORY_FRAMES):
+        """
+        Args:
+            mode (str): DETERMINISTIC (cProfile) or SAMPLING.
+            interval (float): Seconds between stack samples in SAMPLING mode.
+            memory (bool): Also trace allocations with tracemalloc (slows the session down further).
+            memory_frames (int): Stack frames tracemalloc keeps per allocation, for attribution.
+        """
+        if mode not in (DETERMINISTIC, SAMPLING):
+            raise ValueError(f"Unknown profile mode '{mode}'. Use '{DETERMINISTIC}' or '{SAMPLING}'.")
+        self.mode = mode
+        self.interval = interval
+        self.memory = memory
+        self.memory_frames = memory_frames
+        self.wall_seconds = 0.0
+        self.peak_memory = 0
+        self.profile: Optional[cProfile.Profile] = None
+        self.sampler: Optional[StackSampler] = None
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self._start_time = 0.0
+
+    def start(self):
+        """Starts profiling the calling thread."""
+        if self.memory:
+            tracemalloc.start(self.memory_frames)
+        if self.mode == DETERMINISTIC:
+            self.profile = cProfile.Profile()
+        else:
+            self.sampler = StackSampler(threading.get_ident(), self.interval)
+            self.sampler.start()
+        self._start_time = time.perf_counter()
+        if self.profile is not None:
+            self.profile.enable()
+
+    def stop(self):
+        """Stops profiling and takes the memory snapshot."""
+        if self.profile is not None:
+            self.profile.disable()
+        self.wall_seconds = time.perf_counter() - self._start_time
+        if self.sampler is not None:
+            self.sampler.stop()
+        if self.memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            self.snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, _PROFILER_FILE)])
+            tracemalloc.stop()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: "mode", "wall_seconds", "time_by_subsystem" (seconds),
+                            "memory_by_subsystem" (bytes held at the end) and "peak_memory" (bytes).
+        """
+        if self.profile is not None:
+            time_by_subsystem = attribute_profile(pstats.Stats(self.profile))
+        elif self.sampler is not None and self.sampler.samples:
+            seconds_per_sample = self.wall_seconds / self.sampler.samples
+            time_by_subsystem = {subsystem: samples * seconds_per_sample
+                                 for subsystem, samples in self.sampler.subsystem_samples.items()}
+        else:
+            time_by_subsystem = {}
+        return {"mode": self.mode, "wall_seconds": self.wall_seconds,
+                "time_by_subsystem": dict(sorted(time_by_subsystem.items(), key=lambda item: -item[1])),
+                "memory_by_subsystem": (dict(sorted(attribute_memory(self.snapshot).items(), key=lambda item: -item[1]))
+                                        if self.snapshot is not None else {}),
+                "peak_memory": self.peak_memory}
+
+    def format_summary(self, report: Dict[str, Any], top: int = 25) -> str:
+        """Formats a report as text, with the busiest functions when cProfile was used."""
+        total_time = sum(report["time_by_subsystem"].values()) or 1.0
+        lines = [f"Profile ({report['mode']}): {report['wall_seconds']:.3f}s wall time", "",
+                 "Time by subsystem:"]
+        for subsystem, seconds in report["time_by_subsystem"].items():
+            lines.append(f"  {subsystem:<18} {seconds:9.3f}s  {seconds / total_time:6.1%}")
+        if self.memory:
+            lines += ["", f"Memory held at the end by subsystem (peak {report['peak_memory'] / 1024:.1f} KiB traced):"]
+            for subsystem, size in report["memory_by_subsystem"].items():
+                lines.append(f"  {subsystem:<18} {size / 1024:9.1f} KiB")
+        if self.profile is not None:
+            stream = io.StringIO()
+            pstats.Stats(self.profile, stream=stream).sort_stats("tottime").print_stats(top)
+            lines += ["", f"Top {top} functions by own time:", stream.getvalue().strip()]
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str) -> Dict[str, Any]:
+        """
+        Writes summary.txt and summary.json, plus the raw data: profile.prof (cProfile, open with
+        pstats or snakeviz) or stacks.folded (sampling, for flame graph tools), and memory.snapshot
+        (tracemalloc.Snapshot.load).
+
+        Returns:
+            Dict[str, Any]: The report.
+        """
+        os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        with open(os.path.join(directory, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write(self.format_summary(report))
+        with open(os.path.join(directory, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        if self.profile is not None:
+            self.profile.dump_stats(os.path.join(directory, "profile.prof"))
+        if self.sampler is not None:
+            with open(os.path.join(directory, "stacks.folded"), "w", encoding="utf-8") as f:
+                for stack, count in sorted(self.sampler.folded_stacks.items()):
+                    f.write(f"{stack} {count}\n")
+        if self.snapshot is not None:
+            self.snapshot.dump(os.path.join(directory, "memory.snapshot"))
+        return report
+
+def run_profiled(func: Callable[[], Any], directory: str, mode: str = DETERMINISTIC,
+                 interval: float = DEFAULT_SAMPLE_INTERVAL_SECONDS, memory: bool = True) -> Dict[str, Any]:
+    """
+    Runs func under a SessionProfiler and writes the results to directory (see SessionProfiler.write),
+    even if func raises.
+
+    Returns:
+        Dict[str, Any]: The report.
+    """
+    profiler = SessionProfiler(mode, interval, memory)
+    profiler.start()
+    try:
+        func()
+    finally:
+        profiler.stop()
+        report = profiler.write(directory)
+    return report
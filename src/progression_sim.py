@@ -0,0 +1,222 @@
+"""
+Long-horizon progression/economy simulator: advances many AFK agents through many fights
+and reports how long they take to reach given levels and how much gold they collect.
+
+Usage (from the project root):
+    python -m src.progression_sim --agents 10000 --fights 1000000 --targets 10,50,100
+"""
+import argparse
+import math
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence
+from . import combat, log
+from .character import Character
+from .data_loader import DataLoader
+from .enemy import Enemy
+from .rng import RandomSource
+
+DEFAULT_SAMPLES_PER_TEMPLATE = 400
+# Levels where a level-up is expected within this many fights are stepped fight by fight;
+# longer levels are advanced in one batched step (see simulate_progression).
+DEFAULT_EXACT_FIGHT_THRESHOLD = 32
+
+logger = log.get_logger("progression_sim")
+
+class LevelOutcomeTable:
+    """
+    Fight outcome statistics for a character of one level against a random enemy.
+    Built by Monte Carlo with the real combat rules (combat.simulate_combat).
+    """
+    def __init__(self, outcomes: List[tuple]):
+        """
+        Args:
+            outcomes (List[tuple]): Sampled (experience, gold, paced_seconds, won) per fight.
+        """
+        self.outcomes = outcomes
+        count = len(outcomes)
+        self.win_rate = sum(1 for outcome in outcomes if outcome[3]) / count
+        self.xp_mean, self.xp_variance = _mean_and_variance([outcome[0] for outcome in outcomes])
+        self.gold_mean, self.gold_variance = _mean_and_variance([outcome[1] for outcome in outcomes])
+        self.seconds_mean, self.seconds_variance = _mean_and_variance([outcome[2] for outcome in outcomes])
+        # Running experience totals, to pick the fight that crosses a level threshold (see sample_overflow)
+        self.xp_cumulative = list(accumulate(outcome[0] for outcome in outcomes))
+        # Mean experience left over after that fight: (E[X^2] / E[X] - 1) / 2, by the renewal theorem
+        self.overflow_mean = ((self.xp_variance + self.xp_mean ** 2) / self.xp_mean - 1) / 2 if self.xp_mean else 0.0
+
+    def sample_overflow(self, rng: RandomSource) -> int:
+        """
+        Samples the experience carried into the next level when a level-up follows many fights.
+        The fight that crosses the threshold is drawn in proportion to its experience, and the
+        threshold falls uniformly within it, so the overflow is uniform in 0..xp - 1.
+        """
+        point = rng.randrange(self.xp_cumulative[-1])
+        return self.xp_cumulative[bisect_right(self.xp_cumulative, point)] - 1 - point
+
+def _mean_and_variance(values: List[float]) -> tuple:
+    """Returns the mean and population variance of values."""
+    mean = sum(values) / len(values)
+    return mean, sum((value - mean) ** 2 for value in values) / len(values)
+
+def build_level_table(enemy_templates: Sequence[Dict[str, Any]], level: int, attack: int,
+                      samples_per_template: int = DEFAULT_SAMPLES_PER_TEMPLATE,
+                      rng: Optional[RandomSource] = None) -> LevelOutcomeTable:
+    """
+    Samples fights of a full-HP character at level against every template
+    (enemies are drawn uniformly, as EnemyManager.get_random_enemy does).
+    """
+    rng = rng if rng is not None else RandomSource()
+    outcomes = []
+    for template in enemy_templates:
+        for _ in range(samples_per_template):
+            player = Character(name="Agent", level=level, base_attack_stat=attack)
+            foe = Enemy(name=template["name"], max_hp=template["hp"], attack_stat=template["attack_stat"],
+                        loot_gold_min=template["loot_gold_min"], loot_gold_max=template["loot_gold_max"])
+            result = combat.simulate_combat(player, foe, apply_rewards=False, rng=rng)
+            outcomes.append((result["experience"], result["gold"],
+                             combat.get_paced_duration(result["rounds"], result["outcome"]),
+                             result["outcome"] == "player_won"))
+    return LevelOutcomeTable(outcomes)
+
+def _sample_sum(rng: RandomSource, count: int, mean: float, variance: float) -> float:
+    """Samples the sum of count i.i.d. draws using the normal approximation (never negative)."""
+    return max(0.0, rng.gauss(count * mean, math.sqrt(count * variance)))  # nosec B311 - Non-cryptographic use for simulation
+
+def simulate_progression(enemy_templates: Sequence[Dict[str, Any]], agents: int, fights: int,
+                         target_levels: List[int], attack: int = 1, seed: Optional[int] = None,
+                         samples_per_template: int = DEFAULT_SAMPLES_PER_TEMPLATE,
+                         exact_fight_threshold: int = DEFAULT_EXACT_FIGHT_THRESHOLD) -> Dict[str, Any]:
+    """
+    Simulates agents that fight random enemies back to back from level 1.
+
+    Each agent starts every fight at full HP (it rests between fights) and a lost fight
+    simply gives no rewards. Progression uses the real rules: experience_to_next_level of
+    level * 10 with overflow, combat.get_experience_reward and Enemy.get_loot_gold.
+
+    Agents are advanced one level at a time, all together. For each level an outcome table is
+    sampled once and shared by every agent. Short levels are stepped fight by fight from that
+    table. Long levels are advanced in one batched step: the fights needed to earn the level's
+    experience and the gold earned meanwhile are drawn from their normal approximations, so the
+    cost per agent is per level rather than per fight, and the experience that overflows into
+    the next level is drawn as well (see LevelOutcomeTable.sample_overflow). Once a level's table shows no losses it is
+    reused for all higher levels, as further HP cannot change the outcome.
+
+    Args:
+        enemy_templates (Sequence[Dict[str, Any]]): Enemy templates to fight.
+        agents (int): Number of agents.
+        fights (int): Horizon: fights per agent.
+        target_levels (List[int]): Levels whose time-to-reach is reported.
+        attack (int): Agents' base attack stat.
+        seed (Optional[int]): Random seed for reproducible runs.
+        samples_per_template (int): Monte Carlo fights per template per level table.
+        exact_fight_threshold (int): Levels expected to take at most this many fights are stepped exactly.
+
+    Returns:
+        Dict[str, Any]: "fights_to_level" and "seconds_to_level" (target level -> list of values for
+                        agents that reached it), "final_level" and "gold" (one value per agent).
+    """
+    rng = RandomSource(seed)
+    fights_used = [0] * agents
+    seconds_used = [0.0] * agents
+    carry_xp = [0] * agents
+    gold = [0.0] * agents
+    active = list(range(agents))
+    fights_to_level: Dict[int, List[int]] = {target: [] for target in target_levels}
+    seconds_to_level: Dict[int, List[float]] = {target: [] for target in target_levels}
+    final_level = [1] * agents
+
+    table: Optional[LevelOutcomeTable] = None
+    level = 1
+    while active:
+        if table is None or table.win_rate < 1.0:
+            table = build_level_table(enemy_templates, level, attack, samples_per_template, rng)
+        if table.xp_mean == 0:
+            logger.warning("Agents cannot gain experience at level %d. Stopping.", level)
+            break
+
+        experience_needed = level * 10
+        still_active = []
+        for agent in active:
+            needed = experience_needed - carry_xp[agent]
+            remaining = fights - fights_used[agent]
+            if needed / table.xp_mean <= exact_fight_threshold:
+                earned = 0
+                while earned < needed and remaining > 0:
+                    xp, loot, seconds, _ = rng.choice(table.outcomes)  # nosec B311 - Non-cryptographic use for simulation
+                    earned += xp
+                    gold[agent] += loot
+                    seconds_used[agent] += seconds
+                    remaining -= 1
+                fights_used[agent] = fights - remaining
+                leveled_up = earned >= needed
+                carry_xp[agent] = earned - needed if leveled_up else earned
+            else:
+                # First-passage time of a renewal process: mean (needed + overflow)/mu (Wald), variance needed*sigma^2/mu^3
+                count = max(1, round(rng.gauss((needed + table.overflow_mean) / table.xp_mean,  # nosec B311 - Non-cryptographic use for simulation
+                                                  math.sqrt(needed * table.xp_variance / table.xp_mean ** 3))))
+                leveled_up = count <= remaining
+                count = min(count, remaining)
+                gold[agent] += _sample_sum(rng, count, table.gold_mean, table.gold_variance)
+                seconds_used[agent] += _sample_sum(rng, count, table.seconds_mean, table.seconds_variance)
+                fights_used[agent] += count
+                carry_xp[agent] = table.sample_overflow(rng) if leveled_up else min(needed - 1, round(_sample_sum(rng, count, table.xp_mean, table.xp_variance)))
+
+            if leveled_up:
+                final_level[agent] = level + 1
+                if level + 1 in fights_to_level:
+                    fights_to_level[level + 1].append(fights_used[agent])
+                    seconds_to_level[level + 1].append(seconds_used[agent])
+                if fights_used[agent] < fights:
+                    still_active.append(agent)
+        active = still_active
+        level += 1
+
+    return {"fights_to_level": fights_to_level, "seconds_to_level": seconds_to_level,
+            "final_level": final_level, "gold": gold}
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of values (fraction between 0 and 1)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+def format_report(results: Dict[str, Any], agents: int, fights: int,
+                  fractions: Sequence[float] = (0.1, 0.5, 0.9, 0.99)) -> str:
+    """Formats time-to-level and gold percentiles as text."""
+    labels = "  ".join(f"p{round(fraction * 100)}".rjust(12) for fraction in fractions)
+    lines = [f"--- Progression over {fights} fights ({agents} agents) ---",
+             f"{'':<24}{labels}"]
+    for target, values in results["fights_to_level"].items():
+        if not values:
+            lines.append(f"Level {target}: not reached by any agent")
+            continue
+        hours = [seconds / 3600 for seconds in results["seconds_to_level"][target]]
+        lines.append(f"Level {target} ({len(values) / agents:.0%} reached)")
+        lines.append(f"{'  fights':<24}" + "  ".join(f"{percentile(values, f):>12,}" for f in fractions))
+        lines.append(f"{'  hours (paced combat)':<24}" + "  ".join(f"{percentile(hours, f):>12,.1f}" for f in fractions))
+    lines.append(f"{'Final level':<24}" + "  ".join(f"{percentile(results['final_level'], f):>12,}" for f in fractions))
+    lines.append(f"{'Gold':<24}" + "  ".join(f"{percentile(results['gold'], f):>12,.0f}" for f in fractions))
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Simulate long-horizon level and gold progression for many agents.")
+    parser.add_argument("--agents", type=int, default=10000, help="Number of agents (default: 10000)")
+    parser.add_argument("--fights", type=int, default=1000000, help="Fights per agent (default: 1000000)")
+    parser.add_argument("--targets", default="10,50,100", help="Levels to report time-to-level for (default: 10,50,100)")
+    parser.add_argument("--attack", type=int, default=1, help="Agents' base attack stat (default: 1)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args(argv)
+
+    enemy_templates = DataLoader(data_folder_path="data").load_enemy_definitions()
+    if not enemy_templates:
+        print("Critical Error: Could not load enemy definitions. Nothing to simulate.")
+        return 1
+
+    target_levels = sorted(int(level) for level in args.targets.split(","))
+    results = simulate_progression(enemy_templates, args.agents, args.fights, target_levels,
+                                   attack=args.attack, seed=args.seed)
+    print(format_report(results, args.agents, args.fights))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+"""
+Seedable random number supply for combat, loot and simulations.
+
+random.randint is slow (several Python-level calls per roll). RandomSource instead draws
+32-bit words in bulk with one getrandbits call, turns a whole block into unbiased values for a
+given range at once, and hands them out one by one. Values are uniform, exactly as with
+random.randint, and the same seed and call sequence always give the same values.
+
+Only the first MAX_BUFFERED_RANGES range sizes drawn from get a buffer (the game rolls a handful
+of sizes over and over); rarer sizes after that are drawn one at a time, so callers that use
+ever-changing ranges cannot grow the buffers without bound.
+"""
+import os
+import random
+from array import array
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+DEFAULT_BLOCK_SIZE = 4096 # 32-bit words drawn per refill
+MAX_BUFFERED_RANGES = 32 # Range sizes with a buffer of their own, each up to DEFAULT_BLOCK_SIZE values
+_WORD_RANGE = 1 << 32
+
+class RandomSource:
+    """
+    A reproducible random stream with the random-module methods the game uses
+    (randint, randrange, choice, random, gauss), so it can be passed wherever a
+    module-level random call would otherwise be made.
+    """
+    def __init__(self, seed: Optional[Any] = None, block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        Args:
+            seed (Optional[Any]): An int, str or bytes seed. If None, a random seed is picked
+                                  (and kept in .seed, so the stream can be recreated).
+            block_size (int): 32-bit words drawn per refill of a range's buffer.
+        """
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(8), "little")
+        self.block_size = block_size
+        self._random = random.Random(self.seed)
+        self._streams: Dict[int, Iterator[int]] = {} # Range size -> buffered values in [0, size)
+
+    def spawn(self, stream_id: Any) -> "RandomSource":
+        """
+        Returns an independent child stream, e.g. one per simulation worker or per task.
+        The child depends only on this source's seed and stream_id, not on how much of
+        this stream has been used.
+        """
+        return RandomSource(f"{self.seed}/{stream_id}", self.block_size)
+
+    def _refill(self, size: int) -> int:
+        """Buffers a block of values in [0, size) and returns the first one."""
+        if size > _WORD_RANGE or (size not in self._streams and len(self._streams) >= MAX_BUFFERED_RANGES):
+            return self._random.randrange(size)
+        limit = _WORD_RANGE - _WORD_RANGE % size # Rejecting words >= limit keeps the values unbiased
+        while True:
+            words = array("I", self._random.getrandbits(32 * self.block_size).to_bytes(4 * self.block_size, "little"))
+            values = [word % size for word in words if word < limit]
+            if values:
+                stream = iter(values)
+                self._streams[size] = stream
+                return next(stream)
+
+    def randint(self, a: int, b: int) -> int:
+        """Returns a random integer N such that a <= N <= b."""
+        size = b - a + 1
+        stream = self._streams.get(size)
+        if stream is not None:
+            value = next(stream, None)
+            if value is not None:
+                return a + value
+        if size <= 0:
+            raise ValueError(f"Empty range for randint({a}, {b})")
+        return a + self._refill(size)
+
+    def randrange(self, stop: int) -> int:
+        """Returns a random integer in [0, stop)."""
+        return self.randint(0, stop - 1)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        """Returns a random element of a non-empty sequence."""
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randint(0, len(seq) - 1)]
+
+    def random(self) -> float:
+        """Returns a random float in [0, 1)."""
+        return self._random.random()
+
+    def gauss(self, mu: float, sigma: float) -> float:
+        """Returns a normally distributed float."""
+        return self._random.gauss(mu, sigma)
@@ -0,0 +1,253 @@
+"""
+Asyncio game server: hosts many concurrent players in one process over a simple line protocol.
+
+The server sends plain UTF-8 text; prompts end without a newline, like a terminal. The client
+answers each prompt with one line. Any line-based client works (e.g. nc), or use src.client.
+
+Usage (from the project root):
+    python -m src.server --port 8765
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import os
+import re
+from typing import Optional
+from . import actions, clock, combat, file_manager, log
+from .character import Character
+from .combat_events import RoundEnded, format_terminal_lines
+from .data_loader import DataLoader
+from .enemy import Enemy
+from .enemy_manager import EnemyManager
+from .rng import RandomSource
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_SAVE_FOLDER = "saves"
+MAX_LINE_BYTES = 1024 # Small per-connection read buffer keeps idle sessions cheap
+
+class SessionClosed(Exception):
+    """Raised when the player disconnects part way through a session."""
+
+def get_save_filepath(save_folder: str, name: str) -> str:
+    """Returns the save file path for a character name, keeping only filename-safe characters."""
+    safe_name = re.sub(r"[^A-Za-z0-9_-]", "_", name.strip().lower()) or "_"
+    return os.path.join(save_folder, f"{safe_name}.json")
+
+def _load_character(save_filepath: str) -> Optional[Character]:
+    """Loads a save file, with its messages on the server's console rather than the player's."""
+    with log.unrouted():
+        return file_manager.load_character(save_filepath)
+
+def _save_character(character: Character, save_filepath: str):
+    """Saves a character, with its messages on the server's console rather than the player's."""
+    with log.unrouted():
+        file_manager.save_character(character, save_filepath)
+
+class SessionOutput(io.TextIOBase):
+    """
+    A text stream onto a session's connection, for the messages the game logs while the session
+    runs (see log.route). Writes are buffered by the writer and sent with the session's next send.
+    """
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.writer.write(text.encode("utf-8"))
+        return len(text)
+
+class GameSession:
+    """
+    One connected player's game: the same menus and actions as game.run (see actions.py), driven
+    by a coroutine. Waiting (for input or for combat pacing) suspends only this session.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 enemy_manager: EnemyManager, save_folder: str = DEFAULT_SAVE_FOLDER, pauses: bool = True,
+                 rng: Optional[RandomSource] = None):
+        """
+        Args:
+            reader (asyncio.StreamReader): The connection's input stream.
+            writer (asyncio.StreamWriter): The connection's output stream.
+            enemy_manager (EnemyManager): Shared by all sessions.
+            save_folder (str): Folder holding one save file per character name.
+            pauses (bool): If False, combat is not paced with sleeps.
+            rng (Optional[RandomSource]): This session's source of enemy and combat rolls.
+                                          Defaults to the random module.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.enemy_manager = enemy_manager
+        self.save_folder = save_folder
+        self.pauses = pauses
+        self.rng = rng
+
+    async def send(self, text: str):
+        """Sends text to the player as-is."""
+        self.writer.write(text.encode("utf-8"))
+        await self.writer.drain()
+
+    async def send_line(self, text: str = ""):
+        """Sends one line of text to the player."""
+        await self.send(text + "\n")
+
+    async def prompt(self, text: str) -> str:
+        """Sends a prompt and waits for the player's answer line."""
+        await self.send(text)
+        try:
+            line = await self.reader.readline()
+        except (ValueError, asyncio.LimitOverrunError): # Line longer than MAX_LINE_BYTES
+            raise SessionClosed("Input line too long.")
+        if not line:
+            raise SessionClosed("Connection closed by player.")
+        return line.decode("utf-8", errors="replace").strip()
+
+    async def pause(self, seconds: float):
+        """Paces combat without blocking other sessions."""
+        if self.pauses and seconds > 0:
+            await clock.get_clock().async_sleep(seconds)
+
+    async def run(self):
+        """
+        Runs the session until the player quits or disconnects. A player who disconnects
+        part way through keeps their progress: the character is saved either way.
+        """
+        character = save_filepath = None
+        try:
+            with log.route(SessionOutput(self.writer)): # Character messages go to this player
+                await self.send_line("Welcome to AFK Quest!")
+                name = ""
+                while not name:
+                    name = await self.prompt("Enter your character's name: ")
+                save_filepath = get_save_filepath(self.save_folder, name)
+                saved_character = await asyncio.to_thread(_load_character, save_filepath)
+                if saved_character is not None and await self._ask_continue():
+                    character = saved_character
+                    await self.send_line(f"\nWelcome back, {character.name}!")
+                else:
+                    character = Character(name=name)
+                    await self.send_line(f"\nWelcome, {character.name}!")
+                await self.drive(actions.play_actions(character, lambda: self.enemy_manager, self.rng,
+                                                      quit_label="Save and Quit",
+                                                      death_hint="You can view your character summary or save and quit."))
+                await asyncio.to_thread(_save_character, character, save_filepath)
+                character = None # Saved
+                await self.send_line("Thanks for playing AFK Quest!")
+        except (SessionClosed, ConnectionError):
+            if character is not None:
+                await asyncio.to_thread(_save_character, character, save_filepath)
+        finally:
+            self.writer.close()
+
+    async def _ask_continue(self) -> bool:
+        """Asks whether to continue the saved character or start over."""
+        await self.send_line("\n--- Main Menu ---\n1. Continue Game\n2. Start New Game\n-----------------")
+        while True:
+            choice = await self.prompt("Enter your choice: ")
+            if choice in ["1", "2"]:
+                return choice == "1"
+            await self.send_line("Invalid choice. Please try again.")
+
+    async def drive(self, steps: actions.Steps):
+        """
+        Runs actions (see actions.py) for this player: text and prompts go over the connection
+        and fights are played with run_combat.
+
+        Returns:
+            The value the actions return.
+        """
+        answer = None
+        while True:
+            try:
+                request = steps.send(answer)
+            except StopIteration as stop:
+                return stop.value
+            if isinstance(request, actions.Show):
+                await self.send_line(request.text)
+                answer = None
+            elif isinstance(request, actions.Ask):
+                answer = await self.prompt(request.prompt)
+            else:
+                answer = await self.run_combat(request.player, request.enemy)
+
+    async def run_combat(self, player: Character, enemy: Enemy) -> str:
+        """The async counterpart of combat.start_combat: same events and output, non-blocking pauses."""
+        player_start_hp, enemy_start_hp = player.current_hp, enemy.current_hp
+        events = combat.async_combat_events(player, enemy, rng=self.rng)
+        async for event in events:
+            if isinstance(event, RoundEnded):
+                choice = await self.prompt(f"Press Enter to continue to the next round ({combat.FAST_FORWARD_KEY} to fast-forward)...")
+                if choice.upper() == combat.FAST_FORWARD_KEY:
+                    await events.aclose()
+                    outcome, summary = combat.fast_forward_combat(player, enemy, event.round_num,
+                                                                  player_start_hp, enemy_start_hp, self.rng)
+                    await self.send(summary)
+                    return outcome
+            lines = format_terminal_lines(event)
+            if lines:
+                await self.send_line("\n".join(lines))
+            await self.pause(combat.get_event_pause(event))
+        return event.outcome
+
+async def start_server(enemy_manager: EnemyManager, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                       save_folder: str = DEFAULT_SAVE_FOLDER, pauses: bool = True,
+                       seed: Optional[int] = None) -> asyncio.AbstractServer:
+    """
+    Starts listening for players. Every connection gets its own GameSession coroutine;
+    all sessions share enemy_manager.
+
+    Args:
+        seed (Optional[int]): If given, connection n plays with its own stream RandomSource(seed).spawn(n),
+                              so sessions are reproducible. Otherwise they use the random module.
+
+    Returns:
+        asyncio.AbstractServer: The running server (use serve_forever() or close()).
+    """
+    os.makedirs(save_folder, exist_ok=True)
+    connection_numbers = itertools.count()
+
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        rng = RandomSource(seed).spawn(next(connection_numbers)) if seed is not None else None
+        await GameSession(reader, writer, enemy_manager, save_folder, pauses, rng).run()
+
+    return await asyncio.start_server(handle_connection, host, port, limit=MAX_LINE_BYTES)
+
+async def serve(host: str, port: int, save_folder: str, pauses: bool, seed: Optional[int] = None):
+    """Loads enemy and item data once and serves players until interrupted."""
+    data_loader = DataLoader(data_folder_path="data")
+    enemy_manager = EnemyManager(data_loader.load_enemy_definitions(),
+                                 loot_tables=data_loader.load_loot_tables(data_loader.load_item_definitions()))
+    server = await start_server(enemy_manager, host, port, save_folder, pauses, seed)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"AFK Quest server listening on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+def main(argv: Optional[list] = None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Host AFK Quest for many players over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--save-folder", default=DEFAULT_SAVE_FOLDER,
+                        help=f"Folder for per-character save files (default: {DEFAULT_SAVE_FOLDER})")
+    parser.add_argument("--no-pauses", action="store_true", help="Do not pace combat")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed each session's enemy and combat rolls (default: unseeded)")
+    parser.add_argument("--clock", default="real",
+                        help="Game clock: 'real', 'virtual' or 'accelerated:<factor>' (default: real)")
+    args = parser.parse_args(argv)
+    try:
+        clock.set_clock(clock.parse_clock(args.clock))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    try:
+        asyncio.run(serve(args.host, args.port, args.save_folder, pauses=not args.no_pauses, seed=args.seed))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Deterministic session recording and replay.
+
+A recording holds everything a game.run() session depends on: the random seed, the answer to
+every prompt, the save file, enemy templates and loot tables it started from, and a digest of its output.
+Replaying it re-runs the real game loop headless (on a virtual clock, with a temporary save
+file) and checks that the output is identical, timing each phase along the way. A directory
+of recordings (a corpus) can be replayed as a performance regression check.
+
+Usage (from the project root):
+    python -m src.session_recorder record sessions/fight.session
+    python -m src.session_recorder record sessions/quick.session --script quick.txt --seed 7
+    python -m src.session_recorder replay sessions/fight.session
+    python -m src.session_recorder check sessions --baseline sessions/baseline.json --threshold 0.25
+"""
+import argparse
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+from . import clock
+from . import game
+from . import log
+from .enemy_manager import EnemyManager
+from .item import Item, LootTable, build_loot_tables, get_loot_table_rows
+from .rng import RandomSource
+
+FORMAT_VERSION = 1
+SAVE_PATH_PLACEHOLDER = "<save-file>" # The save path differs between runs, so it is left out of the digest
+SESSION_SUFFIX = ".session"
+DEFAULT_THRESHOLD = 0.25 # Allowed slowdown over the baseline (25%)
+
+class OutputDigest(io.TextIOBase):
+    """
+    A text stream that hashes everything written to it (with the save path replaced by a
+    placeholder) and optionally passes it on to another stream.
+    """
+    def __init__(self, save_filepath: str, echo: Optional[TextIO] = None):
+        self.save_filepath = save_filepath
+        self.echo = echo
+        self._hash = hashlib.sha256()
+        self.lines = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if self.echo is not None:
+            self.echo.write(text)
+        self._hash.update(text.replace(self.save_filepath, SAVE_PATH_PLACEHOLDER).encode("utf-8"))
+        self.lines += text.count("\n")
+        return len(text)
+
+    def flush(self):
+        if self.echo is not None:
+            self.echo.flush()
+
+    def hexdigest(self) -> str:
+        """Returns the SHA-256 of the output so far."""
+        return self._hash.hexdigest()
+
+class RecordingInput:
+    """
+    Answers prompts from read_line (the keyboard by default) and keeps every answer.
+    Prompts are shown on prompt_output rather than through game output, so they are not
+    part of the digest (a replay answers prompts without showing them).
+    """
+    def __init__(self, read_line: Callable[[], str] = input, prompt_output: Optional[TextIO] = None):
+        self.read_line = read_line
+        self.prompt_output = prompt_output
+        self.lines: List[str] = []
+
+    def __call__(self, prompt: str = "") -> str:
+        if self.prompt_output is not None:
+            self.prompt_output.write(prompt)
+            self.prompt_output.flush()
+        line = self.read_line()
+        self.lines.append(line)
+        return line
+
+class TimedInput:
+    """
+    Answers prompts from a recording and adds up, per prompt, the time spent handling its
+    answer (from the answer until the game asks its next question).
+    """
+    def __init__(self, lines: List[str]):
+        self.scripted_input = game.ScriptedInput(lines)
+        self.prompt_seconds: Dict[str, float] = {}
+        self._last_prompt: Optional[str] = None
+        self._answered_at = 0.0
+
+    def _stop_timer(self):
+        if self._last_prompt is not None:
+            elapsed = time.perf_counter() - self._answered_at
+            self.prompt_seconds[self._last_prompt] = self.prompt_seconds.get(self._last_prompt, 0.0) + elapsed
+            self._last_prompt = None
+
+    def __call__(self, prompt: str = "") -> str:
+        self._stop_timer()
+        line = self.scripted_input(prompt) # Raises EOFError at the end of the recording
+        self._last_prompt = prompt.strip()
+        self._answered_at = time.perf_counter()
+        return line
+
+@contextlib.contextmanager
+def _session_settings(**settings):
+    """Temporarily replaces game module settings (input_func, rng, enemy_manager, ...)."""
+    previous = {name: getattr(game, name) for name in settings}
+    for name, value in settings.items():
+        setattr(game, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(game, name, value)
+
+def _dump_loot_tables(loot_tables: Dict[str, LootTable]) -> Dict[str, Any]:
+    """Returns the "items" and "loot_tables" entries of a recording for the given loot tables."""
+    items = {item.name: item for table in loot_tables.values() for item in table.items}
+    return {"items": [item.to_dict() for item in items.values()], "loot_tables": get_loot_table_rows(loot_tables)}
+
+def _load_loot_tables(recording: Dict[str, Any]) -> Dict[str, LootTable]:
+    """Rebuilds a recording's loot tables. Recordings made before items existed have none."""
+    return build_loot_tables(recording.get("loot_tables", []),
+                             [Item.from_dict(item) for item in recording.get("items", [])])
+
+def _run_session(output: TextIO):
+    """
+    Runs the game loop until the player quits or the input runs out, with its output and log
+    messages written to output. The session keeps its own recent log records (see log.route),
+    so the View Recent Log action shows the same lines when it is replayed.
+    """
+    with contextlib.redirect_stdout(output), log.route(output):
+        try:
+            game.run()
+        except EOFError:
+            pass # Input ended mid-session
+
+def record_session(path: str, seed: Optional[int] = None, read_line: Callable[[], str] = input,
+                   paced: bool = True, echo: bool = True) -> Dict[str, Any]:
+    """
+    Plays a session of the real game and saves a recording of it.
+
+    Args:
+        path (str): Where to write the recording (gzipped JSON).
+        seed (Optional[int]): Random seed for the session. If None, a random one is picked.
+        read_line (Callable[[], str]): Source of answers (the keyboard by default).
+        paced (bool): Pause between combat rounds. Round prompts are recorded either way.
+        echo (bool): If True, game output (and prompts) are shown as usual.
+
+    Returns:
+        Dict[str, Any]: The recording.
+    """
+    if seed is None:
+        seed = RandomSource().seed
+    initial_save = None
+    if os.path.exists(game.save_filepath):
+        with open(game.save_filepath, "r", encoding="utf-8") as f:
+            initial_save = f.read()
+    live_enemy_manager = game.get_enemy_manager()
+    enemy_templates = [dict(template) for template in live_enemy_manager.enemy_templates]
+    loot_data = _dump_loot_tables(live_enemy_manager.loot_tables)
+
+    real_stdout = sys.stdout
+    recording_input = RecordingInput(read_line, prompt_output=real_stdout if echo else None)
+    digest = OutputDigest(game.save_filepath, echo=real_stdout if echo else None)
+    with _session_settings(input_func=recording_input, paced_combat=paced, rng=RandomSource(seed),
+                           enemy_manager=EnemyManager(enemy_templates, loot_tables=_load_loot_tables(loot_data)),
+                           reload_enemies=False):
+        _run_session(digest)
+
+    recording = {"version": FORMAT_VERSION, "seed": seed, "paced": paced,
+                 "combat_output": game.combat_output, "initial_save": initial_save,
+                 "enemy_templates": enemy_templates, **loot_data, "inputs": recording_input.lines,
+                 "output_digest": digest.hexdigest(), "output_lines": digest.lines}
+    save_recording(recording, path)
+    return recording
+
+def save_recording(recording: Dict[str, Any], path: str):
+    """Writes a recording as compact gzipped JSON."""
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(recording, f, separators=(",", ":"))
+
+def load_recording(path: str) -> Dict[str, Any]:
+    """Reads a recording written by save_recording."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        recording = json.load(f)
+    if recording.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported session recording version {recording.get('version')} in {path}.")
+    return recording
+
+def replay_session(recording: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Re-runs a recorded session headless, on a virtual clock and a temporary save file.
+
+    Returns:
+        Dict[str, Any]: "matched" (whether the output was identical), "output_digest",
+                        "actions" (prompts answered), "phases" (seconds spent on "setup",
+                        "play" and "verify") and "prompt_seconds" (play time per prompt).
+    """
+    phases = {}
+    start_time = time.perf_counter()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        save_filepath = os.path.join(temp_dir, "character_data.json")
+        if recording["initial_save"] is not None:
+            with open(save_filepath, "w", encoding="utf-8") as f:
+                f.write(recording["initial_save"])
+        timed_input = TimedInput(recording["inputs"])
+        digest = OutputDigest(save_filepath)
+        enemy_manager = EnemyManager(recording["enemy_templates"], loot_tables=_load_loot_tables(recording))
+        previous_clock = clock.set_clock(clock.VirtualClock())
+        try:
+            with _session_settings(input_func=timed_input, paced_combat=recording["paced"],
+                                   rng=RandomSource(recording["seed"]), enemy_manager=enemy_manager,
+                                   combat_output=recording["combat_output"], save_filepath=save_filepath,
+                                   reload_enemies=False):
+                phases["setup"] = time.perf_counter() - start_time
+                start_time = time.perf_counter()
+                _run_session(digest)
+                timed_input._stop_timer() # pylint: disable=protected-access
+                phases["play"] = time.perf_counter() - start_time
+        finally:
+            clock.set_clock(previous_clock)
+
+    start_time = time.perf_counter()
+    matched = (digest.hexdigest() == recording["output_digest"]
+               and timed_input.scripted_input.actions == len(recording["inputs"]))
+    phases["verify"] = time.perf_counter() - start_time
+    return {"matched": matched, "output_digest": digest.hexdigest(),
+            "actions": timed_input.scripted_input.actions, "phases": phases,
+            "prompt_seconds": timed_input.prompt_seconds}
+
+def check_corpus(corpus_dir: str, baseline: Dict[str, float], threshold: float = DEFAULT_THRESHOLD,
+                 runs: int = 3) -> List[Dict[str, Any]]:
+    """
+    Replays every recording in corpus_dir and compares its play time (best of runs) with the baseline.
+
+    Returns:
+        List[Dict[str, Any]]: Per recording: "name", "matched", "seconds", "baseline" (None if new)
+                              and "regressed" (slower than baseline * (1 + threshold)).
+    """
+    results = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if not name.endswith(SESSION_SUFFIX):
+            continue
+        recording = load_recording(os.path.join(corpus_dir, name))
+        replays = [replay_session(recording) for _ in range(max(1, runs))]
+        seconds = min(replay["phases"]["play"] for replay in replays)
+        baseline_seconds = baseline.get(name)
+        results.append({"name": name, "matched": all(replay["matched"] for replay in replays),
+                        "seconds": seconds, "baseline": baseline_seconds,
+                        "regressed": baseline_seconds is not None and seconds > baseline_seconds * (1 + threshold)})
+    return results
+
+def format_replay(replay: Dict[str, Any], slowest: int = 5) -> str:
+    """Formats a replay result: the verdict, phase timings and the slowest prompts."""
+    lines = [f"Output {'matches' if replay['matched'] else 'DIFFERS from'} the recording "
+             f"({replay['actions']} actions).",
+             "Phases: " + ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in replay["phases"].items())]
+    prompts = sorted(replay["prompt_seconds"].items(), key=lambda item: item[1], reverse=True)[:slowest]
+    for prompt, seconds in prompts:
+        lines.append(f"  {seconds * 1000:8.1f} ms  {prompt}")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Record and replay AFK Quest sessions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Play a session and record it")
+    record_parser.add_argument("output", help="Recording file to write")
+    record_parser.add_argument("--seed", type=int, default=None, help="Random seed (default: random)")
+    record_parser.add_argument("--script", metavar="FILE",
+                               help="Answer prompts from FILE (one per line) instead of the keyboard, with no pauses")
+    record_parser.add_argument("--save-file", default=game.file_manager.DEFAULT_SAVE_FILENAME,
+                               help=f"Character save file (default: {game.file_manager.DEFAULT_SAVE_FILENAME})")
+    replay_parser = commands.add_parser("replay", help="Replay a recording and time it")
+    replay_parser.add_argument("recording", help="Recording file to replay")
+    check_parser = commands.add_parser("check", help="Replay a corpus of recordings against a timing baseline")
+    check_parser.add_argument("corpus", help=f"Directory of {SESSION_SUFFIX} files")
+    check_parser.add_argument("--baseline", required=True, help="Baseline timings (JSON: recording name -> seconds)")
+    check_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                              help=f"Allowed slowdown as a fraction (default: {DEFAULT_THRESHOLD})")
+    check_parser.add_argument("--runs", type=int, default=3, help="Replays per recording, best time kept (default: 3)")
+    check_parser.add_argument("--update-baseline", action="store_true", help="Write the new timings to the baseline")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        game.save_filepath = args.save_file
+        if args.script:
+            with open(args.script, "r", encoding="utf-8") as f:
+                read_line = game.ScriptedInput(f.read().splitlines())
+            recording = record_session(args.output, args.seed, read_line, paced=False)
+        else:
+            recording = record_session(args.output, args.seed)
+        print(f"Recorded {len(recording['inputs'])} inputs (seed {recording['seed']}) to {args.output}.")
+        return 0
+
+    if args.command == "replay":
+        replay = replay_session(load_recording(args.recording))
+        print(format_replay(replay))
+        return 0 if replay["matched"] else 1
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    results = check_corpus(args.corpus, baseline, args.threshold, args.runs)
+    failed = False
+    for result in results:
+        if not result["matched"]:
+            verdict, failed = "OUTPUT DIFFERS", True
+        elif result["regressed"]:
+            verdict, failed = "SLOWER", True
+        elif result["baseline"] is None:
+            verdict = "new"
+        else:
+            verdict = "ok"
+        base = f"{result['baseline'] * 1000:.1f} ms" if result["baseline"] is not None else "-"
+        print(f"{result['name']}: {result['seconds'] * 1000:.1f} ms (baseline {base}) {verdict}")
+    if args.update_baseline:
+        baseline.update({result["name"]: result["seconds"] for result in results if result["matched"]})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Baseline written to {args.baseline}.")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
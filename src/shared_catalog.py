@@ -0,0 +1,163 @@
+import struct
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence
+from .enemy_manager import EnemyManager, get_difficulty_band # Relative import
+from .item import LootTable
+
+# Fixed-layout enemy table in a shared memory block (little-endian):
+#   header:     8s magic, Q row count, Q band count, Q name width (bytes)
+#   band table: band count x (q band, Q first row, Q end row)
+#   rows:       row count x (name padded with NUL to name width, q hp, q attack_stat,
+#               q loot_gold_min, q loot_gold_max), grouped by difficulty band
+TABLE_MAGIC = b"AFKSHM01"
+_HEADER = struct.Struct("<8sQQQ")
+_BAND_ENTRY = struct.Struct("<qQQ")
+
+def _row_struct(name_width: int) -> struct.Struct:
+    """Returns the row layout for a table whose names are name_width bytes wide."""
+    return struct.Struct(f"<{name_width}sqqqq")
+
+
+class SharedEnemyCatalog:
+    """
+    A read-only, list-like enemy template table stored in multiprocessing shared memory.
+
+    The parent process publishes the loaded templates once with publish_enemy_catalog();
+    worker processes attach by name with SharedEnemyCatalog.attach() and read rows straight
+    out of the shared block, without touching the network or parsing CSV. It can be passed
+    to EnemyManager anywhere a list of enemy templates is accepted.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """
+        Wraps an existing shared memory block. Use publish_enemy_catalog() or attach() instead.
+
+        Args:
+            shm (SharedMemory): The block holding the table.
+            owner (bool): True for the publishing process, which is responsible for unlink().
+        """
+        self._shm = shm
+        self.owner = owner
+        magic, self._row_count, band_count, name_width = _HEADER.unpack_from(shm.buf, 0)
+        if magic != TABLE_MAGIC:
+            raise ValueError(f"Shared memory block {shm.name} does not contain an enemy catalog.")
+        self._difficulty_index: Dict[int, range] = {}
+        for i in range(band_count):
+            band, first_row, end_row = _BAND_ENTRY.unpack_from(shm.buf, _HEADER.size + i * _BAND_ENTRY.size)
+            self._difficulty_index[band] = range(first_row, end_row)
+        self._row = _row_struct(name_width)
+        self._rows_start = _HEADER.size + band_count * _BAND_ENTRY.size
+
+    @property
+    def name(self) -> str:
+        """The shared memory block name workers pass to attach()."""
+        return self._shm.name
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedEnemyCatalog':
+        """
+        Attaches to a table published by another process.
+
+        Args:
+            name (str): The name of the published block (SharedEnemyCatalog.name).
+        """
+        # Workers started by multiprocessing share the publisher's resource tracker, so the
+        # block stays registered once and is only freed by the publisher's unlink().
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        """Decodes and returns the enemy template at position (in band order)."""
+        if position < 0:
+            position += self._row_count
+        if not 0 <= position < self._row_count:
+            raise IndexError("enemy catalog index out of range")
+        name, hp, attack_stat, loot_gold_min, loot_gold_max = self._row.unpack_from(
+            self._shm.buf, self._rows_start + position * self._row.size)
+        return {
+            "name": name.rstrip(b"\0").decode("utf-8"),
+            "hp": hp,
+            "attack_stat": attack_stat,
+            "loot_gold_min": loot_gold_min,
+            "loot_gold_max": loot_gold_max,
+        }
+
+    def __iter__(self):
+        for position in range(self._row_count):
+            yield self[position]
+
+    def get_difficulty_index(self) -> Dict[int, range]:
+        """Returns difficulty band -> range of table positions, read from the band table."""
+        return dict(self._difficulty_index)
+
+    def close(self):
+        """Detaches this process from the shared block."""
+        self._shm.close()
+
+    def unlink(self):
+        """Frees the shared block. Only the publishing process should call this, after workers finish."""
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SharedEnemyCatalog':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def publish_enemy_catalog(enemy_templates: Sequence[Dict[str, Any]], name: Optional[str] = None) -> SharedEnemyCatalog:
+    """
+    Copies enemy templates (e.g. from DataLoader.load_enemy_definitions) into a new shared memory table.
+
+    Args:
+        enemy_templates (Sequence[Dict[str, Any]]): The templates to publish.
+        name (Optional[str]): Block name to use. A unique name is generated if omitted.
+
+    Returns:
+        SharedEnemyCatalog: The owning handle. Close and unlink it (or use it as a
+                            context manager) once all workers are done.
+    """
+    rows_by_band: Dict[int, List[tuple]] = {}
+    name_width = 1
+    row_count = 0
+    for template in enemy_templates:
+        encoded_name = template["name"].encode("utf-8")
+        name_width = max(name_width, len(encoded_name))
+        rows_by_band.setdefault(get_difficulty_band(template), []).append((encoded_name, template))
+        row_count += 1
+
+    row = _row_struct(name_width)
+    rows_start = _HEADER.size + len(rows_by_band) * _BAND_ENTRY.size
+    shm = shared_memory.SharedMemory(name=name, create=True, size=rows_start + row_count * row.size)
+    try:
+        _HEADER.pack_into(shm.buf, 0, TABLE_MAGIC, row_count, len(rows_by_band), name_width)
+        position = 0
+        for i, band in enumerate(sorted(rows_by_band)):
+            _BAND_ENTRY.pack_into(shm.buf, _HEADER.size + i * _BAND_ENTRY.size,
+                                  band, position, position + len(rows_by_band[band]))
+            for encoded_name, template in rows_by_band[band]:
+                row.pack_into(shm.buf, rows_start + position * row.size, encoded_name,
+                              template["hp"], template["attack_stat"],
+                              template["loot_gold_min"], template["loot_gold_max"])
+                position += 1
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    return SharedEnemyCatalog(shm, owner=True)
+
+def attach_enemy_manager(name: str, loot_tables: Optional[Dict[str, LootTable]] = None) -> EnemyManager:
+    """
+    Creates an EnemyManager in a worker process backed by a published shared table.
+    Intended for use in a multiprocessing Pool initializer.
+
+    Args:
+        name (str): The name of the published block (SharedEnemyCatalog.name).
+        loot_tables (Optional[Dict[str, LootTable]]): Enemy name -> the items it can drop. They are
+            small, so they are passed to each worker (e.g. in initargs) rather than shared. Without
+            them the worker's enemies drop no items.
+    """
+    return EnemyManager(enemy_templates=SharedEnemyCatalog.attach(name), loot_tables=loot_tables)
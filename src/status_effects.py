@@ -0,0 +1,174 @@
+"""
+Status effects for combat (regeneration, damage over time, attack buffs), scheduled on a
+hierarchical timer wheel so each tick (combat round) only touches the effects that fire on it.
+"""
+from typing import Any, List, Optional, Tuple
+
+REGEN = "regen" # Heals amount every period ticks
+DAMAGE_OVER_TIME = "damage" # Deals amount every period ticks
+ATTACK_BUFF = "attack_buff" # Adds amount to the target's attack_bonus until it expires
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel: level 0 has one slot per tick, each higher level has one slot per
+    full turn of the level below. A timer is stored at the highest level where its due tick still
+    differs from the current tick, and moves down a level each time that level's slot comes up,
+    so scheduling is O(1) and each timer is moved at most once per level.
+    """
+    def __init__(self, slot_bits: int = 6, levels: int = 4):
+        """
+        Args:
+            slot_bits (int): log2 of the slots per level (6 gives 64 slots).
+            levels (int): Number of levels. Timers further ahead than 2**(slot_bits*levels)
+                          ticks wait in an overflow list.
+        """
+        self.slot_bits = slot_bits
+        self.levels = levels
+        self._mask = (1 << slot_bits) - 1
+        self._wheels: List[List[list]] = [[[] for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self._overflow: list = []
+        self.now = 0
+        self.pending = 0 # Timers scheduled and not yet due
+
+    def schedule(self, due_tick: int, item: Any):
+        """Schedules item to be returned by advance() at due_tick (at the next tick if already past)."""
+        self.pending += 1
+        self._insert(max(due_tick, self.now + 1), item)
+
+    def _insert(self, due_tick: int, item: Any):
+        # Timers cascading into the current tick (due_tick == now) go to level 0
+        level = max(0, (due_tick ^ self.now).bit_length() - 1) // self.slot_bits
+        if level >= self.levels:
+            self._overflow.append((due_tick, item))
+        else:
+            self._wheels[level][(due_tick >> (self.slot_bits * level)) & self._mask].append((due_tick, item))
+
+    def advance(self) -> List[Any]:
+        """Moves to the next tick and returns the items due on it, in scheduling order."""
+        self.now += 1
+        now = self.now
+        if now & ((1 << (self.slot_bits * self.levels)) - 1) == 0 and self._overflow:
+            overflow, self._overflow = self._overflow, []
+            for due_tick, item in overflow:
+                self._insert(due_tick, item)
+        # Cascade from the top, so timers moving down can land in a slot that cascades next
+        for level in range(self.levels - 1, 0, -1):
+            if now & ((1 << (self.slot_bits * level)) - 1) == 0:
+                slot = (now >> (self.slot_bits * level)) & self._mask
+                bucket = self._wheels[level][slot]
+                if bucket:
+                    self._wheels[level][slot] = []
+                    for due_tick, item in bucket:
+                        self._insert(due_tick, item)
+        slot = now & self._mask
+        bucket = self._wheels[0][slot]
+        if not bucket:
+            return []
+        self._wheels[0][slot] = []
+        self.pending -= len(bucket)
+        return [item for _, item in bucket]
+
+class StatusEffect:
+    """
+    One effect on one combatant (a Character or an Enemy).
+    """
+    def __init__(self, name: str, kind: str, target, amount: int, period: int = 1,
+                 duration: Optional[int] = None):
+        """
+        Args:
+            name (str): Shown in combat messages (e.g. "Regeneration").
+            kind (str): REGEN, DAMAGE_OVER_TIME or ATTACK_BUFF.
+            target: The Character or Enemy affected.
+            amount (int): HP healed or damage dealt per firing, or the attack bonus.
+            period (int): Ticks between firings (REGEN and DAMAGE_OVER_TIME).
+            duration (Optional[int]): Ticks the effect lasts. None lasts until removed (or the
+                                      target dies); ATTACK_BUFF requires a duration.
+        """
+        if kind not in (REGEN, DAMAGE_OVER_TIME, ATTACK_BUFF):
+            raise ValueError(f"Unknown status effect kind '{kind}'.")
+        if period < 1:
+            raise ValueError("Status effect period must be at least 1 tick.")
+        if kind == ATTACK_BUFF and duration is None:
+            raise ValueError("Attack buffs need a duration.")
+        self.name = name
+        self.kind = kind
+        self.target = target
+        self.amount = amount
+        self.period = period
+        self.duration = duration
+        self.expires_at: Optional[int] = None # Set by StatusEffectEngine.add
+        self.active = False
+
+class StatusEffectEngine:
+    """
+    Runs status effects tick by tick. Each effect is a timer on a TimerWheel, rescheduled after
+    it fires, so a tick costs time proportional to the effects firing on it, not to all effects.
+    Removed effects and effects on dead targets are dropped lazily when their timer comes up.
+    """
+    def __init__(self, wheel: Optional[TimerWheel] = None):
+        self.wheel = wheel if wheel is not None else TimerWheel()
+        self.active_count = 0
+
+    @property
+    def now(self) -> int:
+        """The current tick."""
+        return self.wheel.now
+
+    def add(self, effect: StatusEffect) -> StatusEffect:
+        """Starts an effect. Attack buffs apply immediately; periodic effects first fire after one period."""
+        effect.active = True
+        self.active_count += 1
+        if effect.duration is not None:
+            effect.expires_at = self.now + effect.duration
+        if effect.kind == ATTACK_BUFF:
+            effect.target.attack_bonus += effect.amount
+            self.wheel.schedule(effect.expires_at, effect)
+        else:
+            self.wheel.schedule(self.now + effect.period, effect)
+        return effect
+
+    def remove(self, effect: StatusEffect):
+        """Ends an effect early. Its timer is discarded when it comes up."""
+        if not effect.active:
+            return
+        effect.active = False
+        self.active_count -= 1
+        if effect.kind == ATTACK_BUFF:
+            effect.target.attack_bonus -= effect.amount
+
+    def tick(self) -> List[Tuple[StatusEffect, str]]:
+        """
+        Advances one tick and applies the effects due on it.
+
+        Returns:
+            List[Tuple[StatusEffect, str]]: Each effect that fired or wore off, with a message.
+        """
+        fired = []
+        for effect in self.wheel.advance():
+            if not effect.active:
+                continue
+            target = effect.target
+            if target.is_dead:
+                self.remove(effect)
+                continue
+            if effect.kind == ATTACK_BUFF:
+                self.remove(effect)
+                fired.append((effect, f"{target.name}'s {effect.name} wears off."))
+                continue
+
+            if effect.kind == REGEN:
+                message = target.heal(effect.amount)
+            else:
+                hp_before = target.current_hp
+                message = target.take_damage(effect.amount) or (
+                    f"{target.name} takes {hp_before - target.current_hp} damage. "
+                    f"{target.current_hp}/{target.max_hp} HP remaining.")
+            if message:
+                fired.append((effect, f"{effect.name}: {message}"))
+
+            next_tick = self.now + effect.period
+            if target.is_dead or (effect.expires_at is not None and next_tick > effect.expires_at):
+                self.remove(effect)
+            else:
+                self.wheel.schedule(next_tick, effect)
+        return fired
@@ -0,0 +1,175 @@
+"""
+Lightweight tracing: timed spans around data loading, persistence and combat, exported as
+Chrome trace-event JSON (open it in chrome://tracing or https://ui.perfetto.dev).
+
+Spans are opened with the span() context manager or the traced() decorator and nest naturally.
+Sampling is decided once per top-level span: if it is sampled, every span inside it is
+recorded too, so a sampled trace is always complete. With a sample rate of 0 (the default)
+a span costs one comparison. Set the AFK_QUEST_TRACE environment variable to a sample rate
+(e.g. 1 or 0.05) to trace from import time, e.g. in tools that import the game modules directly.
+"""
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_MAX_EVENTS = 100_000 # Oldest spans are dropped beyond this, so tracing can stay on
+
+# Whether the trace the current code runs in is being recorded (None outside any span)
+_sampled: contextvars.ContextVar = contextvars.ContextVar("afk_quest_trace_sampled", default=None)
+
+class _NullSpan:
+    """Returned by span() while tracing is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, key: str, value: Any):
+        """Does nothing (see _Span.set)."""
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """
+    Collects finished spans as Chrome "complete" events (ph "X", times in microseconds).
+    """
+    def __init__(self, sample_rate: float = 0.0, max_events: int = DEFAULT_MAX_EVENTS):
+        """
+        Args:
+            sample_rate (float): Fraction of top-level spans to record, from 0 (off) to 1 (all).
+            max_events (int): Spans kept in memory; the oldest are dropped first.
+        """
+        self.sample_rate = 0.0
+        self.configure(sample_rate)
+        self.events: deque = deque(maxlen=max_events)
+        self._thread_names: Dict[int, str] = {}
+        self._start_ns = time.perf_counter_ns()
+        self._random = random.Random() # Own stream, so sampling never disturbs game rolls
+
+    def configure(self, sample_rate: float):
+        """Sets the sample rate (0 turns tracing off)."""
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Trace sample rate must be between 0 and 1.")
+        self.sample_rate = sample_rate
+
+    def _should_sample(self) -> bool:
+        return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+
+    def span(self, name: str, category: str = "game", **args: Any):
+        """Returns a context manager that records the time spent inside it as a span."""
+        if self.sample_rate <= 0.0:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def _record(self, name: str, category: str, start_ns: int, end_ns: int, args: Dict[str, Any]):
+        thread = threading.current_thread()
+        self._thread_names.setdefault(thread.ident, thread.name)
+        event = {"name": name, "cat": category, "ph": "X", "ts": (start_ns - self._start_ns) / 1000,
+                 "dur": (end_ns - start_ns) / 1000, "pid": os.getpid(), "tid": thread.ident}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def clear(self):
+        """Drops every recorded span."""
+        self.events.clear()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Returns the recorded spans as a Chrome trace-event document."""
+        pid = os.getpid()
+        metadata = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+                    for tid, thread_name in self._thread_names.items()]
+        return {"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, filepath: str):
+        """Writes the recorded spans to filepath as Chrome trace-event JSON."""
+        try:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(self.to_chrome_trace(), f)
+        except OSError as e:
+            print(f"Error writing trace to {filepath}: {e}")
+
+class _Span:
+    """An open span (see Tracer.span)."""
+    __slots__ = ("tracer", "name", "category", "args", "sampled", "start_ns", "_token")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.sampled = False
+        self.start_ns = 0
+        self._token = None
+
+    def __enter__(self):
+        parent_sampled = _sampled.get()
+        self.sampled = self.tracer._should_sample() if parent_sampled is None else parent_sampled # pylint: disable=protected-access
+        self._token = _sampled.set(self.sampled)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end_ns = time.perf_counter_ns()
+        _sampled.reset(self._token)
+        if self.sampled:
+            if exc_type is not None:
+                self.args["error"] = exc_type.__name__
+            self.tracer._record(self.name, self.category, self.start_ns, end_ns, self.args) # pylint: disable=protected-access
+        return False
+
+    def set(self, key: str, value: Any):
+        """Attaches a detail to the span (shown under "args" in trace viewers)."""
+        self.args[key] = value
+
+def _rate_from_environment() -> float:
+    try:
+        return min(1.0, max(0.0, float(os.environ.get("AFK_QUEST_TRACE", "0") or 0)))
+    except ValueError:
+        return 0.0
+
+_tracer = Tracer(_rate_from_environment())
+
+def get_tracer() -> Tracer:
+    """Returns the game's tracer."""
+    return _tracer
+
+def configure(sample_rate: float):
+    """Sets the game tracer's sample rate (0 turns tracing off)."""
+    _tracer.configure(sample_rate)
+
+def span(name: str, category: str = "game", **args: Any):
+    """Opens a span on the game tracer: with tracing.span("fetch", "data", url=url): ..."""
+    if _tracer.sample_rate <= 0.0:
+        return _NULL_SPAN
+    return _Span(_tracer, name, category, args)
+
+def traced(name: Optional[str] = None, category: str = "game") -> Callable:
+    """Decorator: records each call of the function as a span (named after the function by default)."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer.sample_rate <= 0.0:
+                return func(*args, **kwargs)
+            with _Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def export_chrome_trace(filepath: str):
+    """Writes the game tracer's spans to filepath as Chrome trace-event JSON."""
+    _tracer.export_chrome_trace(filepath)
+
+def get_events() -> List[Dict[str, Any]]:
+    """Returns the spans recorded so far (oldest first)."""
+    return list(_tracer.events)
@@ -0,0 +1,10 @@
+import pytest
+from src import clock
+
+@pytest.fixture(autouse=True)
+def virtual_clock():
+    """Runs every test on a virtual clock, so combat pacing and other waits take no real time."""
+    test_clock = clock.VirtualClock()
+    previous = clock.set_clock(test_clock)
+    yield test_clock
+    clock.set_clock(previous)
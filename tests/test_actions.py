@@ -0,0 +1,73 @@
+import pytest
+from src import actions
+from src.character import Character
+from src.enemy_manager import EnemyManager
+
+RAT = {"name": "Rat", "hp": 2, "attack_stat": 0, "loot_gold_min": 1, "loot_gold_max": 1}
+
+
+def drive(steps, answers, fight_outcome="player_won"):
+    """Runs actions with scripted answers. Returns (requests seen, return value)."""
+    answers = iter(answers)
+    requests, answer = [], None
+    while True:
+        try:
+            request = steps.send(answer)
+        except StopIteration as stop:
+            return requests, stop.value
+        requests.append(request)
+        if isinstance(request, actions.Ask):
+            answer = next(answers)
+        elif isinstance(request, actions.Fight):
+            answer = fight_outcome
+        else:
+            answer = None
+
+
+def shown(requests):
+    return [request.text for request in requests if isinstance(request, actions.Show)]
+
+
+class TestMenu:
+    def test_dead_characters_only_get_menu_actions(self):
+        assert actions.get_action_choices(True) == ["1", "2", "3", "4", "5", "6", "S", "L", "Q"]
+        assert actions.get_action_choices(False) == ["S", "L", "Q"]
+        assert "5. Look for a Fight" not in actions.format_action_menu(False)
+
+    def test_quit_label_can_be_replaced(self):
+        menu = actions.format_action_menu(True, quit_label="Save and Quit")
+        assert "Q. Save and Quit\n" in menu
+        assert "Main Menu" not in menu
+
+    def test_choose_action_asks_until_valid(self):
+        requests, choice = drive(actions.choose_action(False), ["5", "x", "s"])
+        assert choice == "S"
+        assert shown(requests).count("Invalid action. Please try again.") == 2
+
+
+class TestActions:
+    def test_int_input_asks_until_a_number(self):
+        character = Character(name="Hero")
+        requests, _ = drive(actions.perform_action("4", character, EnemyManager), ["lots", "12"])
+        assert shown(requests) == ["Invalid input. Please enter a number."]
+        assert character.gold == 12
+
+    def test_fight_is_requested_from_the_front_end(self):
+        character = Character(name="Hero")
+        requests, _ = drive(actions.perform_action("5", character, lambda: EnemyManager([RAT])), [])
+        fight = next(request for request in requests if isinstance(request, actions.Fight))
+        assert fight.player is character and fight.enemy.name == "Rat"
+        assert shown(requests) == ["\n--- Combat Over ---", "You were victorious!"]
+
+    def test_enemy_data_is_only_loaded_for_a_fight(self):
+        def get_enemy_manager():
+            raise AssertionError("enemy data loaded")
+        drive(actions.perform_action("1", Character(name="Hero"), get_enemy_manager), ["5"])
+
+    def test_play_actions_runs_until_quit(self):
+        character = Character(name="Hero")
+        requests, choice = drive(actions.play_actions(character, EnemyManager), ["2", "100", "1", "S", "Q"])
+        assert choice == "Q"
+        assert character.is_dead
+        assert "\nAlas, Hero has perished." in shown(requests)
+        assert len([request for request in requests if isinstance(request, actions.Ask)]) == 5
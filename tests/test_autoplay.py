@@ -0,0 +1,78 @@
+import io
+import pytest
+from src.autoplay import (ACTION_FIGHT, ACTION_REST, AlwaysFight, AutoPlayer, Policy, RestBelow,
+                          parse_policy)
+from src.character import Character
+from src.enemy_manager import EnemyManager
+
+@pytest.fixture
+def enemy_manager():
+    return EnemyManager([
+        {"name": "Rat", "hp": 5, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 1},
+        {"name": "Wolf", "hp": 10, "attack_stat": 3, "loot_gold_min": 2, "loot_gold_max": 4},
+    ])
+
+class TestPolicies:
+    def test_always_fight(self):
+        assert AlwaysFight().choose_action(Character(name="Hero", current_hp=1)) == ACTION_FIGHT
+
+    def test_rest_below_rests_until_full(self):
+        policy = RestBelow(0.5)
+        hero = Character(name="Hero") # 15 max HP
+        hero.current_hp = 8
+        assert policy.choose_action(hero) == ACTION_FIGHT
+        hero.current_hp = 7
+        assert policy.choose_action(hero) == ACTION_REST
+        hero.current_hp = 14
+        assert policy.choose_action(hero) == ACTION_REST # Keeps resting until full
+        hero.current_hp = 15
+        assert policy.choose_action(hero) == ACTION_FIGHT
+
+    def test_policy_must_choose_actions(self):
+        class NoChoice(Policy):
+            pass
+        with pytest.raises(TypeError):
+            NoChoice()
+
+    def test_parse_policy(self):
+        assert isinstance(parse_policy("fight"), AlwaysFight)
+        policy = parse_policy("rest:40@5")
+        assert isinstance(policy, RestBelow)
+        assert policy.threshold == 0.4
+        assert policy.difficulty_band == 5
+        assert policy.describe() == "rest:40@band5"
+        with pytest.raises(ValueError):
+            parse_policy("flee")
+
+
+class TestAutoPlayer:
+    def test_runs_until_fight_limit(self, enemy_manager):
+        hero = Character(name="Hero", level=20, base_attack_stat=3)
+        output = io.StringIO()
+        stats = AutoPlayer(hero, enemy_manager, RestBelow(0.5), output=output).run(max_fights=200)
+        assert stats["fights"] == 200
+        assert stats["wins"] + stats["losses"] == 200
+        assert hero.gold == stats["gold"]
+        assert stats["game_seconds"] > 0
+        assert "fights 200" in output.getvalue() # Final status line
+
+    def test_per_fight_messages_are_suppressed(self, enemy_manager, capsys):
+        hero = Character(name="Hero", level=20, base_attack_stat=3)
+        AutoPlayer(hero, enemy_manager, RestBelow(0.5), status_interval=0).run(max_fights=50)
+        assert capsys.readouterr().out == ""
+
+    def test_stops_when_character_dies(self, enemy_manager):
+        hero = Character(name="Hero", current_hp=1)
+        output = io.StringIO()
+        stats = AutoPlayer(hero, enemy_manager, AlwaysFight(), output=output).run(max_fights=10000)
+        assert hero.is_dead
+        assert stats["losses"] == 1
+        assert "has perished while AFK" in output.getvalue()
+
+    def test_resting_heals(self, enemy_manager):
+        hero = Character(name="Hero")
+        hero.current_hp = 2
+        player = AutoPlayer(hero, enemy_manager, RestBelow(0.5), status_interval=0)
+        assert player.step() == ACTION_REST
+        assert hero.current_hp == 3
+        assert player.stats["rests"] == 1
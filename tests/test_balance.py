@@ -0,0 +1,62 @@
+import os
+import pytest
+from unittest.mock import patch
+from src import balance
+from src.item import Item, LootTable
+
+@pytest.fixture
+def sample_enemy_templates():
+    return [
+        {"name": "Rat", "hp": 5, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 1},
+        {"name": "Ogre", "hp": 50, "attack_stat": 10, "loot_gold_min": 5, "loot_gold_max": 10},
+    ]
+
+class TestBalance:
+    def test_parse_int_list(self):
+        assert balance.parse_int_list("1-3,10,2") == [1, 2, 3, 10]
+
+    def test_sweep_cell_reports_every_template(self, sample_enemy_templates):
+        rows = balance.sweep_cell(level=5, attack=3, fights=50, seed=1, enemy_templates=sample_enemy_templates)
+        assert [row["enemy"] for row in rows] == ["Rat", "Ogre"]
+        rat, ogre = rows
+        assert rat["win_rate"] > ogre["win_rate"]
+        assert rat["xp_per_fight"] == pytest.approx(rat["win_rate"] * (5 // 2), abs=0.01)
+        assert 0 <= rat["gold_per_fight"] <= 1
+
+    def test_sweep_cell_is_deterministic(self, sample_enemy_templates):
+        first = balance.sweep_cell(3, 2, 30, seed=7, enemy_templates=sample_enemy_templates)
+        second = balance.sweep_cell(3, 2, 30, seed=7, enemy_templates=sample_enemy_templates)
+        assert first == second
+
+    def test_run_sweep_uses_cache(self, sample_enemy_templates, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        rows = balance.run_sweep(sample_enemy_templates, [1, 2], [1], fights=10, workers=1, cache_dir=cache_dir)
+        assert len(rows) == 4
+
+        with patch('src.balance.ProcessPoolExecutor') as mock_pool:
+            cached_rows = balance.run_sweep(sample_enemy_templates, [1, 2], [1], fights=10, workers=1, cache_dir=cache_dir)
+        mock_pool.assert_not_called()
+        assert cached_rows == rows
+
+    def test_cache_key_changes_with_data(self, sample_enemy_templates):
+        key = balance.get_cache_key(sample_enemy_templates, [1], [1], 10, 0)
+        sample_enemy_templates[0]["hp"] = 6
+        assert balance.get_cache_key(sample_enemy_templates, [1], [1], 10, 0) != key
+
+    def test_cache_key_changes_with_loot_tables(self, sample_enemy_templates):
+        dagger = Item("Dagger", "weapon", 3, attack_bonus=1)
+        key = balance.get_cache_key(sample_enemy_templates, [1], [1], 10, 0)
+        with_loot = balance.get_cache_key(sample_enemy_templates, [1], [1], 10, 0, {"Rat": LootTable([(dagger, 0.5)])})
+        more_loot = balance.get_cache_key(sample_enemy_templates, [1], [1], 10, 0, {"Rat": LootTable([(dagger, 0.6)])})
+        assert len({key, with_loot, more_loot}) == 3
+
+    def test_cache_key_covers_every_rules_module(self):
+        sources = {os.path.basename(path) for path in balance.get_rules_sources()}
+        assert {"balance.py", "combat.py", "character.py", "enemy.py", "rng.py", "item.py", "inventory.py",
+                "status_effects.py", "combat_events.py"} <= sources
+
+    def test_sweep_cell_counts_item_drops(self, sample_enemy_templates):
+        loot_tables = {"Rat": LootTable([(Item("Rat Tail", "item", 4), 1.0)])}
+        rat, ogre = balance.sweep_cell(5, 3, 50, seed=1, enemy_templates=sample_enemy_templates, loot_tables=loot_tables)
+        assert rat["item_value_per_fight"] == pytest.approx(rat["win_rate"] * 4, abs=0.01)
+        assert ogre["item_value_per_fight"] == 0
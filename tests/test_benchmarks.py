@@ -0,0 +1,61 @@
+import json
+import os
+from benchmarks import harness
+from benchmarks.__main__ import main
+from benchmarks.cases import BENCHMARKS, make_enemy_csv
+
+
+def result(seconds):
+    return {"loops": 1, "repeats": 1, "min": seconds, "median": seconds, "max": seconds}
+
+
+class TestHarness:
+    def test_measure_reports_time_per_operation(self):
+        calls = []
+        timing = harness.measure(lambda: calls.append(1), min_time=0.001, repeats=3)
+        assert timing["repeats"] == 3
+        assert len(calls) >= timing["loops"] * 3
+        assert 0 < timing["min"] <= timing["median"] <= timing["max"]
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = {"results": {"fast": result(1.0), "slow": result(1.0)}}
+        results = {"results": {"fast": result(1.1), "slow": result(1.5), "new": result(1.0)}}
+        comparison = {row["name"]: row for row in harness.compare_results(results, baseline, threshold=0.2)}
+        assert not comparison["fast"]["regressed"]
+        assert comparison["slow"]["regressed"] and comparison["slow"]["ratio"] == 1.5
+        assert comparison["new"]["baseline"] is None and not comparison["new"]["regressed"]
+
+    def test_temp_dir_is_removed_after_measuring(self):
+        paths = []
+        def setup(temp_dir):
+            paths.append(temp_dir)
+            return lambda: open(os.path.join(temp_dir, "file.txt"), "w", encoding="utf-8").close()
+        results = harness.run_benchmarks([harness.Benchmark("files", setup, temp_dir=True)], min_time=0.001, repeats=1)
+        assert "files" in results["results"]
+        assert paths and not os.path.exists(paths[0])
+
+    def test_environment_metadata(self):
+        environment = harness.get_environment()
+        assert {"python", "platform", "cpu_count", "commit", "timestamp"} <= set(environment)
+
+
+class TestSuite:
+    def test_benchmark_names_are_unique(self):
+        names = [benchmark.name for benchmark in BENCHMARKS]
+        assert len(names) == len(set(names))
+
+    def test_enemy_csv_has_requested_rows(self):
+        assert make_enemy_csv(10).count("\n") == 11 # Header + rows
+
+    def test_main_writes_results_and_compares_with_baseline(self, tmp_path, capsys):
+        output = tmp_path / "results.json"
+        args = ["--filter", "character.take_damage", "--repeats", "1", "--min-time", "0.001"]
+        assert main(args + ["--output", str(output)]) == 0
+        results = json.loads(output.read_text(encoding="utf-8"))
+        assert list(results["results"]) == ["character.take_damage_heal"]
+
+        results["results"]["character.take_damage_heal"]["min"] = 1e-12 # An impossibly fast baseline
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(results), encoding="utf-8")
+        assert main(args + ["--output", str(output), "--baseline", str(baseline)]) == 1
+        assert "REGRESSION" in capsys.readouterr().err
@@ -1,5 +1,8 @@
+import json
 import pytest
+from unittest.mock import patch
 from src.character import Character # Assuming src is in PYTHONPATH or using a project runner
+from src.item import Item
 
 class TestCharacter:
     # ... (Other existing tests) ...
@@ -216,7 +219,8 @@ class TestCharacter:
             "current_hp": 60,
             "gold": 200,
             "equipment": equip,
-            "base_attack_stat": 1 # Added: char will have default base_attack_stat of 1
+            "base_attack_stat": 1, # Added: char will have default base_attack_stat of 1
+            "inventory": []
         }
         assert char_dict == expected_dict
 
@@ -338,3 +342,94 @@ class TestCharacter:
         char = Character.from_dict(old_data)
         assert char.base_attack_stat == 1
         assert char.get_attack_power() == 1
+
+
+class TestEquipment:
+    SWORD = Item("Sword", "weapon", 12, attack_bonus=2)
+    AXE = Item("Axe", "weapon", 20, attack_bonus=3)
+    VEST = Item("Vest", "armour", 5, damage_reduction=1)
+
+    def test_equipment_adds_to_derived_stats(self):
+        char = Character(name="Knight", base_attack_stat=2)
+        char.equip(self.SWORD)
+        char.equip(self.VEST)
+        assert char.get_attack_power() == 4
+        assert char.get_damage_reduction() == 1
+        assert char.take_damage(5) == "Knight takes 4 damage (5 incoming, 1 reduced by armour). 11/15 HP remaining."
+
+    def test_legacy_string_equipment_gives_no_bonus(self):
+        char = Character(name="Old", equipment={"weapon": "Stick", "armour": None, "item": None})
+        assert char.get_attack_power() == 1
+        assert char.get_damage_reduction() == 0
+
+    def test_cache_follows_every_change(self):
+        char = Character(name="Changing")
+        for change in [lambda: char.equip(self.SWORD),
+                       lambda: setattr(char, "attack_bonus", char.attack_bonus + 3), # What buffs do
+                       lambda: char.equipment.update(armour=self.VEST),
+                       lambda: char.equipment.__setitem__("weapon", "Stick"),
+                       lambda: setattr(char, "base_attack_stat", 5),
+                       lambda: char.gain_experience(100),
+                       lambda: setattr(char, "equipment", {"weapon": self.AXE}),
+                       lambda: char.equipment.pop("weapon")]:
+            change()
+            assert (char.get_attack_power(), char.get_damage_reduction()) == char._compute_derived_stats()
+
+    def test_stats_only_recomputed_after_a_change(self):
+        char = Character(name="Cached")
+        char.equip(self.SWORD)
+        with patch.object(char, "_compute_derived_stats", wraps=char._compute_derived_stats) as compute:
+            for _ in range(10):
+                char.get_attack_power()
+                char.get_damage_reduction()
+            assert compute.call_count == 1
+            char.attack_bonus += 1
+            assert char.get_attack_power() == 4
+            assert compute.call_count == 2
+
+    def test_equipping_over_an_item_keeps_it(self):
+        char = Character(name="Trader")
+        assert char.equip(self.SWORD) is None
+        assert char.equip(self.AXE) is self.SWORD
+        assert char.inventory.count(self.SWORD) == 1
+        assert char.equip(self.SWORD) is self.AXE # Taken back out of the inventory
+        assert self.SWORD not in char.inventory and char.inventory.count(self.AXE) == 1
+        assert char.gold == 0
+
+    def test_receive_item_equips_upgrades_and_keeps_the_rest(self, capsys):
+        char = Character(name="Looter")
+        twig = Item("Twig", "weapon", 1, attack_bonus=1)
+        char.receive_item(self.SWORD) # Empty slot
+        char.receive_item(twig)
+        assert char.equipment["weapon"] is self.SWORD
+        assert char.inventory.count(twig) == 1
+        assert "Looter puts Twig in the inventory." in capsys.readouterr().out
+        char.receive_item(self.AXE)
+        assert char.equipment["weapon"] is self.AXE
+        assert char.inventory.get_items("weapon") == [(self.SWORD, 1), (twig, 1)]
+        assert char.gold == 0
+
+    def test_best_owned_and_cash_in_worse_than_equipped(self, capsys):
+        char = Character(name="Hoarder")
+        twig = Item("Twig", "weapon", 1, attack_bonus=1)
+        char.equip(self.SWORD)
+        for item in [twig] * 100 + [self.AXE, self.VEST]:
+            char.inventory.add(item)
+        assert char.get_best_owned("weapon") is self.AXE
+        assert char.get_best_owned("item") is None
+        assert char.cash_in_worse_than_equipped() == 100 # Twigs only: the Axe is better, armour slot is empty
+        assert char.gold == 100
+        assert char.inventory.get_items() == [(self.AXE, 1), (self.VEST, 1)]
+        assert "Hoarder cashes in 100 items for 100 gold. Total: 100 gold." in capsys.readouterr().out
+
+    def test_items_survive_save_round_trip(self):
+        char = Character(name="Saved", equipment={"weapon": self.SWORD, "armour": "Rags", "item": None})
+        char.inventory.add(self.AXE, 500)
+        char.inventory.add(self.VEST)
+        data = json.loads(json.dumps(char.to_dict()))
+        assert data["inventory"] == [["Axe", "weapon", 20, 3, 0, 500], ["Vest", "armour", 5, 0, 1, 1]] # Row per kind
+        loaded = Character.from_dict(data)
+        assert loaded.equipment == {"weapon": self.SWORD, "armour": "Rags", "item": None}
+        assert loaded.get_attack_power() == 3
+        assert loaded.inventory.get_items() == char.inventory.get_items()
+        assert loaded.inventory.total_value == 10005
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from src import clock
+from src.character import Character
+from src.combat import start_combat, get_paced_duration
+from src.enemy import Enemy
+
+class TestClocks:
+    def test_virtual_clock_advances_instantly(self):
+        virtual = clock.VirtualClock(start=10.0)
+        with patch('src.clock.time.sleep', side_effect=AssertionError("slept")):
+            virtual.sleep(86400)
+        assert virtual.now() == 86410.0
+
+    def test_virtual_clock_async_sleep(self):
+        virtual = clock.VirtualClock()
+        asyncio.run(virtual.async_sleep(5))
+        assert virtual.now() == 5
+
+    def test_accelerated_clock_divides_waits(self):
+        accelerated = clock.AcceleratedClock(60)
+        with patch('src.clock.time.sleep') as mock_sleep:
+            accelerated.sleep(120)
+        mock_sleep.assert_called_once_with(2)
+
+    def test_accelerated_clock_rejects_bad_factor(self):
+        with pytest.raises(ValueError):
+            clock.AcceleratedClock(0)
+
+    def test_clock_must_implement_every_method(self):
+        class NowOnly(clock.Clock):
+            def now(self) -> float:
+                return 0.0
+        with pytest.raises(TypeError):
+            NowOnly()
+
+    def test_parse_clock(self):
+        assert isinstance(clock.parse_clock("real"), clock.RealClock)
+        assert isinstance(clock.parse_clock("virtual"), clock.VirtualClock)
+        assert clock.parse_clock("accelerated:10").factor == 10
+        with pytest.raises(ValueError):
+            clock.parse_clock("fast")
+
+    def test_set_clock_returns_previous(self, virtual_clock):
+        replacement = clock.VirtualClock()
+        assert clock.set_clock(replacement) is virtual_clock
+        assert clock.get_clock() is replacement
+
+    def test_combat_pacing_uses_game_clock(self, virtual_clock):
+        player = Character(name="Hero", base_attack_stat=100)
+        enemy = Enemy(name="Rat", max_hp=1, attack_stat=0, loot_gold_min=0, loot_gold_max=0)
+        with patch('src.combat.random.randint', return_value=1):
+            assert start_combat(player, enemy) == "player_won"
+        assert virtual_clock.now() == get_paced_duration(1, "player_won")
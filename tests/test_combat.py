@@ -1,8 +1,10 @@
+import sys
 import pytest
 from unittest.mock import patch # For mocking random.randint and input
 from src.character import Character
 from src.enemy import Enemy
-from src.combat import start_combat
+from src.combat import start_combat, simulate_combat, fast_forward_combat
+from src.status_effects import DAMAGE_OVER_TIME, StatusEffect, StatusEffectEngine
 
 class TestCombat:
     @pytest.fixture
@@ -99,3 +101,83 @@ class TestCombat:
     # Add more tests:
     # - Combat where both player and enemy damage values vary
     # - Test character leveling up during combat XP gain (if XP gain is significant)
+
+
+class TestSimulateCombat:
+    @patch('src.combat.random.randint')
+    def test_simulate_combat_win_applies_rewards(self, mock_randint, capsys):
+        mock_randint.side_effect = lambda a, b: b # Always return max of range
+        player = Character(name="Hero", level=1, base_attack_stat=5)
+        rat = Enemy(name="Rat", max_hp=5, attack_stat=1, loot_gold_min=0, loot_gold_max=1)
+
+        result = simulate_combat(player, rat)
+
+        assert result == {"outcome": "player_won", "rounds": 1, "damage_dealt": 5, "damage_taken": 0,
+                          "gold": 1, "item": None, "experience": 2}
+        assert player.gold == 1
+        assert player.current_experience == 2
+        assert "COMBAT START" not in capsys.readouterr().out # Headless
+
+    @patch('src.combat.random.randint')
+    def test_simulate_combat_loss_without_rewards(self, mock_randint):
+        player = Character(name="Hero", level=1, base_attack_stat=5) # 15 HP
+        ogre = Enemy(name="Ogre", max_hp=50, attack_stat=10, loot_gold_min=5, loot_gold_max=10)
+        mock_randint.side_effect = lambda a, b: 0 if b == 5 else b # Player misses, Ogre hits for 10
+
+        result = simulate_combat(player, ogre, apply_rewards=False)
+
+        assert result["outcome"] == "player_lost"
+        assert result["rounds"] == 2
+        assert result["damage_taken"] == 15 # Only HP actually lost is counted
+        assert player.is_dead
+
+    def test_simulate_combat_stalemate(self):
+        player = Character(name="Pacifist", base_attack_stat=0)
+        statue = Enemy(name="Statue", max_hp=5, attack_stat=0, loot_gold_min=0, loot_gold_max=0)
+        assert simulate_combat(player, statue, max_rounds=20)["outcome"] == "stalemate"
+
+class TestFastForward:
+    @patch('src.combat.random.randint')
+    @patch('builtins.input', return_value='f')
+    def test_fast_forward_resolves_fight_with_one_write(self, mock_input, mock_randint, capsys):
+        player = Character(name="Hero", level=1, base_attack_stat=5)
+        enemy = Enemy(name="Golem", max_hp=40, attack_stat=1, loot_gold_min=3, loot_gold_max=3)
+        mock_randint.side_effect = lambda a, b: 1 if b == player.get_attack_power() else (0 if b == enemy.attack_stat else b)
+
+        with patch.object(sys.stdout, 'write', wraps=sys.stdout.write) as mock_write:
+            result = start_combat(player, enemy)
+            summary_writes = [call for call in mock_write.call_args_list if "Fast-forward" in call.args[0]]
+
+        assert result == "player_won"
+        assert mock_input.call_count == 1 # Only the first round prompt was shown
+        assert len(summary_writes) == 1
+        summary = summary_writes[0].args[0]
+        assert "Combat lasted 40 rounds." in summary
+        assert "Hero dealt 40 damage and took 0 damage." in summary
+        assert "Hero loots 3 gold from Golem." in summary
+        assert "Hero gains 20 experience points!" in summary
+        assert "--- Round 2 ---" not in capsys.readouterr().out
+        assert player.gold == 3
+
+    def test_fast_forward_reports_defeat(self):
+        player = Character(name="Hero", level=1, base_attack_stat=0)
+        enemy = Enemy(name="Ogre", max_hp=50, attack_stat=10, loot_gold_min=5, loot_gold_max=10)
+        with patch('src.combat.random.randint', side_effect=lambda a, b: b):
+            outcome, summary = fast_forward_combat(player, enemy, 1, player.current_hp, enemy.current_hp)
+        assert outcome == "player_lost"
+        assert "Alas, Hero has been defeated by Ogre..." in summary
+        assert player.gold == 0
+
+    @patch('builtins.input', return_value='f')
+    def test_fast_forward_keeps_status_effects_ticking(self, mock_input):
+        player = Character(name="Hero", level=1, base_attack_stat=5)
+        enemy = Enemy(name="Golem", max_hp=40, attack_stat=1, loot_gold_min=3, loot_gold_max=3)
+        effects = StatusEffectEngine()
+        effects.add(StatusEffect("Poison", DAMAGE_OVER_TIME, enemy, amount=4))
+        with patch('src.combat.random.randint', side_effect=lambda a, b: a), patch('src.combat.sys.stdout.write') as mock_write:
+            result = start_combat(player, enemy, effects=effects)
+        summary = "".join(call.args[0] for call in mock_write.call_args_list)
+        assert result == "player_won" # Attacks all roll 0, so only the poison does damage
+        assert "Combat lasted 10 rounds." in summary
+        assert "Golem has been defeated!" in summary
+        assert player.gold == 3
@@ -0,0 +1,131 @@
+import asyncio
+import io
+import json
+import random
+import pytest
+from unittest.mock import patch
+from src import combat
+from src.character import Character
+from src.combat_events import (AttackResolved, CombatEnded, CombatStarted, JsonLinesRenderer, LogLineRenderer,
+                               NullRenderer, RoundEnded, RoundStarted, TerminalRenderer, get_renderer)
+from src.enemy import Enemy
+from src.item import Item, LootTable
+
+def make_fighters():
+    return (Character(name="Hero", level=1, base_attack_stat=5),
+            Enemy(name="Rat", max_hp=5, attack_stat=1, loot_gold_min=0, loot_gold_max=1))
+
+class TestCombatEvents:
+    def test_event_order_for_a_win(self):
+        player, enemy = make_fighters()
+        with patch('src.combat.random.randint', side_effect=lambda a, b: 3 if b == 5 else 0):
+            events = list(combat.combat_events(player, enemy))
+        assert [type(event).__name__ for event in events] == [
+            "CombatStarted", "RoundStarted", "AttackResolved", "AttackResolved", "RoundEnded",
+            "RoundStarted", "AttackResolved", "EnemyDefeated", "ExperienceGained", "CombatEnded"]
+        assert events[-1] == CombatEnded("player_won", 2, 0, 2)
+        assert player.current_experience == 2
+
+    def test_rewards_not_applied_when_disabled(self):
+        player, enemy = make_fighters()
+        with patch('src.combat.random.randint', side_effect=lambda a, b: b):
+            events = list(combat.combat_events(player, enemy, apply_rewards=False))
+        assert events[-1].gold == 1
+        assert player.gold == 0
+        assert player.current_experience == 0
+
+    def test_stalemate_ends_stream(self):
+        player = Character(name="Hero", base_attack_stat=0)
+        enemy = Enemy(name="Wall", max_hp=5, attack_stat=0, loot_gold_min=0, loot_gold_max=0)
+        events = list(combat.combat_events(player, enemy, max_rounds=3))
+        assert events[-1] == CombatEnded("stalemate", 3, 0, 0)
+
+    def test_simulate_combat_matches_event_stream(self):
+        for seed in range(20):
+            random.seed(seed)
+            player, enemy = Character(name="Hero", level=3), Enemy("Wolf", 20, 4, 1, 3)
+            expected = combat.simulate_combat(player, enemy, apply_rewards=False)
+
+            random.seed(seed)
+            player, enemy = Character(name="Hero", level=3), Enemy("Wolf", 20, 4, 1, 3)
+            events = list(combat.combat_events(player, enemy, apply_rewards=False))
+            attacks = [event for event in events if isinstance(event, AttackResolved)]
+            assert events[-1].outcome == expected["outcome"]
+            assert events[-1].rounds == expected["rounds"]
+            assert events[-1].gold == expected["gold"]
+            assert sum(a.damage for a in attacks if a.player_attacking) == expected["damage_dealt"]
+            assert sum(a.hp_lost for a in attacks if not a.player_attacking) == expected["damage_taken"]
+
+    def test_item_drop_is_reported_and_kept(self, capsys):
+        player, enemy = make_fighters()
+        player.equipment["item"] = Item("Lucky Charm", "item", 10) # Worth more, so the drop is not an upgrade
+        rat_tail = Item("Rat Tail", "item", 4)
+        enemy.loot_table = LootTable([(rat_tail, 1.0)])
+        with patch('src.combat.random.randint', side_effect=lambda a, b: b):
+            events = list(combat.combat_events(player, enemy))
+        assert [type(event).__name__ for event in events[-4:]] == [
+            "LootGained", "ItemLooted", "ExperienceGained", "CombatEnded"]
+        assert player.inventory.count(rat_tail) == 1
+        assert "Hero puts Rat Tail in the inventory." in capsys.readouterr().out
+
+    def test_simulate_combat_rolls_same_item(self):
+        table = LootTable([(Item("Fang", "item", 1), 0.3), (Item("Pelt", "item", 2), 0.3)])
+        for seed in range(20):
+            random.seed(seed)
+            expected = combat.simulate_combat(Character(name="Hero", level=3), Enemy("Wolf", 20, 4, 1, 3, loot_table=table),
+                                              apply_rewards=False)
+            random.seed(seed)
+            events = list(combat.combat_events(Character(name="Hero", level=3), Enemy("Wolf", 20, 4, 1, 3, loot_table=table),
+                                               apply_rewards=False))
+            dropped = [event.item_name for event in events if type(event).__name__ == "ItemLooted"]
+            assert dropped == ([expected["item"].name] if expected["item"] else [])
+
+    def test_async_iterator_yields_same_events(self):
+        async def collect():
+            player, enemy = make_fighters()
+            return [event async for event in combat.async_combat_events(player, enemy)]
+        with patch('src.combat.random.randint', side_effect=lambda a, b: b):
+            events = asyncio.run(collect())
+        assert isinstance(events[0], CombatStarted)
+        assert events[-1].outcome == "player_won"
+
+    def test_event_pauses_match_paced_duration(self):
+        player, enemy = make_fighters()
+        with patch('src.combat.random.randint', side_effect=lambda a, b: 3 if b == 5 else 0):
+            events = list(combat.combat_events(player, enemy))
+        assert sum(combat.get_event_pause(event) for event in events) == combat.get_paced_duration(2, "player_won")
+
+class TestRenderers:
+    def test_terminal_renderer_matches_interactive_output(self, capsys):
+        output = io.StringIO()
+        renderer = TerminalRenderer(output)
+        renderer.render(RoundStarted(2))
+        renderer.render(AttackResolved(2, True, "Hero", "Rat", 0, 0, 5, 5))
+        assert output.getvalue() == ("\n--- Round 2 ---\n"
+                                     "Hero attacks Rat but misses or the blow is ineffective!\nRat HP: 5/5\n")
+
+    def test_json_lines_renderer(self):
+        output = io.StringIO()
+        renderer = JsonLinesRenderer(output)
+        renderer.render(RoundEnded(4))
+        renderer.close()
+        assert json.loads(output.getvalue()) == {"event": "RoundEnded", "round_num": 4}
+
+    def test_log_line_renderer_summarizes_fight(self):
+        player, enemy = make_fighters()
+        output = io.StringIO()
+        with patch('src.combat.random.randint', side_effect=lambda a, b: b):
+            assert combat.start_combat(player, enemy, paced=False, renderer=LogLineRenderer(output)) == "player_won"
+        assert output.getvalue() == "Hero vs Rat: player_won in 1 rounds, dealt 5, took 0, +1 gold, +2 XP\n"
+
+    def test_null_renderer_prints_nothing(self, capsys):
+        player, enemy = make_fighters()
+        with patch('src.combat.random.randint', side_effect=lambda a, b: b):
+            combat.start_combat(player, enemy, paced=False, renderer=NullRenderer())
+        assert "COMBAT START" not in capsys.readouterr().out
+
+    def test_get_renderer(self):
+        assert isinstance(get_renderer("null"), NullRenderer)
+        assert isinstance(get_renderer("jsonl"), JsonLinesRenderer)
+        with pytest.raises(ValueError):
+            get_renderer("html")
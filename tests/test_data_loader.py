@@ -163,7 +163,7 @@ class TestDataLoader:
         captured = capsys.readouterr()
         assert "Error fetching enemy definitions from Google Sheet" in captured.out
         assert "Local fallback enemy definitions file not found" in captured.out
-        assert "Critical Warning: No enemy definitions loaded" in captured.out
+        assert "No enemy definitions loaded" in captured.out
 
     @patch('src.data_loader.os.path.exists')
     @patch('src.data_loader.configparser.ConfigParser')
@@ -189,7 +189,7 @@ class TestDataLoader:
         assert len(definitions) == 0
         captured = capsys.readouterr()
         assert "Successfully loaded 0 enemy definitions" in captured.out or \
-               "Critical Warning: No enemy definitions loaded" in captured.out
+               "No enemy definitions loaded" in captured.out
 
     @patch('src.data_loader.os.path.exists')
     @patch('src.data_loader.configparser.ConfigParser')
@@ -215,7 +215,7 @@ class TestDataLoader:
         assert len(definitions) == 1 
         assert definitions[0]["name"] == "GoodSlime"
         captured = capsys.readouterr()
-        assert "Warning: Skipping row" in captured.out
+        assert "Skipping row" in captured.out
         assert "invalid data type" in captured.out
 
     @patch('src.data_loader.os.path.exists')
@@ -241,7 +241,7 @@ class TestDataLoader:
         
         assert len(definitions) == 0
         captured = capsys.readouterr()
-        assert "Error: CSV data from" in captured.out and "is missing required headers" in captured.out
+        assert "CSV data from" in captured.out and "is missing required headers" in captured.out
 
     @patch('src.data_loader.os.path.isdir') 
     @patch('src.data_loader.os.path.exists') 
@@ -255,14 +255,14 @@ class TestDataLoader:
         captured_init = capsys.readouterr()
         
         expected_abs_config_path = os.path.abspath(str(non_existent_config_file))
-        assert f"Warning: Configuration file not found at {expected_abs_config_path}" in captured_init.out
+        assert f"Configuration file not found at {expected_abs_config_path}" in captured_init.out
 
         definitions = loader.load_enemy_definitions()
         assert len(definitions) == 0
         captured_load = capsys.readouterr()
         assert "No Google Sheet URL configured" in captured_load.out 
         assert "No local CSV fallback configured" in captured_load.out
-        assert "Critical Warning: No enemy definitions loaded" in captured_load.out
+        assert "No enemy definitions loaded" in captured_load.out
         mock_os_path_exists_for_config.assert_any_call(str(non_existent_config_file))
 
     @patch('src.data_loader.os.path.exists')
@@ -303,3 +303,82 @@ class TestDataLoader:
         assert "404 Client Error" in captured.out
         assert f"Successfully loaded 2 enemy definitions from: Local CSV ({str(fallback_csv_path)})" in captured.out
 
+
+    @patch('src.data_loader.requests.head')
+    @patch('src.data_loader.configparser.ConfigParser')
+    def test_fetch_remote_enemy_validator(self, MockConfigParserClass, mock_requests_head, temp_data_dir):
+        data_dir, mock_config_path_for_init = temp_data_dir
+        configure_mock_config_instance(MockConfigParserClass.return_value, google_url="http://fakegooglesheet.com/export.csv")
+        mock_response = MagicMock()
+        mock_response.headers = {'ETag': '"abc123"'}
+        mock_requests_head.return_value = mock_response
+
+        loader = DataLoader(data_folder_path=str(data_dir), config_filepath=str(mock_config_path_for_init))
+        assert loader.fetch_remote_enemy_validator() == '"abc123"'
+
+        mock_requests_head.side_effect = requests.exceptions.RequestException("Network Error")
+        assert loader.fetch_remote_enemy_validator() is None
+
+    @patch('src.data_loader.configparser.ConfigParser')
+    def test_fetch_remote_enemy_validator_without_url(self, MockConfigParserClass, temp_data_dir):
+        data_dir, mock_config_path_for_init = temp_data_dir
+        configure_mock_config_instance(MockConfigParserClass.return_value, google_url="")
+        loader = DataLoader(data_folder_path=str(data_dir), config_filepath=str(mock_config_path_for_init))
+        assert loader.fetch_remote_enemy_validator() is None
+        assert loader.get_local_enemy_csv_path() == os.path.join(str(data_dir), "enemies.csv")
+
+
+class TestItemDefinitions:
+    @pytest.fixture
+    def item_data(self, tmp_path):
+        """A data folder with items and loot tables, and a config.ini pointing at them."""
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        (data_dir / "items.csv").write_text(
+            "name,slot,value,attack_bonus,damage_reduction\n"
+            "Dagger,weapon,3,1,0\n"
+            "Vest,Armour,5,0,1\n"
+            "Crown,head,50,0,0\n" # Unknown slot
+            "Stick,weapon,cheap,0,0\n", encoding="utf-8")
+        (data_dir / "loot.csv").write_text(
+            "enemy,item,drop_chance\n"
+            "Goblin,Dagger,0.25\n"
+            "Goblin,Vest,0.5\n"
+            "Goblin,Crown,0.1\n" # Not a loaded item
+            "Bandit,Vest,1.5\n", encoding="utf-8") # Chance out of range
+        config_path = tmp_path / "config.ini"
+        config_path.write_text("[DataSources.Items]\ngoogle_sheet_url =\nlocal_csv_fallback = items.csv\n"
+                               "loot_tables_csv = loot.csv\n", encoding="utf-8")
+        return DataLoader(data_folder_path=str(data_dir), config_filepath=str(config_path))
+
+    def test_load_item_definitions(self, item_data, capsys):
+        items = item_data.load_item_definitions()
+        assert items == [{"name": "Dagger", "slot": "weapon", "value": 3, "attack_bonus": 1, "damage_reduction": 0},
+                         {"name": "Vest", "slot": "armour", "value": 5, "attack_bonus": 0, "damage_reduction": 1}]
+        output = capsys.readouterr().out
+        assert "Skipping row 3 with invalid numeric values" in output
+        assert "Skipping row 4 with invalid data type" in output
+
+    def test_load_loot_tables(self, item_data, capsys):
+        tables = item_data.load_loot_tables(item_data.load_item_definitions())
+        assert list(tables) == ["Goblin"]
+        assert [item.name for item in tables["Goblin"].items] == ["Dagger", "Vest"]
+        assert tables["Goblin"].cumulative_chances == [0.25, 0.75]
+        output = capsys.readouterr().out
+        assert "Loot table for Goblin names unknown item 'Crown'" in output
+        assert "Skipping row 4 with invalid numeric values" in output
+
+    def test_no_items_configured(self, tmp_path):
+        config_path = tmp_path / "config.ini"
+        config_path.write_text("[DataSources.Enemies]\nlocal_csv_fallback = enemies.csv\n", encoding="utf-8")
+        data_loader = DataLoader(data_folder_path=str(tmp_path), config_filepath=str(config_path))
+        assert data_loader.load_item_definitions() == []
+        assert data_loader.load_loot_tables([]) == {}
+
+    def test_shipped_loot_tables_name_real_items_and_enemies(self):
+        data_loader = DataLoader(data_folder_path="data", config_filepath="config.ini")
+        tables = data_loader.load_loot_tables(data_loader.load_item_definitions())
+        with open(os.path.join("data", "enemies.csv"), encoding="utf-8", newline="") as f:
+            enemy_names = {row["name"] for row in csv.DictReader(f)}
+        assert tables and set(tables) <= enemy_names
+        assert all(0 < table.drop_chance <= 1 for table in tables.values())
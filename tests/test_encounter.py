@@ -0,0 +1,94 @@
+import time
+import pytest
+from unittest.mock import patch
+from src import encounter
+from src.character import Character
+from src.combat_events import AttackResolved, EncounterStarted, EnemyDefeated
+from src.enemy import Enemy
+from src.enemy_manager import EnemyManager
+from src.rng import RandomSource
+
+def make_pack(count, speed=10, hp=2, attack_stat=0):
+    return [Enemy(name=f"Rat{i}", max_hp=hp, attack_stat=attack_stat, loot_gold_min=1, loot_gold_max=1, speed=speed)
+            for i in range(count)]
+
+class TestEncounter:
+    def test_turn_interval(self):
+        assert encounter.get_turn_interval(10) == 100
+        assert encounter.get_turn_interval(0) == encounter.TURN_LENGTH
+        assert encounter.get_turn_interval(5000) == 1
+
+    def test_player_clears_pack_and_collects_rewards(self):
+        player = Character(name="Hero", base_attack_stat=5)
+        result = encounter.simulate_encounter(player, make_pack(3))
+        assert result["outcome"] == "player_won"
+        assert result["enemies_defeated"] == 3
+        assert result["gold"] == 3
+        assert player.gold == 3
+        assert result["experience"] == 3 # 2 // 2 per Rat
+
+    def test_faster_enemies_act_more_often(self):
+        player = Character(name="Hero", level=50, base_attack_stat=0) # Cannot hurt anyone
+        slow, fast = make_pack(1, speed=5)[0], make_pack(1, speed=20)[0]
+        slow.name, fast.name = "Slow", "Fast"
+        with patch('src.combat.random.randint', return_value=0):
+            events = list(encounter.encounter_events(player, [slow, fast], max_rounds=10))
+        attackers = [event.attacker_name for event in events if isinstance(event, AttackResolved)]
+        assert attackers.count("Fast") == 4 * attackers.count("Slow")
+        assert events[-1].outcome == "stalemate"
+
+    def test_dead_enemies_are_skipped(self):
+        player = Character(name="Hero", base_attack_stat=5)
+        pack = make_pack(3)
+        pack[1].take_damage(10) # Already defeated before the fight
+        events = list(encounter.encounter_events(player, pack))
+        assert isinstance(events[0], EncounterStarted)
+        defenders = {event.defender_name for event in events if isinstance(event, AttackResolved) and event.player_attacking}
+        assert "Rat1" not in defenders
+        assert sum(isinstance(event, EnemyDefeated) for event in events) == 2
+
+    def test_player_can_be_overwhelmed(self):
+        player = Character(name="Hero", base_attack_stat=1)
+        result = encounter.simulate_encounter(player, make_pack(50, hp=100, attack_stat=5))
+        assert result["outcome"] == "player_lost"
+        assert player.is_dead
+
+    def test_large_encounter_scales(self):
+        player = Character(name="Hero", base_attack_stat=100)
+        start = time.perf_counter()
+        result = encounter.simulate_encounter(player, make_pack(300, hp=50, attack_stat=0), apply_rewards=False)
+        assert result["enemies_defeated"] == 300
+        assert time.perf_counter() - start < 5
+
+    def test_start_encounter_prints_fight(self, capsys):
+        player = Character(name="Hero", base_attack_stat=5)
+        with patch('builtins.input', return_value=''):
+            assert encounter.start_encounter(player, make_pack(2)) == "player_won"
+        output = capsys.readouterr().out
+        assert "--- ENCOUNTER START ---" in output
+        assert "Hero (HP: 15/15) vs. 2 enemies: Rat0, Rat1" in output
+
+    def test_start_encounter_is_scripted_and_seeded(self, capsys):
+        def play(seed):
+            player = Character(name="Hero", base_attack_stat=2)
+            pack = make_pack(3, speed=1, hp=40, attack_stat=1) # A few rounds long
+            prompts = []
+            with patch('builtins.input', side_effect=AssertionError("keyboard used")):
+                outcome = encounter.start_encounter(player, pack, rng=RandomSource(seed),
+                                                    input_func=lambda prompt: prompts.append(prompt) or "")
+            return outcome, prompts, capsys.readouterr().out
+        first, second = play(4), play(4)
+        assert first == second
+        assert first[1] and all(prompt.startswith("Press Enter") for prompt in first[1])
+
+class TestEnemyManagerPacks:
+    def test_get_random_enemies(self):
+        manager = EnemyManager([{"name": "Bat", "hp": 3, "attack_stat": 1, "loot_gold_min": 0,
+                                 "loot_gold_max": 0, "speed": 25}])
+        pack = manager.get_random_enemies(4)
+        assert [enemy.name for enemy in pack] == ["Bat"] * 4
+        assert all(enemy.speed == 25 for enemy in pack)
+
+    def test_get_random_enemies_empty_band(self, capsys):
+        manager = EnemyManager([{"name": "Bat", "hp": 3, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 0}])
+        assert manager.get_random_enemies(3, difficulty_band=99) == []
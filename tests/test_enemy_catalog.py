@@ -0,0 +1,63 @@
+import os
+import pytest
+from src.enemy_catalog import MappedEnemyCatalog, build_catalog_index, get_index_path
+from src.enemy_manager import EnemyManager, get_difficulty_band
+
+CATALOG_CSV_CONTENT = """name,hp,attack_stat,loot_gold_min,loot_gold_max
+Tiny Goblin,8,1,1,5
+Slime drop,1,1,0,1
+BadDragon,very_high,lots,some,many
+Wolf,10,3,0,0
+"Bandit, Leader",15,2,5,10
+"""
+
+@pytest.fixture
+def catalog_csv(tmp_path):
+    csv_path = tmp_path / "enemies.csv"
+    csv_path.write_text(CATALOG_CSV_CONTENT)
+    return str(csv_path)
+
+
+class TestMappedEnemyCatalog:
+    def test_builds_index_and_skips_invalid_rows(self, catalog_csv, capsys):
+        with MappedEnemyCatalog(catalog_csv) as catalog:
+            assert os.path.exists(get_index_path(catalog_csv))
+            assert len(catalog) == 4
+            names = {template["name"] for template in catalog}
+        assert names == {"Tiny Goblin", "Slime drop", "Wolf", "Bandit, Leader"}
+        assert "Skipped 1 invalid rows" in capsys.readouterr().out
+
+    def test_rows_decode_like_data_loader(self, catalog_csv):
+        with MappedEnemyCatalog(catalog_csv) as catalog:
+            wolf = next(template for template in catalog if template["name"] == "Wolf")
+            assert wolf == {"name": "Wolf", "hp": 10, "attack_stat": 3, "loot_gold_min": 0, "loot_gold_max": 0}
+            assert catalog[-1] == catalog[len(catalog) - 1]
+            with pytest.raises(IndexError):
+                catalog[len(catalog)]
+
+    def test_difficulty_index_groups_rows_by_band(self, catalog_csv):
+        with MappedEnemyCatalog(catalog_csv) as catalog:
+            for band, positions in catalog.get_difficulty_index().items():
+                assert all(get_difficulty_band(catalog[position]) == band for position in positions)
+
+    def test_stale_index_is_rebuilt(self, catalog_csv):
+        build_catalog_index(catalog_csv)
+        with open(catalog_csv, 'a') as f:
+            f.write("Ogre,50,8,10,20\n")
+        with pytest.raises(ValueError):
+            MappedEnemyCatalog(catalog_csv, rebuild_stale_index=False)
+        with MappedEnemyCatalog(catalog_csv) as catalog:
+            assert len(catalog) == 5
+
+    def test_missing_headers_raise(self, tmp_path):
+        csv_path = tmp_path / "bad.csv"
+        csv_path.write_text("name,hp\nGoblin,5\n")
+        with pytest.raises(ValueError):
+            build_catalog_index(str(csv_path))
+
+    def test_enemy_manager_spawns_from_catalog(self, catalog_csv):
+        with MappedEnemyCatalog(catalog_csv) as catalog:
+            manager = EnemyManager(enemy_templates=catalog)
+            assert manager.get_random_enemy().name in {"Tiny Goblin", "Slime drop", "Wolf", "Bandit, Leader"}
+            wolf_band = get_difficulty_band({"hp": 10, "attack_stat": 3})
+            assert manager.get_random_enemy(difficulty_band=wolf_band).name in {"Wolf", "Bandit, Leader"}
@@ -1,5 +1,5 @@
 import pytest
-from src.enemy_manager import EnemyManager
+from src.enemy_manager import EnemyManager, get_difficulty_band
 from src.enemy import Enemy
 
 @pytest.fixture
@@ -34,7 +34,7 @@ class TestEnemyManager:
         enemy = manager.get_random_enemy()
         assert enemy is None
         captured = capsys.readouterr()
-        assert "Error: No enemy templates available" in captured.out
+        assert "No enemy templates available" in captured.out
 
     def test_get_random_enemy_malformed_template(self, malformed_template, capsys):
         # This test assumes random.choice picks the malformed one.
@@ -43,10 +43,36 @@ class TestEnemyManager:
         enemy = manager.get_random_enemy()
         assert enemy is None # Should fail to instantiate
         captured = capsys.readouterr()
-        assert "Error: Enemy template is missing a required key" in captured.out
+        assert "Enemy template is missing a required key" in captured.out
 
     def test_enemy_manager_creation_no_templates_warning(self, empty_templates, capsys):
         manager = EnemyManager(enemy_templates=empty_templates)
         captured = capsys.readouterr()
-        assert "Warning: EnemyManager initialized with no enemy templates." in captured.out
+        assert "EnemyManager initialized with no enemy templates." in captured.out
 
+
+    def test_replace_templates_swaps_future_spawns(self, sample_enemy_templates):
+        manager = EnemyManager(enemy_templates=sample_enemy_templates)
+        in_progress_enemy = manager.get_random_enemy()
+        manager.replace_templates([{"name": "Dragon", "hp": 100, "attack_stat": 9, "loot_gold_min": 50, "loot_gold_max": 60}])
+        assert manager.get_random_enemy().name == "Dragon"
+        assert in_progress_enemy.name in ["Rat", "Wolf"] # Existing enemies keep their stats
+        assert len(sample_enemy_templates) == 2 # Caller's list is not mutated
+
+    def test_get_random_enemy_by_difficulty_band(self, sample_enemy_templates):
+        manager = EnemyManager(enemy_templates=sample_enemy_templates)
+        rat_band = get_difficulty_band(sample_enemy_templates[0])
+        wolf_band = get_difficulty_band(sample_enemy_templates[1])
+        assert manager.get_difficulty_bands() == sorted({rat_band, wolf_band})
+        for _ in range(10):
+            assert manager.get_random_enemy(difficulty_band=rat_band).name == "Rat"
+            assert manager.get_random_enemy(difficulty_band=wolf_band).name == "Wolf"
+
+    def test_get_random_enemy_empty_difficulty_band(self, sample_enemy_templates, capsys):
+        manager = EnemyManager(enemy_templates=sample_enemy_templates)
+        assert manager.get_random_enemy(difficulty_band=99) is None
+        assert "No enemy templates available in difficulty band 99" in capsys.readouterr().out
+
+    def test_difficulty_band_grows_with_threat(self):
+        assert get_difficulty_band({"hp": 1, "attack_stat": 1}) < get_difficulty_band({"hp": 50, "attack_stat": 10})
+        assert get_difficulty_band({"name": "BrokenBot"}) == 0
@@ -65,6 +65,17 @@ class TestFileManager:
         assert f"Save file {str(temp_char_file)} is missing required data" in captured.out
 
 
+    @pytest.mark.parametrize("equipment, inventory", [
+        ({"weapon": {"name": "x"}, "armour": None, "item": None}, []), # Item without a slot
+        ({"weapon": None, "armour": None, "item": None}, [["x", "weapon", 1]]), # Short inventory row
+    ])
+    def test_load_character_returns_none_for_corrupted_items(self, temp_char_file, equipment, inventory):
+        char_data = {"name": "Corrupted", "level": 1, "current_experience": 0, "current_hp": 15, "gold": 0,
+                     "equipment": equipment, "inventory": inventory}
+        with open(temp_char_file, 'w') as f:
+            json.dump(char_data, f)
+        assert file_manager.load_character(str(temp_char_file)) is None
+
     def test_save_and_load_retains_data_integrity(self, temp_char_file):
         original_char = Character(
             name="IntegrityCheck", level=3, current_experience=12,
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch
+from src.data_loader import DataLoader
+from src.enemy_manager import EnemyManager
+from src import game
+
+@pytest.fixture
+def game_session(tmp_path, monkeypatch):
+    """Points the game at a temporary save file and a single, harmless enemy."""
+    monkeypatch.setattr(game, "save_filepath", str(tmp_path / "save.json"))
+    monkeypatch.setattr(game, "enemy_manager", EnemyManager(
+        [{"name": "Rat", "hp": 2, "attack_stat": 0, "loot_gold_min": 1, "loot_gold_max": 1}]))
+    return tmp_path / "save.json"
+
+
+class TestScriptedDriver:
+    def test_scripted_input_replays_lines(self):
+        scripted_input = game.ScriptedInput(["a", "b"], repeat=2)
+        assert [scripted_input() for _ in range(4)] == ["a", "b", "a", "b"]
+        with pytest.raises(EOFError):
+            scripted_input()
+
+    def test_run_script_plays_real_game_loop(self, game_session):
+        script = ["2", "Bot", "4", "7", "5", "Q", "3"] # New game, add gold, fight, save, quit
+        with patch('builtins.input', side_effect=AssertionError("keyboard used")), \
+             patch.object(game.clock.get_clock(), 'sleep', side_effect=AssertionError("combat paused")):
+            stats = game.run_script(script, quiet=True)
+
+        assert stats["actions"] == len(script)
+        assert stats["actions_per_second"] > 0
+        saved = game.file_manager.load_character(str(game_session))
+        assert saved.name == "Bot"
+        assert saved.gold == 8 # 7 added + 1 looted from the Rat
+        assert game.input_func is input # Settings restored afterwards
+        assert game.paced_combat
+
+    def test_run_script_repeats_and_stops_at_end(self, game_session, capsys):
+        stats = game.run_script(["2", "Bot", "S", "Q", "3"], repeat=3)
+        assert stats["actions"] == 15
+        assert capsys.readouterr().out.count("Thanks for playing AFK Quest!") == 3
+
+    def test_run_script_ends_mid_session(self, game_session, capsys):
+        stats = game.run_script(["2", "Bot", "S"], quiet=True)
+        assert stats["actions"] == 3
+        assert not game_session.exists() # Never saved
+        assert "unexpected error" not in capsys.readouterr().err # Running out of script is not a crash
+
+
+class TestEnemyTemplates:
+    def test_indexed_catalog_needs_a_local_csv(self, tmp_path, monkeypatch):
+        config_path = tmp_path / "config.ini"
+        config_path.write_text("[DataSources.Enemies]\nuse_indexed_catalog = true\n")
+        monkeypatch.setattr(game, "data_loader", DataLoader(data_folder_path=str(tmp_path), config_filepath=str(config_path)))
+        with patch.object(game.data_loader, 'load_enemy_definitions', return_value=[{"name": "Rat"}]) as load:
+            assert game.load_enemy_templates() == [{"name": "Rat"}]
+        load.assert_called_once()
+
+
+class TestCommandLine:
+    def test_bad_autoplay_policy_is_reported(self, tmp_path, capsys):
+        assert game.main(["--autoplay", "flee", "--clock", "virtual", "--save-file", str(tmp_path / "save.json")]) == 1
+        assert "Error: " in capsys.readouterr().out
+        assert not (tmp_path / "save.json").exists()
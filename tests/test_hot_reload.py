@@ -0,0 +1,106 @@
+import os
+import pytest
+from unittest.mock import patch
+from src import log
+from src.data_loader import DataLoader
+from src.enemy_catalog import MappedEnemyCatalog
+from src.enemy_manager import EnemyManager
+from src.hot_reload import EnemyDefinitionReloader
+
+INITIAL_CSV_CONTENT = """name,hp,attack_stat,loot_gold_min,loot_gold_max
+TestGoblin,10,2,1,3
+"""
+UPDATED_CSV_CONTENT = """name,hp,attack_stat,loot_gold_min,loot_gold_max
+TestDragon,99,9,40,50
+"""
+
+@pytest.fixture
+def local_only_loader(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "enemies.csv").write_text(INITIAL_CSV_CONTENT)
+    config_path = tmp_path / "config.ini"
+    config_path.write_text("[DataSources.Enemies]\nlocal_csv_fallback = enemies.csv\n")
+    return DataLoader(data_folder_path=str(data_dir), config_filepath=str(config_path))
+
+def _touch_later(filepath, content):
+    """Rewrites a file and bumps its mtime so the change is visible on coarse-grained filesystems."""
+    stat = os.stat(filepath)
+    with open(filepath, 'w') as f:
+        f.write(content)
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestEnemyDefinitionReloader:
+    def test_no_reload_when_unchanged(self, local_only_loader):
+        manager = EnemyManager(local_only_loader.load_enemy_definitions())
+        reloader = EnemyDefinitionReloader(local_only_loader, manager)
+        assert not reloader.check_for_changes()
+        assert reloader.reload_count == 0
+
+    def test_reload_on_local_file_change(self, local_only_loader):
+        manager = EnemyManager(local_only_loader.load_enemy_definitions())
+        reloader = EnemyDefinitionReloader(local_only_loader, manager)
+
+        _touch_later(local_only_loader.get_local_enemy_csv_path(), UPDATED_CSV_CONTENT)
+
+        assert reloader.check_for_changes()
+        assert manager.get_random_enemy().name == "TestDragon"
+        assert not reloader.check_for_changes() # Only reloads once per change
+
+    def test_keeps_templates_when_reload_is_empty(self, local_only_loader, capsys):
+        manager = EnemyManager(local_only_loader.load_enemy_definitions())
+        reloader = EnemyDefinitionReloader(local_only_loader, manager)
+
+        _touch_later(local_only_loader.get_local_enemy_csv_path(), "name,hp\n")
+
+        assert not reloader.check_for_changes()
+        assert manager.get_random_enemy().name == "TestGoblin"
+        assert "Keeping the current templates" in capsys.readouterr().out
+        assert any("Keeping the current templates" in line for line in log.get_recent_lines()) # Shown by View Recent Log
+
+    def test_retries_failed_reload(self, local_only_loader):
+        manager = EnemyManager(local_only_loader.load_enemy_definitions())
+        reloader = EnemyDefinitionReloader(local_only_loader, manager)
+
+        _touch_later(local_only_loader.get_local_enemy_csv_path(), UPDATED_CSV_CONTENT)
+
+        with patch.object(reloader, 'load_templates', side_effect=OSError("file is being written")):
+            with pytest.raises(OSError):
+                reloader.check_for_changes()
+        assert reloader.check_for_changes() # Retried without another edit
+        assert manager.get_random_enemy().name == "TestDragon"
+
+    def test_reload_on_remote_validator_change(self, local_only_loader):
+        manager = EnemyManager(local_only_loader.load_enemy_definitions())
+        with patch.object(local_only_loader, 'fetch_remote_enemy_validator', return_value='"v1"'):
+            reloader = EnemyDefinitionReloader(local_only_loader, manager)
+            assert not reloader.check_for_changes()
+        with patch.object(local_only_loader, 'fetch_remote_enemy_validator', return_value='"v2"'):
+            assert reloader.check_for_changes()
+
+    def test_reload_closes_replaced_catalog(self, local_only_loader):
+        csv_path = local_only_loader.get_local_enemy_csv_path()
+        first_catalog = MappedEnemyCatalog(csv_path)
+        manager = EnemyManager(first_catalog)
+        reloader = EnemyDefinitionReloader(local_only_loader, manager, load_templates=lambda: MappedEnemyCatalog(csv_path))
+
+        _touch_later(csv_path, UPDATED_CSV_CONTENT)
+
+        assert reloader.check_for_changes()
+        assert first_catalog._csv_map.closed # pylint: disable=protected-access
+        assert manager.get_random_enemy().name == "TestDragon"
+        manager.enemy_templates.close()
+
+    def test_background_thread_start_stop(self, local_only_loader):
+        manager = EnemyManager(local_only_loader.load_enemy_definitions())
+        reloader = EnemyDefinitionReloader(local_only_loader, manager, poll_interval=0.01)
+        reloader.start()
+        _touch_later(local_only_loader.get_local_enemy_csv_path(), UPDATED_CSV_CONTENT)
+        for _ in range(200):
+            if reloader.reload_count:
+                break
+            reloader._stop_event.wait(0.01)
+        reloader.stop()
+        assert reloader.reload_count == 1
+        assert manager.get_random_enemy().name == "TestDragon"
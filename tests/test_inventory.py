@@ -0,0 +1,76 @@
+import random
+from src.inventory import Inventory
+from src.item import Item, get_item_rating
+
+DAGGER = Item("Dagger", "weapon", 3, attack_bonus=1)
+SWORD = Item("Sword", "weapon", 12, attack_bonus=2)
+GILDED_DAGGER = Item("Gilded Dagger", "weapon", 40, attack_bonus=1) # Same bonus as the Dagger, worth more
+VEST = Item("Vest", "armour", 5, damage_reduction=1)
+
+
+class TestInventory:
+    def test_add_and_remove_keep_counts(self):
+        inventory = Inventory()
+        inventory.add(DAGGER, 3)
+        inventory.add(VEST)
+        assert len(inventory) == 4
+        assert inventory.total_value == 14
+        assert inventory.remove(DAGGER, 2)
+        assert not inventory.remove(DAGGER, 2) # Only one left
+        assert inventory.count(DAGGER) == 1
+        assert inventory.remove(DAGGER)
+        assert DAGGER not in inventory
+        assert inventory.get_items() == [(VEST, 1)]
+        assert len(inventory) == 1 and inventory.total_value == 5
+
+    def test_items_sorted_by_rating_within_slot(self):
+        inventory = Inventory()
+        for item in [SWORD, VEST, GILDED_DAGGER, DAGGER]:
+            inventory.add(item)
+        assert inventory.get_items("weapon") == [(SWORD, 1), (GILDED_DAGGER, 1), (DAGGER, 1)]
+        assert inventory.get_best("weapon") is SWORD
+        assert inventory.get_best("armour") is VEST
+        assert inventory.get_best("item") is None
+
+    def test_remove_rated_below(self):
+        inventory = Inventory()
+        inventory.add(DAGGER, 10)
+        inventory.add(GILDED_DAGGER)
+        inventory.add(SWORD, 2)
+        assert inventory.remove_rated_below("weapon", get_item_rating(GILDED_DAGGER)) == [(DAGGER, 10)]
+        assert inventory.get_items("weapon") == [(SWORD, 2), (GILDED_DAGGER, 1)] # Equal rating is kept
+        assert len(inventory) == 3 and inventory.total_value == 64
+
+    def test_index_matches_naive_scan(self):
+        rng = random.Random(3)
+        catalog = [Item(f"Item {i}", rng.choice(["weapon", "armour", "item"]), rng.randint(0, 50),
+                        rng.randint(0, 3), rng.randint(0, 3)) for i in range(200)]
+        inventory, held = Inventory(), {}
+        for _ in range(3000):
+            item = rng.choice(catalog)
+            if rng.random() < 0.7:
+                inventory.add(item)
+                held[item] = held.get(item, 0) + 1
+            elif inventory.remove(item):
+                held[item] -= 1
+        held = {item: count for item, count in held.items() if count}
+        for slot in ["weapon", "armour", "item"]:
+            in_slot = [item for item in held if item.slot == slot]
+            assert get_item_rating(inventory.get_best(slot)) == max(get_item_rating(item) for item in in_slot)
+        assert len(inventory) == sum(held.values())
+        assert inventory.total_value == sum(item.value * count for item, count in held.items())
+
+        threshold = (3, 25)
+        removed = dict(inventory.remove_rated_below("weapon", threshold))
+        assert removed == {item: count for item, count in held.items()
+                           if item.slot == "weapon" and get_item_rating(item) < threshold}
+
+    def test_serializes_one_row_per_distinct_item(self):
+        inventory = Inventory()
+        inventory.add(DAGGER, 1000)
+        inventory.add(VEST)
+        rows = inventory.to_list()
+        assert rows == [["Dagger", "weapon", 3, 1, 0, 1000], ["Vest", "armour", 5, 0, 1, 1]]
+        restored = Inventory.from_list(rows)
+        assert restored.get_items() == inventory.get_items()
+        assert len(restored) == 1001
@@ -0,0 +1,84 @@
+import pytest
+from src.item import Item, LootTable, build_loot_tables, get_loot_table_rows
+from src.rng import RandomSource
+
+DAGGER = Item("Dagger", "weapon", 3, attack_bonus=1)
+VEST = Item("Vest", "armour", 5, damage_reduction=1)
+ROPE = Item("Rope", "item", 2)
+
+
+class FixedRoll:
+    """Stands in for a RandomSource whose random() always returns value."""
+    def __init__(self, value):
+        self.value = value
+
+    def random(self):
+        return self.value
+
+
+class TestItem:
+    def test_round_trips_through_dict(self):
+        assert Item.from_dict(DAGGER.to_dict()) == DAGGER
+        assert Item.from_dict({"name": "Rope", "slot": "item", "value": 2}) == ROPE # Bonuses default to 0
+
+    def test_items_are_immutable(self):
+        with pytest.raises(AttributeError):
+            DAGGER.value = 100
+
+
+class TestLootTable:
+    def test_roll_picks_item_by_cumulative_chance(self):
+        table = LootTable([(DAGGER, 0.2), (VEST, 0.3), (ROPE, 0.1)])
+        assert table.cumulative_chances == pytest.approx([0.2, 0.5, 0.6])
+        assert table.roll(FixedRoll(0.0)) is DAGGER
+        assert table.roll(FixedRoll(0.2)) is VEST # Boundaries belong to the next item
+        assert table.roll(FixedRoll(0.59)) is ROPE
+        assert table.roll(FixedRoll(0.6)) is None # Left over chance: nothing drops
+        assert table.drop_chance == pytest.approx(0.6)
+
+    def test_chances_over_one_are_scaled(self):
+        table = LootTable([(DAGGER, 1.0), (VEST, 3.0), (ROPE, 0.0)])
+        assert len(table) == 2 # Zero chances are dropped
+        assert table.cumulative_chances == [0.25, 1.0]
+        assert table.roll(FixedRoll(0.9999999)) is VEST
+
+    def test_drop_rates_follow_chances(self):
+        table = LootTable([(DAGGER, 0.5), (VEST, 0.25)])
+        rng = RandomSource(7)
+        drops = [table.roll(rng) for _ in range(20000)]
+        assert drops.count(DAGGER) / len(drops) == pytest.approx(0.5, abs=0.02)
+        assert drops.count(VEST) / len(drops) == pytest.approx(0.25, abs=0.02)
+        assert drops.count(None) / len(drops) == pytest.approx(0.25, abs=0.02)
+
+    def test_empty_table_uses_no_randomness(self):
+        assert LootTable([]).roll(object()) is None # object() has no random(), so it must not be called
+
+    def test_large_table(self):
+        items = [Item(f"Item {i}", "item", i) for i in range(5000)]
+        table = LootTable([(item, 1 / 5000) for item in items])
+        assert table.roll(FixedRoll(0.0)) is items[0]
+        assert table.roll(FixedRoll(0.5)) is items[2500]
+        assert table.roll(FixedRoll(0.99999)) is items[-1]
+
+
+class TestBuildLootTables:
+    def test_groups_rows_by_enemy(self, capsys):
+        rows = [{"name": "Goblin", "item": "Dagger", "drop_chance": 0.1},
+                {"name": "Goblin", "item": "Rope", "drop_chance": 0.2},
+                {"name": "Bandit", "item": "Vest", "drop_chance": 0.5},
+                {"name": "Bandit", "item": "Crown", "drop_chance": 0.5}]
+        tables = build_loot_tables(rows, [DAGGER, VEST, ROPE])
+        assert tables["Goblin"].items == [DAGGER, ROPE]
+        assert tables["Bandit"].items == [VEST]
+        assert "Loot table for Bandit names unknown item 'Crown'" in capsys.readouterr().out
+
+    def test_rows_rebuild_identical_tables(self):
+        tables = {"Goblin": LootTable([(DAGGER, 0.7), (ROPE, 0.0), (VEST, 0.6)]), "Bandit": LootTable([(ROPE, 0.25)])}
+        rows = get_loot_table_rows(tables)
+        assert rows == [{"name": "Goblin", "item": "Dagger", "drop_chance": 0.7},
+                        {"name": "Goblin", "item": "Vest", "drop_chance": 0.6},
+                        {"name": "Bandit", "item": "Rope", "drop_chance": 0.25}]
+        rebuilt = build_loot_tables(rows, [DAGGER, VEST, ROPE])
+        for name, table in tables.items():
+            assert rebuilt[name].items == table.items
+            assert rebuilt[name].cumulative_chances == table.cumulative_chances
@@ -0,0 +1,146 @@
+import asyncio
+import io
+import json
+import logging
+import pytest
+from unittest.mock import patch
+from src import log
+from src.character import Character
+from src.enemy_manager import EnemyManager
+from src import game
+
+
+@pytest.fixture(autouse=True)
+def clean_log():
+    """Restores the log level and console format, and empties the ring buffer."""
+    previous_level = log.get_level()
+    log.ring_buffer.clear()
+    yield
+    log.configure(previous_level, structured=False)
+    log.ring_buffer.clear()
+
+
+class CountingArgument:
+    """Counts how often it is formatted."""
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "argument"
+
+
+class TestConsole:
+    def test_messages_print_exactly_as_before(self, capsys):
+        Character(name="Hero").add_gold(5)
+        assert capsys.readouterr().out == "Hero found 5 gold. Total: 5 gold.\n"
+
+    def test_console_follows_redirected_stdout(self):
+        output = io.StringIO()
+        with patch('sys.stdout', output):
+            Character(name="Hero").gain_experience(10)
+        assert output.getvalue() == "Ding! Hero reached Level 2!\n"
+
+    def test_disabled_level_skips_formatting(self, capsys):
+        argument = CountingArgument()
+        with log.level(logging.WARNING):
+            log.get_logger("test").info("Not shown: %s", argument)
+        assert argument.formatted == 0
+        assert capsys.readouterr().out == ""
+        assert not log.ring_buffer.records
+
+    def test_structured_format_includes_extra_fields(self, capsys):
+        log.configure(structured=True)
+        log.get_logger("test").warning("Row %d is bad", 3, extra={"row_number": 3})
+        entry = json.loads(capsys.readouterr().out)
+        assert entry["message"] == "Row 3 is bad"
+        assert entry["level"] == "WARNING" and entry["logger"] == "afk_quest.test"
+        assert entry["row_number"] == 3
+
+    def test_parse_level(self):
+        assert log.parse_level("warning") == logging.WARNING
+        with pytest.raises(ValueError):
+            log.parse_level("loud")
+
+
+class TestRingBuffer:
+    def test_keeps_most_recent_records(self):
+        handler = log.RingBufferHandler(capacity=3)
+        handler.setFormatter(log.PLAIN_FORMATTER)
+        logger = logging.getLogger("afk_quest_ring_test")
+        logger.addHandler(handler)
+        try:
+            for i in range(5):
+                logger.warning("message %d", i)
+        finally:
+            logger.removeHandler(handler)
+        assert handler.get_lines() == ["message 2", "message 3", "message 4"]
+        assert handler.get_lines(limit=1) == ["message 4"]
+
+    def test_dump_recent(self, capsys):
+        EnemyManager([])
+        capsys.readouterr()
+        output = io.StringIO()
+        log.dump_recent(output)
+        assert "WARNING" in output.getvalue()
+        assert "EnemyManager initialized with no enemy templates" in output.getvalue()
+
+
+class TestRoutes:
+    def test_route_sends_messages_to_its_output(self, capsys):
+        output = io.StringIO()
+        with log.route(output) as session_route:
+            Character(name="Hero").add_gold(5)
+            assert log.get_recent_lines() == session_route.ring_buffer.get_lines()
+            with log.unrouted():
+                Character(name="Other").add_gold(1)
+        Character(name="Third").add_gold(2)
+        assert output.getvalue() == "Hero found 5 gold. Total: 5 gold.\n"
+        assert capsys.readouterr().out == ("Other found 1 gold. Total: 1 gold.\n"
+                                           "Third found 2 gold. Total: 2 gold.\n")
+        assert len(session_route.ring_buffer.records) == 1
+        assert len(log.ring_buffer.records) == 3 # The game's buffer still sees everything
+
+    def test_routes_follow_their_task(self):
+        async def session(name, output):
+            with log.route(output):
+                for _ in range(3):
+                    Character(name=name).add_gold(1)
+                    await asyncio.sleep(0)
+
+        async def main(outputs):
+            await asyncio.gather(*(session(name, output) for name, output in outputs.items()))
+
+        outputs = {"Alice": io.StringIO(), "Bob": io.StringIO()}
+        asyncio.run(main(outputs))
+        for name, output in outputs.items():
+            assert output.getvalue() == f"{name} found 1 gold. Total: 1 gold.\n" * 3
+
+    def test_redirect_output_within_route(self):
+        session_output, captured = io.StringIO(), io.StringIO()
+        with log.route(session_output):
+            with log.redirect_output(captured):
+                print("printed")
+                Character(name="Hero").add_gold(5)
+        assert captured.getvalue() == "printed\nHero found 5 gold. Total: 5 gold.\n"
+        assert session_output.getvalue() == ""
+
+
+class TestGameIntegration:
+    @pytest.fixture
+    def game_session(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(game, "save_filepath", str(tmp_path / "save.json"))
+        monkeypatch.setattr(game, "enemy_manager", EnemyManager(
+            [{"name": "Rat", "hp": 2, "attack_stat": 0, "loot_gold_min": 1, "loot_gold_max": 1}]))
+
+    def test_recent_log_action(self, game_session, capsys):
+        game.run_script(["2", "Bot", "4", "7", "L", "Q", "3"])
+        output = capsys.readouterr().out
+        assert "--- Recent Log ---" in output
+        assert "INFO     afk_quest.character: Bot found 7 gold. Total: 7 gold." in output
+
+    def test_crash_dumps_recent_log(self, game_session, capsys):
+        with patch.object(game.actions, "choose_action", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                game.run_script(["2", "Bot"])
+        assert "Recent log messages:" in capsys.readouterr().err
@@ -0,0 +1,119 @@
+import urllib.request
+import pytest
+from src import metrics
+from src import file_manager
+from src.character import Character
+from src.combat import FIGHTS, simulate_combat
+from src.enemy import Enemy
+from src.enemy_manager import ENEMIES_SPAWNED, EnemyManager
+
+
+@pytest.fixture
+def metrics_enabled():
+    """Records metrics for the duration of a test."""
+    was_enabled = metrics.enabled()
+    metrics.enable()
+    yield
+    if not was_enabled:
+        metrics.disable()
+
+
+@pytest.fixture
+def registry():
+    return metrics.MetricsRegistry()
+
+
+class TestMetricTypes:
+    def test_disabled_metrics_record_nothing(self, registry):
+        counter = registry.counter("things_total", "Things.")
+        histogram = registry.histogram("thing_seconds", "Thing time.")
+        metrics.disable()
+        counter.inc()
+        histogram.observe(0.5)
+        with histogram.time():
+            pass
+        assert counter.value == 0
+        assert histogram.count == 0
+
+    def test_counter_with_labels(self, registry, metrics_enabled):
+        counter = registry.counter("fights_total", "Fights.", ["outcome"])
+        counter.labels("won").inc()
+        counter.labels("won").inc(2)
+        counter.labels("lost").inc()
+        assert registry.render() == ('# HELP fights_total Fights.\n# TYPE fights_total counter\n'
+                                     'fights_total{outcome="lost"} 1\nfights_total{outcome="won"} 3\n')
+        with pytest.raises(ValueError):
+            counter.labels("won", "extra")
+
+    def test_gauge_keeps_value_while_disabled(self, registry):
+        gauge = registry.gauge("templates", "Templates.")
+        metrics.disable()
+        gauge.set(5)
+        gauge.dec()
+        assert gauge.value == 4
+
+    def test_histogram_buckets_are_cumulative(self, registry, metrics_enabled):
+        histogram = registry.histogram("rounds", "Rounds.", buckets=(1, 5))
+        for value in (1, 3, 4, 10):
+            histogram.observe(value)
+        lines = registry.render().splitlines()
+        assert 'rounds_bucket{le="1.0"} 1' in lines
+        assert 'rounds_bucket{le="5.0"} 3' in lines
+        assert 'rounds_bucket{le="+Inf"} 4' in lines
+        assert "rounds_sum 18.0" in lines
+        assert "rounds_count 4" in lines
+
+    def test_metric_types_must_render_samples(self):
+        with pytest.raises(TypeError):
+            metrics.Metric("afk_quest_untyped", "No samples.")
+
+    def test_declaring_twice_returns_same_metric(self, registry):
+        assert registry.counter("a_total", "A.") is registry.counter("a_total", "A.")
+        with pytest.raises(ValueError):
+            registry.gauge("a_total", "A.")
+
+    def test_label_values_are_escaped(self, registry, metrics_enabled):
+        registry.counter("names_total", "Names.", ["name"]).labels('Bob "the" \\Bold\\').inc()
+        assert 'names_total{name="Bob \\"the\\" \\\\Bold\\\\"} 1' in registry.render()
+
+
+class TestInstrumentation:
+    def test_fights_are_counted(self, metrics_enabled):
+        won = FIGHTS.labels("player_won")
+        before = won.value
+        simulate_combat(Character(name="Hero", base_attack_stat=50), Enemy("Rat", 1, 0, 0, 0))
+        assert won.value == before + 1
+
+    def test_enemy_spawns_are_counted(self, metrics_enabled):
+        before = ENEMIES_SPAWNED.value
+        EnemyManager([{"name": "Rat", "hp": 2, "attack_stat": 0, "loot_gold_min": 1, "loot_gold_max": 1}]).get_random_enemy()
+        assert ENEMIES_SPAWNED.value == before + 1
+
+    def test_saves_are_counted_and_timed(self, tmp_path, metrics_enabled):
+        saves = file_manager.SAVES.labels("ok")
+        before, timed_before = saves.value, file_manager.SAVE_SECONDS.count
+        file_manager.save_character(Character(name="Hero"), str(tmp_path / "save.json"))
+        assert saves.value == before + 1
+        assert file_manager.SAVE_SECONDS.count == timed_before + 1
+
+
+class TestExport:
+    def test_http_endpoint_serves_prometheus_text(self, registry, metrics_enabled):
+        registry.counter("scrapes_total", "Scrapes.").inc()
+        server = metrics.start_http_server(0, registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response: # nosec B310 - Local test server
+                assert response.headers["Content-Type"] == metrics.CONTENT_TYPE
+                assert "scrapes_total 1" in response.read().decode("utf-8")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_dumper_writes_file(self, tmp_path, registry, metrics_enabled):
+        registry.gauge("players", "Players.").set(3)
+        filepath = tmp_path / "metrics.prom"
+        dumper = metrics.MetricsDumper(str(filepath), interval=60, registry=registry)
+        dumper.start()
+        dumper.stop() # Writes a final dump
+        assert "players 3" in filepath.read_text(encoding="utf-8")
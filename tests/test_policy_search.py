@@ -0,0 +1,76 @@
+import pytest
+from src import policy_search
+from src.enemy_manager import EnemyManager
+from src.item import Item, LootTable
+
+@pytest.fixture
+def sample_enemy_templates():
+    return [
+        {"name": "Rat", "hp": 5, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 1},
+        {"name": "Ogre", "hp": 50, "attack_stat": 10, "loot_gold_min": 5, "loot_gold_max": 10},
+    ]
+
+class TestPolicySearch:
+    def test_run_rollouts_is_deterministic(self, sample_enemy_templates):
+        manager = EnemyManager(sample_enemy_templates)
+        first = policy_search.run_rollouts((0.5, None), [1, 2], level=3, attack=2, hours=0.5, enemy_manager=manager)
+        second = policy_search.run_rollouts((0.5, None), [1, 2], level=3, attack=2, hours=0.5, enemy_manager=manager)
+        assert first == second
+        assert len(first) == 2
+
+    def test_candidates_meet_the_same_enemies(self):
+        manager = EnemyManager([{"name": "Rat", "hp": 5, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 1},
+                                {"name": "Bat", "hp": 4, "attack_stat": 2, "loot_gold_min": 0, "loot_gold_max": 1},
+                                {"name": "Wolf", "hp": 9, "attack_stat": 2, "loot_gold_min": 1, "loot_gold_max": 3}])
+        get_random_enemy = manager.get_random_enemy
+        met = []
+        def record_enemy(difficulty_band=None, rng=None):
+            enemy = get_random_enemy(difficulty_band, rng)
+            met[-1].append(enemy.name)
+            return enemy
+        manager.get_random_enemy = record_enemy
+        for candidate in [(0.0, None), (0.9, None)]: # Never rests / rests often, so their fights differ
+            met.append([])
+            policy_search.run_rollouts(candidate, [5], level=10, attack=3, hours=0.5, enemy_manager=manager)
+        never_rests, rests_often = met
+        shared = min(len(never_rests), len(rests_often))
+        assert shared >= 5
+        assert never_rests[:shared] == rests_often[:shared]
+        assert len(set(never_rests)) > 1
+
+    def test_summarize_reports_interval_and_deaths(self):
+        summary = policy_search.summarize((0.5, 3), [(10.0, False), (20.0, True), (30.0, False)])
+        assert summary["policy"] == "rest:50@band3"
+        assert summary["xp_per_hour"] == pytest.approx(20.0)
+        assert summary["ci_low"] < 20.0 < summary["ci_high"]
+        assert summary["death_rate"] == pytest.approx(1 / 3)
+
+    @pytest.mark.parametrize("search", ["grid", "halving"])
+    def test_search_policies_ranks_best_first(self, sample_enemy_templates, search):
+        candidates = [(0.0, None), (0.9, None), (0.5, None), (0.2, None)]
+        summaries = policy_search.search_policies(sample_enemy_templates, candidates, rollouts=4, level=2,
+                                                  attack=2, hours=0.2, search=search, workers=1)
+        assert summaries
+        rates = [summary["xp_per_hour"] for summary in summaries]
+        assert rates == sorted(rates, reverse=True)
+        if search == "grid":
+            assert len(summaries) == len(candidates)
+            assert all(summary["rollouts"] == 4 for summary in summaries)
+
+    def test_search_policies_plays_with_loot_tables(self):
+        rats = [{"name": "Rat", "hp": 5, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 1}]
+        loot_tables = {"Rat": LootTable([(Item("Rat Fang", "weapon", 1, attack_bonus=5), 1.0)])}
+        plain = policy_search.search_policies(rats, [(0.5, None)], rollouts=2, level=2, attack=1, hours=0.5, workers=1)
+        looted = policy_search.search_policies(rats, [(0.5, None)], rollouts=2, level=2, attack=1, hours=0.5,
+                                               workers=1, loot_tables=loot_tables)
+        assert looted[0]["xp_per_hour"] > plain[0]["xp_per_hour"] # The fang is equipped and rats die faster
+
+    def test_search_policies_rejects_unknown_search(self, sample_enemy_templates):
+        with pytest.raises(ValueError):
+            policy_search.search_policies(sample_enemy_templates, [(0.5, None)], rollouts=2, search="mcts", workers=1)
+
+    def test_format_ranking(self):
+        summary = policy_search.summarize((0.25, None), [(12.0, False), (14.0, False)])
+        text = policy_search.format_ranking([summary])
+        assert "rest:25" in text
+        assert "13.0" in text
@@ -0,0 +1,66 @@
+import json
+import os
+import pytest
+from src import profiling
+from src import file_manager
+from src.character import Character
+from src.combat import simulate_combat
+from src.enemy import Enemy
+from src.enemy_manager import EnemyManager
+from src import game
+
+
+def workload(tmp_path):
+    """Some combat and some persistence."""
+    for _ in range(200):
+        simulate_combat(Character(name="Hero", level=5), Enemy("Bandit", 15, 2, 5, 10), apply_rewards=False)
+    for _ in range(20):
+        file_manager.save_character(Character(name="Hero"), str(tmp_path / "save.json"))
+
+
+class TestAttribution:
+    def test_game_modules_map_to_subsystems(self):
+        assert profiling.get_subsystem(profiling.__file__.replace("profiling.py", "combat.py")) == "combat"
+        assert profiling.get_subsystem(file_manager.__file__) == "persistence"
+        assert profiling.get_subsystem(json.__file__) is None # Not game code
+
+    def test_deterministic_profile_attributes_library_time_to_callers(self, tmp_path, capsys):
+        report = profiling.run_profiled(lambda: workload(tmp_path), str(tmp_path / "profile"))
+        assert report["time_by_subsystem"]["combat"] > 0
+        assert report["time_by_subsystem"]["persistence"] > 0 # json.dump and open count as persistence
+        assert report["memory_by_subsystem"]
+        assert report["peak_memory"] > 0
+        assert sorted(os.listdir(tmp_path / "profile")) == ["memory.snapshot", "profile.prof",
+                                                          "summary.json", "summary.txt"]
+        assert "Time by subsystem:" in (tmp_path / "profile" / "summary.txt").read_text(encoding="utf-8")
+
+    def test_sampling_profile_writes_folded_stacks(self, tmp_path, capsys):
+        profiler = profiling.SessionProfiler(profiling.SAMPLING, interval=0.0005, memory=False)
+        profiler.start()
+        workload(tmp_path)
+        profiler.sampler.sample() # At least one sample, however fast the machine
+        profiler.stop()
+        report = profiler.write(str(tmp_path / "profile"))
+        assert report["time_by_subsystem"]
+        assert report["memory_by_subsystem"] == {}
+        folded = (tmp_path / "profile" / "stacks.folded").read_text(encoding="utf-8")
+        assert "test_profiling.py:workload" in folded
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            profiling.SessionProfiler("magic")
+
+
+class TestProfileMode:
+    def test_game_profiles_scripted_session(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(game, "enemy_manager", EnemyManager(
+            [{"name": "Rat", "hp": 2, "attack_stat": 0, "loot_gold_min": 1, "loot_gold_max": 1}]))
+        monkeypatch.setattr(game, "save_filepath", game.save_filepath) # main() replaces it
+        script = tmp_path / "script.txt"
+        script.write_text("2\nBot\n5\nQ\n3\n", encoding="utf-8")
+        game.main(["--script", str(script), "--quiet", "--clock", "virtual", "--save-file", str(tmp_path / "save.json"),
+                   "--profile", str(tmp_path / "profile")])
+        summary = json.loads((tmp_path / "profile" / "summary.json").read_text(encoding="utf-8"))
+        assert summary["mode"] == "deterministic"
+        assert "game loop" in summary["time_by_subsystem"]
+        assert "Profile written to" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+import pytest
+from src import progression_sim
+from src.combat import get_paced_duration
+from src.rng import RandomSource
+
+@pytest.fixture
+def sample_enemy_templates():
+    return [
+        {"name": "Rat", "hp": 5, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 1},
+        {"name": "Wolf", "hp": 10, "attack_stat": 3, "loot_gold_min": 2, "loot_gold_max": 4},
+    ]
+
+class TestProgressionSim:
+    def test_level_table_statistics(self, sample_enemy_templates):
+        table = progression_sim.build_level_table(sample_enemy_templates, level=20, attack=1, samples_per_template=50)
+        assert len(table.outcomes) == 100
+        assert table.win_rate == 1.0 # 300 HP cannot lose to these enemies
+        assert table.xp_mean == pytest.approx((5 // 2 + 10 // 2) / 2)
+        assert 0 < table.gold_mean < 4
+
+    def test_paced_duration(self):
+        assert get_paced_duration(1, "player_won") == 1 + 1 + 3
+        assert get_paced_duration(2, "player_lost") == 1 + 4 + 3
+
+    def test_simulation_respects_horizon_and_targets(self, sample_enemy_templates):
+        results = progression_sim.simulate_progression(sample_enemy_templates, agents=50, fights=500,
+                                                       target_levels=[3, 10], seed=3, samples_per_template=50)
+        assert len(results["gold"]) == 50
+        assert len(results["fights_to_level"][3]) == 50
+        assert all(fights <= 500 for fights in results["fights_to_level"][10])
+        assert all(fights_3 < 500 for fights_3 in results["fights_to_level"][3])
+
+    def test_batched_steps_match_exact_stepping(self, sample_enemy_templates):
+        kwargs = dict(agents=300, fights=5000, target_levels=[15], seed=5, samples_per_template=100)
+        exact = progression_sim.simulate_progression(sample_enemy_templates, exact_fight_threshold=10**9, **kwargs)
+        batched = progression_sim.simulate_progression(sample_enemy_templates, exact_fight_threshold=0, **kwargs)
+        exact_median = progression_sim.percentile(exact["fights_to_level"][15], 0.5)
+        batched_median = progression_sim.percentile(batched["fights_to_level"][15], 0.5)
+        assert batched_median == pytest.approx(exact_median, rel=0.05)
+
+    def test_level_up_overflow_is_carried(self):
+        table = progression_sim.LevelOutcomeTable([(5, 0, 1.0, True), (0, 0, 1.0, False)])
+        rng = RandomSource(1)
+        overflows = [table.sample_overflow(rng) for _ in range(2000)]
+        assert set(overflows) == {0, 1, 2, 3, 4} # Only the 5 XP fight can cross a threshold
+        assert table.overflow_mean == 2
+        assert sum(overflows) / len(overflows) == pytest.approx(table.overflow_mean, abs=0.1)
+
+    def test_percentile(self):
+        assert progression_sim.percentile([5, 1, 3, 2, 4], 0.5) == 3
+        assert progression_sim.percentile([5, 1, 3, 2, 4], 0.99) == 5
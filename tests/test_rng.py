@@ -0,0 +1,81 @@
+import random
+from collections import Counter
+import pytest
+from src.character import Character
+from src.combat import simulate_combat
+from src.enemy import Enemy
+from src.rng import MAX_BUFFERED_RANGES, RandomSource
+
+class TestRandomSource:
+    def test_same_seed_same_values(self):
+        first, second = RandomSource(42), RandomSource(42)
+        assert [first.randint(1, 6) for _ in range(5000)] == [second.randint(1, 6) for _ in range(5000)]
+
+    def test_values_stay_in_range(self):
+        rng = RandomSource(1, block_size=64)
+        values = [rng.randint(-3, 3) for _ in range(5000)]
+        assert min(values) == -3 and max(values) == 3
+        assert rng.randint(7, 7) == 7
+
+    def test_values_are_uniform(self):
+        rng = RandomSource(7)
+        counts = Counter(rng.randint(1, 6) for _ in range(60000))
+        expected = 10000
+        chi_squared = sum((counts[face] - expected) ** 2 / expected for face in range(1, 7))
+        assert chi_squared < 20.5 # p ~ 0.001 for 5 degrees of freedom
+
+    def test_large_ranges(self):
+        rng = RandomSource(3)
+        assert 0 <= rng.randint(0, 2 ** 40) <= 2 ** 40
+
+    def test_buffered_ranges_are_capped(self):
+        rng = RandomSource(5, block_size=64)
+        values = [rng.randint(0, size) for size in range(1, 10 * MAX_BUFFERED_RANGES)]
+        assert all(0 <= value <= size for size, value in zip(range(1, 10 * MAX_BUFFERED_RANGES), values))
+        assert len(rng._streams) == MAX_BUFFERED_RANGES # pylint: disable=protected-access
+        assert 0 <= rng.randint(1, 6) <= 6 # Buffered sizes keep their buffers
+
+    def test_empty_ranges_raise(self):
+        rng = RandomSource(1)
+        with pytest.raises(ValueError):
+            rng.randint(5, 4)
+        with pytest.raises(IndexError):
+            rng.choice([])
+
+    def test_spawned_streams_are_independent_and_reproducible(self):
+        parent = RandomSource(9)
+        child_a = [parent.spawn(0).randint(0, 1000) for _ in range(3)]
+        assert len(set(child_a)) == 1 # Recreated from the seed, not from the parent's position
+        first = parent.spawn(1)
+        parent.randint(0, 10) # Using the parent does not change its children
+        second = RandomSource(9).spawn(1)
+        assert [first.randint(0, 1000) for _ in range(100)] == [second.randint(0, 1000) for _ in range(100)]
+        stream_two, stream_three = parent.spawn(2), parent.spawn(3)
+        assert [stream_two.randint(0, 1000) for _ in range(20)] != [stream_three.randint(0, 1000) for _ in range(20)]
+
+    def test_random_seed_is_recorded(self):
+        rng = RandomSource()
+        assert RandomSource(rng.seed).randint(0, 10 ** 6) == RandomSource(rng.seed).randint(0, 10 ** 6)
+
+class TestCombatWithRandomSource:
+    @staticmethod
+    def win_rate(rng, fights=4000):
+        wins = 0
+        for _ in range(fights):
+            hero = Character(name="Hero", level=2, base_attack_stat=3)
+            wolf = Enemy(name="Wolf", max_hp=20, attack_stat=4, loot_gold_min=1, loot_gold_max=3)
+            wins += simulate_combat(hero, wolf, apply_rewards=False, rng=rng)["outcome"] == "player_won"
+        return wins / fights
+
+    def test_simulation_is_reproducible(self):
+        assert self.win_rate(RandomSource(5), 500) == self.win_rate(RandomSource(5), 500)
+
+    def test_same_statistics_as_random_module(self):
+        random.seed(11)
+        module_rate = self.win_rate(None)
+        source_rate = self.win_rate(RandomSource(11))
+        assert abs(module_rate - source_rate) < 0.05
+
+    def test_loot_uses_given_source(self):
+        rat = Enemy(name="Rat", max_hp=1, attack_stat=0, loot_gold_min=1, loot_gold_max=100)
+        assert rat.get_loot_gold(RandomSource(2)) == rat.get_loot_gold(RandomSource(2))
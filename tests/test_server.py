@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.enemy_manager import EnemyManager
+from src.file_manager import load_character
+from src.server import get_save_filepath, start_server
+
+SAMPLE_TEMPLATES = [{"name": "Rat", "hp": 5, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 1}]
+
+async def _play(port, lines):
+    """Connects as a player, sends each line, and returns everything the server sent."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write("".join(line + "\n" for line in lines).encode("utf-8"))
+    writer.write_eof()
+    await writer.drain()
+    output = await asyncio.wait_for(reader.read(), timeout=10)
+    writer.close()
+    return output.decode("utf-8")
+
+async def _run_sessions(save_folder, sessions):
+    """Starts a server and runs the given player sessions concurrently."""
+    server = await start_server(EnemyManager(SAMPLE_TEMPLATES), port=0, save_folder=save_folder, pauses=False)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await asyncio.gather(*(_play(port, lines) for lines in sessions))
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+class TestServer:
+    def test_save_filepath_is_sanitized(self, tmp_path):
+        assert get_save_filepath(str(tmp_path), "../Evil Name") == str(tmp_path / "___evil_name.json")
+
+    @patch('src.combat.random.randint')
+    def test_session_fights_and_saves(self, mock_randint, tmp_path):
+        mock_randint.side_effect = lambda a, b: b # Always return max of range
+        (output,) = asyncio.run(_run_sessions(str(tmp_path), [["Hero", "4", "10", "Q"]]))
+        assert "Welcome, Hero!" in output
+        assert "Gold: 10" in output
+        assert "Thanks for playing AFK Quest!" in output
+        assert (tmp_path / "hero.json").exists()
+
+        # Reconnect and continue the saved character
+        (output,) = asyncio.run(_run_sessions(str(tmp_path), [["Hero", "1", "5", "", "", "", "", "Q"]]))
+        assert "Welcome back, Hero!" in output
+        assert "--- COMBAT START ---" in output
+        assert "Rat has been defeated!" in output
+
+    def test_many_concurrent_sessions(self, tmp_path):
+        sessions = [[f"Player{i}", "S", "Q"] for i in range(200)]
+        outputs = asyncio.run(_run_sessions(str(tmp_path), sessions))
+        assert all("Thanks for playing AFK Quest!" in output for output in outputs)
+        assert len(list(tmp_path.iterdir())) == 200
+
+    def test_disconnect_mid_session_saves_progress(self, tmp_path):
+        (output,) = asyncio.run(_run_sessions(str(tmp_path), [["Quitter", "4", "25"]]))
+        assert "Enter your action: " in output
+        assert "Thanks for playing AFK Quest!" not in output
+        assert load_character(str(tmp_path / "quitter.json")).gold == 25
+
+    def test_character_messages_go_to_their_player(self, tmp_path, capsys):
+        first, second = asyncio.run(_run_sessions(str(tmp_path), [["Alice", "4", "7", "1", "20", "Q"],
+                                                                  ["Bob", "S", "Q"]]))
+        assert "Alice found 7 gold. Total: 7 gold." in first
+        assert "Ding! Alice reached Level 2!" in first
+        assert "Alice" not in second
+        server_output = capsys.readouterr().out
+        assert "found 7 gold" not in server_output
+        assert "saved to" in server_output and "saved to" not in first # Save paths stay on the server
+
+    def test_session_has_the_game_actions(self, tmp_path):
+        (output,) = asyncio.run(_run_sessions(str(tmp_path), [["Hero", "4", "3", "6", "L", "Q"]]))
+        assert "6. Cash In Items Worse Than Equipped" in output
+        assert "Q. Save and Quit" in output and "Main Menu\nQ." not in output
+        assert "Nothing to cash in" in output
+        log_section = output.split("--- Recent Log ---")[1]
+        assert "afk_quest.character: Hero found 3 gold." in log_section
+
+    def test_seeded_sessions_are_reproducible(self, tmp_path):
+        async def play_seeded(save_folder):
+            server = await start_server(EnemyManager(SAMPLE_TEMPLATES), port=0, save_folder=save_folder,
+                                        pauses=False, seed=3)
+            try:
+                return await _play(server.sockets[0].getsockname()[1], ["Hero", "5", "F", "Q"])
+            finally:
+                server.close()
+                await server.wait_closed()
+        first = asyncio.run(play_seeded(str(tmp_path / "first")))
+        second = asyncio.run(play_seeded(str(tmp_path / "second")))
+        assert "--- Fast-forward ---" in first
+        assert first == second
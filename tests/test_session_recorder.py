@@ -0,0 +1,99 @@
+import json
+import pytest
+from unittest.mock import patch
+from src.enemy_manager import EnemyManager
+from src.item import Item, LootTable
+from src import game
+from src import session_recorder
+
+# New game and a fight, pressing Enter at every round prompt until the input runs out
+SCRIPT = ["2", "Bot"] + ["5"] + [""] * 40
+
+
+@pytest.fixture
+def game_session(tmp_path, monkeypatch):
+    """Points the game at a temporary save file and enemies that take a few rounds to beat."""
+    monkeypatch.setattr(game, "save_filepath", str(tmp_path / "save.json"))
+    monkeypatch.setattr(game, "enemy_manager", EnemyManager(
+        [{"name": "Rat", "hp": 12, "attack_stat": 2, "loot_gold_min": 0, "loot_gold_max": 9},
+         {"name": "Bat", "hp": 9, "attack_stat": 3, "loot_gold_min": 1, "loot_gold_max": 5}]))
+    return tmp_path
+
+
+def record(tmp_path, lines, seed=42, name="fight.session"):
+    path = str(tmp_path / name)
+    recording = session_recorder.record_session(path, seed=seed, read_line=game.ScriptedInput(lines), echo=False)
+    return path, recording
+
+
+class TestRecordAndReplay:
+    def test_recording_captures_seed_inputs_and_start_state(self, game_session):
+        path, recording = record(game_session, ["2", "Bot", "4", "5", "Q", "3"])
+        loaded = session_recorder.load_recording(path)
+        assert loaded == recording
+        assert loaded["seed"] == 42
+        assert loaded["inputs"] == ["2", "Bot", "4", "5", "Q", "3"]
+        assert loaded["initial_save"] is None
+        assert [template["name"] for template in loaded["enemy_templates"]] == ["Rat", "Bat"]
+        assert game.input_func is input and game.rng is None # Settings restored afterwards
+
+    def test_replay_is_identical(self, game_session):
+        path, _ = record(game_session, SCRIPT)
+        replay = session_recorder.replay_session(session_recorder.load_recording(path))
+        assert replay["matched"]
+        assert replay["actions"] == len(SCRIPT)
+        assert set(replay["phases"]) == {"setup", "play", "verify"}
+        assert "Enter your action:" in replay["prompt_seconds"]
+
+    def test_replay_of_recent_log_is_identical(self, game_session):
+        game.log.get_logger("test").info("Logged before the session.")
+        path, _ = record(game_session, ["2", "Bob", "5"] + [""] * 30 + ["L", "Q", "3"])
+        replay = session_recorder.replay_session(session_recorder.load_recording(path))
+        assert replay["matched"]
+
+    def test_replay_starts_from_the_recorded_save(self, game_session):
+        record(game_session, ["2", "Bot", "4", "50", "Q", "3"], name="first.session")
+        path, recording = record(game_session, ["1", "5"] + [""] * 30 + ["Q", "3"])
+        assert json.loads(recording["initial_save"])["gold"] == 50
+        (game_session / "save.json").unlink() # Replays must not depend on the live save file
+        assert session_recorder.replay_session(session_recorder.load_recording(path))["matched"]
+
+    def test_recording_keeps_loot_tables(self, game_session, monkeypatch):
+        loot_tables = {"Rat": LootTable([(Item("Rat Tail", "item", 4), 1.0)]),
+                       "Bat": LootTable([(Item("Bat Wing", "item", 2), 1.0)])}
+        monkeypatch.setattr(game, "enemy_manager", EnemyManager( # Weak enough that the fight is won
+            [{"name": "Rat", "hp": 2, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 9},
+             {"name": "Bat", "hp": 2, "attack_stat": 1, "loot_gold_min": 1, "loot_gold_max": 5}], loot_tables=loot_tables))
+        path, recording = record(game_session, SCRIPT)
+        assert {item["name"] for item in recording["items"]} == {"Rat Tail", "Bat Wing"}
+        assert session_recorder.replay_session(session_recorder.load_recording(path))["matched"]
+        # Without its loot tables the same session plays out differently
+        del recording["items"], recording["loot_tables"]
+        assert not session_recorder.replay_session(recording)["matched"]
+
+    def test_replay_detects_different_output(self, game_session):
+        path, recording = record(game_session, SCRIPT)
+        recording["seed"] = 43
+        assert not session_recorder.replay_session(recording)["matched"]
+
+    def test_replay_is_headless(self, game_session, capsys):
+        path, _ = record(game_session, SCRIPT)
+        capsys.readouterr()
+        with patch('builtins.input', side_effect=AssertionError("keyboard used")):
+            assert session_recorder.replay_session(session_recorder.load_recording(path))["matched"]
+        assert capsys.readouterr().out == ""
+
+
+class TestCheckCorpus:
+    def test_check_reports_and_updates_baseline(self, game_session, capsys):
+        record(game_session, SCRIPT)
+        baseline_path = str(game_session / "baseline.json")
+        assert session_recorder.main(["check", str(game_session), "--baseline", baseline_path,
+                                      "--runs", "1", "--update-baseline"]) == 0
+        assert "fight.session" in json.load(open(baseline_path, encoding="utf-8"))
+        assert "new" in capsys.readouterr().out
+
+    def test_check_fails_on_slowdown(self, game_session):
+        record(game_session, SCRIPT)
+        results = session_recorder.check_corpus(str(game_session), {"fight.session": 0.0}, runs=1)
+        assert results[0]["matched"] and results[0]["regressed"]
@@ -0,0 +1,57 @@
+import multiprocessing
+import pytest
+from src.enemy_manager import get_difficulty_band
+from src.item import Item, LootTable
+from src.shared_catalog import SharedEnemyCatalog, attach_enemy_manager, publish_enemy_catalog
+
+@pytest.fixture
+def sample_enemy_templates():
+    return [
+        {"name": "Rat", "hp": 5, "attack_stat": 1, "loot_gold_min": 0, "loot_gold_max": 1},
+        {"name": "Wolf", "hp": 25, "attack_stat": 4, "loot_gold_min": 2, "loot_gold_max": 7},
+        {"name": "Île Goblin", "hp": 8, "attack_stat": 1, "loot_gold_min": 1, "loot_gold_max": 5},
+    ]
+
+def _spawn_names_in_worker(catalog_name):
+    """Runs in a child process: attaches to the shared table and reports what it can spawn."""
+    manager = attach_enemy_manager(catalog_name)
+    names = sorted({manager.get_random_enemy().name for _ in range(50)})
+    manager.enemy_templates.close()
+    return names
+
+
+class TestSharedEnemyCatalog:
+    def test_publish_and_read_back(self, sample_enemy_templates):
+        with publish_enemy_catalog(sample_enemy_templates) as catalog:
+            assert len(catalog) == 3
+            assert sorted(catalog, key=lambda t: t["name"]) == sorted(sample_enemy_templates, key=lambda t: t["name"])
+            with pytest.raises(IndexError):
+                catalog[3]
+
+    def test_difficulty_index_matches_bands(self, sample_enemy_templates):
+        with publish_enemy_catalog(sample_enemy_templates) as catalog:
+            for band, positions in catalog.get_difficulty_index().items():
+                assert all(get_difficulty_band(catalog[position]) == band for position in positions)
+
+    def test_attach_in_same_process(self, sample_enemy_templates):
+        with publish_enemy_catalog(sample_enemy_templates) as catalog:
+            attached = SharedEnemyCatalog.attach(catalog.name)
+            assert not attached.owner
+            assert list(attached) == list(catalog)
+            attached.close()
+
+    def test_workers_attach_without_reloading(self, sample_enemy_templates):
+        with publish_enemy_catalog(sample_enemy_templates) as catalog:
+            with multiprocessing.get_context("spawn").Pool(2) as pool:
+                results = pool.map(_spawn_names_in_worker, [catalog.name, catalog.name])
+        for names in results:
+            assert set(names) <= {"Rat", "Wolf", "Île Goblin"}
+
+    def test_attached_manager_uses_loot_tables(self, sample_enemy_templates):
+        loot_tables = {"Rat": LootTable([(Item("Rat Tail", "item", 1), 0.5)])}
+        with publish_enemy_catalog(sample_enemy_templates) as catalog:
+            manager = attach_enemy_manager(catalog.name, loot_tables)
+            spawned = {foe.name: foe for foe in (manager.get_random_enemy() for _ in range(50))}
+            manager.enemy_templates.close()
+        assert spawned["Rat"].loot_table is loot_tables["Rat"]
+        assert spawned["Wolf"].loot_table is None
@@ -0,0 +1,122 @@
+import random
+import time
+import pytest
+from unittest.mock import patch
+from src import combat
+from src.character import Character
+from src.combat_events import EffectTriggered
+from src.enemy import Enemy
+from src.status_effects import (ATTACK_BUFF, DAMAGE_OVER_TIME, REGEN, StatusEffect, StatusEffectEngine, TimerWheel)
+
+class TestTimerWheel:
+    def test_items_fire_on_their_tick(self):
+        wheel = TimerWheel(slot_bits=2, levels=2) # 4 slots per level, 16 tick horizon
+        due_ticks = [1, 3, 4, 5, 15, 16, 17, 40, 100]
+        for due in due_ticks:
+            wheel.schedule(due, due)
+        fired = {}
+        for _ in range(110):
+            for item in wheel.advance():
+                fired[item] = wheel.now
+        assert fired == {due: due for due in due_ticks}
+        assert wheel.pending == 0
+
+    def test_random_schedule_matches_reference(self):
+        random.seed(3)
+        wheel = TimerWheel(slot_bits=3, levels=2)
+        expected = {}
+        for tick in range(2000):
+            for item in wheel.advance():
+                assert expected.pop(item) == wheel.now
+            if tick % 7 == 0:
+                due = wheel.now + random.randint(1, 300)
+                wheel.schedule(due, (tick, due))
+                expected[(tick, due)] = due
+        assert all(due > wheel.now for due in expected.values())
+
+    def test_past_due_fires_next_tick(self):
+        wheel = TimerWheel()
+        for _ in range(5):
+            wheel.advance()
+        wheel.schedule(2, "late")
+        assert wheel.advance() == ["late"]
+
+class TestStatusEffectEngine:
+    def test_regen_every_three_ticks(self):
+        hero = Character(name="Hero")
+        hero.current_hp = 5
+        engine = StatusEffectEngine()
+        engine.add(StatusEffect("Regeneration", REGEN, hero, amount=1, period=3))
+        messages = [engine.tick() for _ in range(9)]
+        assert hero.current_hp == 8
+        assert [len(fired) for fired in messages] == [0, 0, 1, 0, 0, 1, 0, 0, 1]
+        assert messages[2][0][1] == "Regeneration: Hero heals for 1. 6/15 HP."
+
+    def test_damage_over_time_expires(self):
+        rat = Enemy(name="Rat", max_hp=20, attack_stat=1, loot_gold_min=0, loot_gold_max=0)
+        engine = StatusEffectEngine()
+        engine.add(StatusEffect("Poison", DAMAGE_OVER_TIME, rat, amount=2, period=1, duration=4))
+        for _ in range(10):
+            engine.tick()
+        assert rat.current_hp == 12
+        assert engine.active_count == 0
+
+    def test_attack_buff_applies_and_wears_off(self):
+        hero = Character(name="Hero", base_attack_stat=2)
+        engine = StatusEffectEngine()
+        engine.add(StatusEffect("Rage", ATTACK_BUFF, hero, amount=3, duration=2))
+        assert hero.get_attack_power() == 5
+        assert engine.tick() == []
+        fired = engine.tick()
+        assert fired[0][1] == "Hero's Rage wears off."
+        assert hero.get_attack_power() == 2
+
+    def test_removed_and_dead_targets_are_dropped(self):
+        hero = Character(name="Hero")
+        rat = Enemy(name="Rat", max_hp=5, attack_stat=1, loot_gold_min=0, loot_gold_max=0)
+        engine = StatusEffectEngine()
+        regen = engine.add(StatusEffect("Regeneration", REGEN, hero, amount=1))
+        engine.add(StatusEffect("Regeneration", REGEN, rat, amount=1))
+        engine.remove(regen)
+        rat.take_damage(10)
+        assert engine.tick() == []
+        assert engine.active_count == 0
+
+    def test_invalid_effects(self):
+        hero = Character(name="Hero")
+        with pytest.raises(ValueError):
+            StatusEffect("Odd", "teleport", hero, 1)
+        with pytest.raises(ValueError):
+            StatusEffect("Rage", ATTACK_BUFF, hero, 1)
+
+    def test_thousands_of_effects(self):
+        targets = [Character(name=f"Hero{i}") for i in range(100)]
+        engine = StatusEffectEngine()
+        for i in range(10000):
+            engine.add(StatusEffect("Regeneration", REGEN, targets[i % 100], amount=1, period=50 + i % 200))
+        start = time.perf_counter()
+        fired = sum(len(engine.tick()) for _ in range(1000))
+        assert engine.active_count == 10000
+        assert fired > 50000
+        assert time.perf_counter() - start < 5
+
+class TestCombatWithEffects:
+    def test_poison_can_win_the_fight(self):
+        hero = Character(name="Hero", base_attack_stat=0)
+        rat = Enemy(name="Rat", max_hp=3, attack_stat=0, loot_gold_min=0, loot_gold_max=0)
+        engine = StatusEffectEngine()
+        engine.add(StatusEffect("Poison", DAMAGE_OVER_TIME, rat, amount=1))
+        events = list(combat.combat_events(hero, rat, effects=engine))
+        assert sum(isinstance(event, EffectTriggered) for event in events) == 3
+        assert events[-1].outcome == "player_won"
+        assert events[-1].rounds == 3
+
+    def test_effect_messages_are_printed(self, capsys):
+        hero = Character(name="Hero", base_attack_stat=5)
+        rat = Enemy(name="Rat", max_hp=5, attack_stat=1, loot_gold_min=0, loot_gold_max=0)
+        engine = StatusEffectEngine()
+        engine.add(StatusEffect("Rage", ATTACK_BUFF, hero, amount=5, duration=1))
+        with patch('src.combat.random.randint', side_effect=lambda a, b: 0 if b == 10 else b), \
+             patch('builtins.input', return_value=''):
+            combat.start_combat(hero, rat, effects=engine)
+        assert "Hero's Rage wears off." in capsys.readouterr().out
@@ -0,0 +1,93 @@
+import json
+import pytest
+from src import tracing
+from src import file_manager
+from src.character import Character
+
+
+@pytest.fixture
+def tracer():
+    """Traces everything on the game tracer for the duration of a test."""
+    game_tracer = tracing.get_tracer()
+    previous_rate = game_tracer.sample_rate
+    game_tracer.configure(1.0)
+    game_tracer.clear()
+    yield game_tracer
+    game_tracer.configure(previous_rate)
+    game_tracer.clear()
+
+
+class TestSpans:
+    def test_span_records_complete_event(self, tracer):
+        with tracing.span("work", "test", size=3) as span:
+            span.set("rows", 10)
+        [event] = tracing.get_events()
+        assert event["name"] == "work" and event["cat"] == "test" and event["ph"] == "X"
+        assert event["args"] == {"size": 3, "rows": 10}
+        assert event["dur"] >= 0
+
+    def test_nested_spans_lie_within_parent(self, tracer):
+        with tracing.span("outer"):
+            with tracing.span("inner"):
+                pass
+        inner, outer = tracing.get_events() # Recorded as they finish
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+    def test_decorator_uses_function_name_and_keeps_result(self, tracer):
+        @tracing.traced(category="test")
+        def add(a, b):
+            return a + b
+        assert add(2, 3) == 5
+        assert tracing.get_events()[0]["name"].endswith("add")
+
+    def test_exception_is_recorded_and_propagated(self, tracer):
+        with pytest.raises(KeyError):
+            with tracing.span("failing"):
+                raise KeyError("x")
+        assert tracing.get_events()[0]["args"]["error"] == "KeyError"
+
+    def test_disabled_tracing_records_nothing(self, tracer):
+        tracer.configure(0.0)
+        with tracing.span("ignored") as span:
+            span.set("key", "value")
+        file_manager.load_character("does-not-exist.json")
+        assert tracing.get_events() == []
+
+
+class TestSampling:
+    def test_sampling_is_per_top_level_span(self):
+        tracer = tracing.Tracer(sample_rate=0.5)
+        for _ in range(200):
+            with tracer.span("root"):
+                with tracer.span("child"):
+                    pass
+        roots = sum(1 for event in tracer.events if event["name"] == "root")
+        children = sum(1 for event in tracer.events if event["name"] == "child")
+        assert 0 < roots < 200
+        assert children == roots # A sampled trace is always complete
+
+    def test_invalid_rate_rejected(self):
+        with pytest.raises(ValueError):
+            tracing.Tracer(sample_rate=1.5)
+
+    def test_event_buffer_is_bounded(self):
+        tracer = tracing.Tracer(sample_rate=1.0, max_events=5)
+        for i in range(10):
+            with tracer.span(f"span {i}"):
+                pass
+        assert [event["name"] for event in tracer.events] == [f"span {i}" for i in range(5, 10)]
+
+
+class TestExport:
+    def test_instrumented_persistence_exports_chrome_trace(self, tracer, tmp_path):
+        filepath = str(tmp_path / "save.json")
+        file_manager.save_character(Character(name="Hero"), filepath)
+        file_manager.load_character(filepath)
+        trace_path = tmp_path / "trace.json"
+        tracing.export_chrome_trace(str(trace_path))
+
+        trace = json.loads(trace_path.read_text(encoding="utf-8"))
+        names = [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert names == ["save_character", "load_character"]
+        assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in trace["traceEvents"])